@@ -0,0 +1,57 @@
+'''
+This module solves many (start, goal) queries on one board with a pool of worker processes. The grid of the board is
+copied once into a block of shared memory (multiprocessing.shared_memory), every worker attaches to that block when it
+starts and builds a Board on top of it, so the grid is never pickled per query. Every worker also keeps its own
+SearchState, which it reuses for all of its queries. The results come back as a list of SearchResults in the same order
+as the queries.
+'''
+import multiprocessing
+from multiprocessing import shared_memory
+
+import Board
+import Engine
+
+# The board, the search state and the solve options of the current worker process, set by attachBoard()
+worker = {}
+
+
+'''This function solves all queries, a list of (start, goal) pairs of (row, column) points, on the board with the given
+algorithm (see Engine.solve) and returns the SearchResults in the same order. The queries are spread over processes
+worker processes (by default one per core), chunksize of them are sent to a worker at once. Extra options are passed
+on to Engine.solve.'''
+def solveMany(board, queries, algorithm='astar', processes=None, chunksize=None, **options):
+    if algorithm not in Engine.ALGORITHMS:
+        raise ValueError(f'Unknown algorithm {algorithm!r}, choose one of {", ".join(Engine.ALGORITHMS)}')
+    queries = [(tuple(start), tuple(goal)) for start, goal in queries]
+    for start, goal in queries:
+        board.checkPoint(*start)
+        board.checkPoint(*goal)
+    if not queries:
+        return []
+    cells = board.size ** 2
+    memory = shared_memory.SharedMemory(create=True, size=cells)
+    try:
+        memory.buf[:cells] = board.grid
+        with multiprocessing.Pool(processes, initializer=attachBoard,
+                                  initargs=(memory.name, board.size, algorithm, options)) as pool:
+            if chunksize is None:  # A few chunks per worker balances the load without sending every query separately
+                chunksize = max(1, len(queries) // (4 * (processes or multiprocessing.cpu_count())))
+            return pool.map(solveQuery, queries, chunksize)
+    finally:
+        memory.close()
+        memory.unlink()
+
+
+'''This function is the initializer of a worker process: it attaches to the shared grid and builds the Board on top of
+it together with a SearchState which is reused for every query of this worker.'''
+def attachBoard(name, size, algorithm, options):
+    memory = shared_memory.SharedMemory(name=name)
+    board = Board.Board(size, grid=memory.buf[:size ** 2])
+    worker.update(memory=memory, board=board, state=Engine.SearchState(board), algorithm=algorithm, options=options)
+
+
+'''This function solves one (start, goal) query in a worker process.'''
+def solveQuery(query):
+    start, goal = query
+    return Engine.solve(worker['board'], start, goal, algorithm=worker['algorithm'], state=worker['state'],
+                        **worker['options'])
@@ -0,0 +1,232 @@
+'''
+This module is the benchmark suite of the search algorithms. A scenario is a board of a certain size and obstacle
+density which follows from a seed, together with a list of (start, goal) queries on it, so every run benchmarks exactly
+the same work. Every algorithm first solves a few warmup queries, then every query is timed with time.perf_counter().
+The report holds the median and the 95th percentile of the latency, the average amount of expanded cells (for the
+algorithms which count them) and the peak memory of the queries, measured with tracemalloc in a separate pass so it
+doesn't slow down the timed pass. The algorithms which must find the lowest cost are checked against each other.
+The results are written as JSON and can be compared with a stored baseline, a regression gives exit status 1:
+    python Benchmark.py --sizes 20 50 --densities 0 0.25 --output baseline.json
+    python Benchmark.py --sizes 20 50 --densities 0 0.25 --baseline baseline.json
+'''
+import argparse
+import json
+import math
+import platform
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+
+import Board
+import Comparison
+import DeltaStepping
+import Engine
+import Hierarchical
+
+DELTA_WORKERS = 2  # The amount of worker processes of delta-stepping in the benchmark
+
+
+'''This function returns the preparation of an algorithm of the Engine: given a board it returns a function which solves
+one query and returns the cost (None without a pathway) and the amount of expanded cells.'''
+def engineAlgorithm(algorithm):
+    def prepare(board):
+        state = Engine.SearchState(board)
+
+        def run(start, goal):
+            result = Engine.solve(board, start, goal, algorithm, state=state)
+            return result.cost, result.expanded
+        return run
+    return prepare
+
+
+'''This function prepares the A* implementation of redblobgames (see Comparison.py), it doesn't count expanded cells.'''
+def prepareRedblob(board):
+    grid = Comparison.GridWithWeights(board.size, board.size)
+    Comparison.copyObstaclesAndWeights(board, grid)
+
+    def run(start, goal):
+        result = Comparison.a_star_search(grid, start, goal)
+        return (result[0] if result else None), None
+    return run
+
+
+'''This function prepares the A* implementation of Nicholas Swift (see Comparison.py), it doesn't count expanded
+cells.'''
+def prepareSwift(board):
+    def run(start, goal):
+        result = Comparison.astar(board.board, start, goal)
+        return (result[0] if result else None), None
+    return run
+
+
+'''This function prepares HPA* (see Hierarchical.py), building the index is part of the preparation.'''
+def prepareHierarchical(board):
+    index = Hierarchical.HierarchicalIndex(board)
+
+    def run(start, goal):
+        result = index.solve(start, goal)
+        return result.cost, result.expanded
+    return run
+
+
+'''This function prepares delta-stepping (see DeltaStepping.py): every query calculates the distance field of its start
+with DELTA_WORKERS processes, the cost is the distance of the goal and the expanded cells are not counted.'''
+def prepareDeltaStepping(board):
+    def run(start, goal):
+        cost = DeltaStepping.deltaStepping(board, start, DELTA_WORKERS)[board.index(*goal)]
+        return (None if cost == Board.UNVISITED else cost), None
+    return run
+
+
+# The algorithms which can be benchmarked, every algorithm of the Engine is picked up automatically
+IMPLEMENTATIONS = {name: engineAlgorithm(name) for name in Engine.ALGORITHMS}
+IMPLEMENTATIONS.update(redblob=prepareRedblob, swift=prepareSwift, hpastar=prepareHierarchical,
+                       deltastepping=prepareDeltaStepping)
+# The algorithms which always find the pathway with the lowest cost (ARA* without a deadline), their costs must be the
+# same
+EXACT = {'astar', 'ucs', 'biastar', 'bidijkstra', 'idastar', 'arastar', 'redblob', 'swift', 'deltastepping'}
+
+
+'''This function builds the board and the queries of a scenario. The values and obstacles of the board follow from the
+seed, density is the share of the cells which becomes an obstacle. The start and goal of a query are no obstacles.'''
+def makeScenario(size, density, seed, queries):
+    rng = random.Random(f'{size}-{density}-{seed}')
+    board = Board.Board(size, seed=rng.getrandbits(32))
+    board.generateBoard()
+    Board.placeObstacles(rng, board.grid, int(size ** 2 * density))
+    passable = [board.point(index) for index in range(size ** 2) if board.grid[index] != Board.OBSTACLE]
+    if not passable:
+        raise ValueError(f'A board of size {size} with density {density} has no free cells for the queries!')
+    return board, [(rng.choice(passable), rng.choice(passable)) for query in range(queries)]
+
+
+'''This function returns the value below which a share q of the sorted values lies (the nearest rank percentile)'''
+def percentile(values, q):
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(q * len(ordered)) - 1)]
+
+
+'''This function benchmarks one algorithm on a scenario and returns its record and the cost of every query.'''
+def measure(name, board, queries, repeat, warmup):
+    run = IMPLEMENTATIONS[name](board)
+    for start, goal in queries[:warmup]:
+        run(start, goal)
+    latencies, costs, expanded = [], [], []
+    for start, goal in queries:
+        for attempt in range(repeat):
+            began = time.perf_counter()
+            cost, count = run(start, goal)
+            latencies.append(time.perf_counter() - began)
+        costs.append(cost)
+        if count is not None:
+            expanded.append(count)
+    tracemalloc.start()
+    for start, goal in queries:
+        run(start, goal)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return {'algorithm': name, 'queries': len(queries), 'found': sum(cost is not None for cost in costs),
+            'median_ms': round(statistics.median(latencies) * 1000, 4),
+            'p95_ms': round(percentile(latencies, 0.95) * 1000, 4),
+            'mean_expanded': round(statistics.mean(expanded), 1) if expanded else None,
+            'peak_kib': round(peak / 1024, 1)}, costs
+
+
+'''This function runs every scenario (every combination of size and density) for every algorithm. It returns the
+records and the list of messages about algorithms which should find the lowest cost but disagree.'''
+def runBenchmark(sizes, densities, algorithms, queries, repeat, warmup, seed, report=print):
+    records, mismatches = [], []
+    for size in sizes:
+        for density in densities:
+            board, pairs = makeScenario(size, density, seed, queries)
+            reference = None
+            for name in algorithms:
+                record, costs = measure(name, board, pairs, repeat, warmup)
+                record.update(size=size, density=density, seed=seed)
+                records.append(record)
+                report(f'size {size:>5} density {density:<5} {name:<12} median {record["median_ms"]:>10.3f} ms  '
+                       f'p95 {record["p95_ms"]:>10.3f} ms  expanded {record["mean_expanded"]}  '
+                       f'peak {record["peak_kib"]} KiB')
+                if name not in EXACT:
+                    continue
+                if reference is None:
+                    reference = name, costs
+                    continue
+                for (start, goal), cost, expected in zip(pairs, costs, reference[1]):
+                    if cost != expected:
+                        mismatches.append(f'size {size} density {density}: {name} finds cost {cost} from {start} to '
+                                          f'{goal}, {reference[0]} finds {expected}')
+    return records, mismatches
+
+
+'''This function compares the records with the ones of a baseline. A record regresses when its median latency grew by
+more than tolerance (a fraction) and by more than noise milliseconds, or when it expands more cells on average. It
+returns the list of regressions.'''
+def compareBaseline(records, baseline, tolerance, noise=0.1):
+    key = lambda record: (record['size'], record['density'], record['seed'], record['algorithm'])
+    previous = {key(record): record for record in baseline['results']}
+    regressions = []
+    for record in records:
+        old = previous.get(key(record))
+        if old is None:
+            continue
+        growth = record['median_ms'] - old['median_ms']
+        if record['median_ms'] > old['median_ms'] * (1 + tolerance) and growth > noise:
+            regressions.append(f'{key(record)}: median {old["median_ms"]} ms -> {record["median_ms"]} ms')
+        if record['mean_expanded'] is not None and old['mean_expanded'] is not None \
+                and record['mean_expanded'] > old['mean_expanded']:
+            regressions.append(f'{key(record)}: expanded {old["mean_expanded"]} -> {record["mean_expanded"]}')
+    return regressions
+
+
+'''This function is the command line interface, it returns the exit status: 1 when algorithms disagree on the lowest
+cost or when a regression against the baseline was found, otherwise 0.'''
+def main(arguments=None):
+    parser = argparse.ArgumentParser(description='Benchmark the search algorithms on seeded boards.')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10, 20, 40], help='the sizes of the boards')
+    parser.add_argument('--densities', type=float, nargs='+', default=[0.0, 0.25],
+                        help='the shares of the cells which are obstacles')
+    parser.add_argument('--algorithms', nargs='+', choices=sorted(IMPLEMENTATIONS), default=sorted(IMPLEMENTATIONS),
+                        help='the algorithms to benchmark (default: all)')
+    parser.add_argument('--queries', type=int, default=20, help='the amount of (start, goal) queries per board')
+    parser.add_argument('--repeat', type=int, default=1, help='how many times every query is timed')
+    parser.add_argument('--warmup', type=int, default=2, help='the amount of untimed queries before the timing')
+    parser.add_argument('--seed', type=int, default=0, help='the seed of the scenarios')
+    parser.add_argument('--output', help='write the results as JSON to this file (default: standard output)')
+    parser.add_argument('--baseline', help='a JSON file of an earlier run to compare with')
+    parser.add_argument('--tolerance', type=float, default=0.2,
+                        help='the allowed growth of the median latency compared with the baseline (default: 0.2)')
+    parser.add_argument('--noise', type=float, default=0.1,
+                        help='a growth of the median latency below this many milliseconds is ignored (default: 0.1)')
+    options = parser.parse_args(arguments)
+    if options.queries < 1 or options.repeat < 1 or options.warmup < 0:
+        parser.error('--queries and --repeat must be at least 1, --warmup at least 0')
+
+    report = lambda message: print(message, file=sys.stderr)
+    records, mismatches = runBenchmark(options.sizes, options.densities, options.algorithms, options.queries,
+                                       options.repeat, options.warmup, options.seed, report)
+    results = {'python': platform.python_version(), 'platform': platform.platform(),
+               'options': {name: value for name, value in vars(options).items() if name not in ('output', 'baseline')},
+               'results': records, 'mismatches': mismatches}
+    if options.output:
+        with open(options.output, 'w') as file:
+            json.dump(results, file, indent=2)
+    else:
+        json.dump(results, sys.stdout, indent=2)
+        print()
+    failed = bool(mismatches)
+    for message in mismatches:
+        report(f'MISMATCH {message}')
+    if options.baseline:
+        with open(options.baseline) as file:
+            regressions = compareBaseline(records, json.load(file), options.tolerance, options.noise)
+        for message in regressions:
+            report(f'REGRESSION {message}')
+        failed = failed or bool(regressions)
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
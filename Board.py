@@ -1,4 +1,18 @@
+import collections
+import mmap
 import random
+import re
+import struct
+from array import array
+
+OBSTACLE = 0  # Sentinel byte which marks an obstacle in the compact grid, normal tiles have a value of 1-255
+UNVISITED = -1  # Value of a cell in the buffers of a search which has not been reached (yet) by that search
+MAX_VALUE = 255  # The largest cost which fits in one byte of the compact grid
+# Translation table which maps a random byte of 0-254 onto a cell value of 1-5, every value is hit by exactly 51 bytes
+VALUE_TABLE = bytes(byte % 5 + 1 for byte in range(255)) + bytes([OBSTACLE])
+MAGIC = b'TAB1'  # The first bytes of a saved board
+HEADER = struct.Struct('<4sIIIII')  # Magic, size, start row and column, destination row and column
+
 
 class Board:
     '''
@@ -8,16 +22,37 @@ class Board:
     The representation of the field is an (n x n)-matrix where normal tiles are represented via an int (1-5)
     and obstacles by an 'X'. To create an instance of this class an integer n must be provided along which indicates
     the size of the (n x n)-field/matrix. Furthermore does this class contain two special 'points' denoted by 'start'
-    and 'destination', these will be start and end positions of our path. Lastly, some algorithms will make use of a
-    second matrix 'visited' which has the same size as the field matrix and is initially completely filled with 'False'
-    values.
+    and 'destination', these will be start and end positions of our path. The searches keep their own buffers of the
+    same size as the field (see Engine.SearchState), which are initially completely filled with UNVISITED values.
+    Internally the field is stored compactly in 'grid', a flat bytearray with one byte per cell (row after row), in
+    which obstacles are stored as the OBSTACLE byte. The 'board' attribute still offers the (n x n)-matrix view with
+    ints and 'X's, so board.board[row][column] keeps working, yet the searches use the flat 'grid' via index(row, column).
+    All randomness comes from the board's own random generator, so two boards with the same seed are identical. An
+    existing grid (e.g. a part of a BoardBatch) can be passed along as well, then nothing is generated. That is how
+    Board.load() opens a board which was written by save(): its grid is a view on the memory-mapped file.
+    Other objects which depend on the values of the board (such as a landmark index) can register a listener, this is
+    called as listener(change, row, column) after a change: change is 'cell' when the value of (row, column) changed,
+    'start' or 'destination' when that point moved to (row, column) and 'board' (with row and column None) when the whole
+    board changed.
     '''
-    def __init__(self, size):
+    sparse = False  # A sparse board (see Chunked.py) does not hold all its cells, searches then use sparse buffers
+
+    def __init__(self, size, seed=None, grid=None):
         self.size = size
-        self.generateBoard()  # Generates a size x size matrix with values of 1-5
+        self.random = random.Random(seed)
+        self.listeners = []
+        self.version = 0  # Goes up with every change of the values, so caches can tell whether they are out of date
+        self.componentIndex = None  # The ComponentIndex of the board, see components()
+        self.board = BoardRows(self)  # Row/column view on the grid, board.board[row][column] gives an int or 'X'
         self.start = (0, 0)  # Sets start to (0, 0), this is the left upper corner
         self.destination = (size - 1, size - 1)  # Sets destination to the right lower corner
-        self.generateObstacles()  # Changes a quarter of the cells to obstacles
+        if grid is None:
+            self.generateBoard()  # Generates a size x size matrix with values of 1-5
+            self.generateObstacles()  # Changes a quarter of the cells to obstacles
+        else:
+            if len(grid) != size ** 2:
+                raise ValueError('The grid does not have size x size cells!')
+            self.grid = grid
 
     def __str__(self):  # Gives a string representation of the board
         return '\n'.join('  '.join(str(x) for x in row) for row in self.board)
@@ -25,44 +60,520 @@ class Board:
     '''This function generates the board which is an n x n matrix with n equal to the size.
     The size must be given as parameter to the instance call'''
     def generateBoard(self):
-        self.board = [[random.randint(1, 5) for column in range(self.size)] for row in range(self.size)]
+        self.grid = randomValues(self.random, self.size ** 2)
+        self.version += 1
+        self.notifyListeners('board', None, None)
 
     '''This function generates the obstacles on the board.
-    Currently, 25% of the board is being covered in obstacles, obstacles are marked as an X instead of a integer'''
+    Currently, 25% of the board is being covered in obstacles, obstacles are marked as an X instead of a integer.
+    Exactly size ** 2 // 4 cells which are no obstacle yet become one, the start and destination are left alone.'''
     def generateObstacles(self):
-        for x in range(self.size ** 2 // 4):
-            check = False
-            # This loop prevents self.start and self.destination to be turned into obstacles
-            while not check:
-                row, column = random.randint(0, self.size - 1), random.randint(0, self.size - 1)
-                if (row, column) != self.start and (row, column) != self.destination and self.board[row][column] != 'X':
-                    check = True
-            self.board[row][column] = 'X'  # Set the value on the board to X
-
-    '''This function will reset all the visitor flags back to False.'''
-    def resetVisitorFlags(self):
-        self.visited = [[False for x in range(self.size)] for y in range(self.size)]
+        placeObstacles(self.random, self.grid, self.size ** 2 // 4,
+                       (self.index(*self.start), self.index(*self.destination)))
+        self.version += 1
+        self.notifyListeners('board', None, None)
 
-    '''This function will set the start position to (row, column)'''
-    def setStart(self, row, column):  # Sets the start position to board[row][column]
+    '''This function returns the index of (row, column) in the flat grid'''
+    def index(self, row, column):
+        return row * self.size + column
+
+    '''This function returns the (row, column) point of an index in the flat grid'''
+    def point(self, index):
+        return divmod(index, self.size)
+
+    '''This function returns the value of (row, column), this is an int or 'X' for an obstacle'''
+    def getValue(self, row, column):
+        value = self.grid[row * self.size + column]
+        return 'X' if value == OBSTACLE else value
+
+    '''This function checks whether (row, column) is an obstacle'''
+    def isObstacle(self, row, column):
+        return self.grid[row * self.size + column] == OBSTACLE
+
+    '''This function returns the ComponentIndex of the board, which is built when it is needed for the first time and
+    then follows the changes of the board. A sparse board has no index (None), it would need every cell.'''
+    def components(self):
+        if self.sparse:
+            return None
+        if self.componentIndex is None:
+            self.componentIndex = ComponentIndex(self)
+        return self.componentIndex
+
+    '''This function returns the ComponentIndex of the board only when it has been built (see components) and still
+    belongs to the current version of the board, otherwise None. The searches use it to give up early, they never build
+    the index themselves: that would take a pass over every cell and memory for every cell.'''
+    def currentComponents(self):
+        index = None if self.sparse else self.componentIndex
+        return index if index is not None and index.version == self.version else None
+
+    '''This function returns the indices of the neighbours (N, W, S, E) of an index which are on the board and which are
+    not an obstacle. This is the fast path for the searches, they do not need to check the type of the cells.'''
+    def passableNeighbors(self, index):
+        size, grid = self.size, self.grid
+        row, column = divmod(index, size)
+        nextIndices = []
+        if row != 0 and grid[index - size] != OBSTACLE:
+            nextIndices.append(index - size)  # Add index above current
+        if column != 0 and grid[index - 1] != OBSTACLE:
+            nextIndices.append(index - 1)  # Add index left of current
+        if row != size - 1 and grid[index + size] != OBSTACLE:
+            nextIndices.append(index + size)  # Add index below current
+        if column != size - 1 and grid[index + 1] != OBSTACLE:
+            nextIndices.append(index + 1)  # Add index right of current
+        return nextIndices
+
+    '''This function registers a listener which will be called after every change of the board'''
+    def addListener(self, listener):
+        self.listeners.append(listener)
+
+    '''This function removes a listener again'''
+    def removeListener(self, listener):
+        self.listeners.remove(listener)
+
+    '''This function calls every listener with the change which happened to the board'''
+    def notifyListeners(self, change, row, column):
+        for listener in list(self.listeners):
+            listener(change, row, column)
+
+    '''This function sets the byte of (row, column) in the grid and lets the listeners know when it has changed, every
+    change of a value (via setValue, setObstacle, setStart or setDestination) raises the version of the board'''
+    def changeCell(self, row, column, value):
+        index = self.index(row, column)
+        if self.grid[index] != value:
+            self.grid[index] = value
+            self.version += 1
+            self.notifyListeners('cell', row, column)
+
+    '''This function checks whether the row and column lie on the board and raises a ValueError otherwise'''
+    def checkPoint(self, row, column):
         if row >= self.size or column >= self.size or row < 0 or column < 0:
             raise ValueError('The row or column does not fit on the board!')
-        if self.board[row][column] == 'X':
-            self.board[row][column] = random.randint(1, 5)
-        self.start = (row, column)
+
+    '''This function will set the start position to (row, column)'''
+    def setStart(self, row, column):  # Sets the start position to board[row][column]
+        self.checkPoint(row, column)
+        if self.isObstacle(row, column):
+            self.changeCell(row, column, self.random.randint(1, 5))
+        if self.start != (row, column):
+            self.start = (row, column)
+            self.notifyListeners('start', row, column)
 
     '''This function will set the destination to (row, column)'''
     def setDestination(self, row, column):  # Sets the destination to board[row][column]
-        if row >= self.size or column >= self.size or row < 0 or column < 0:
-            raise ValueError('The row or column does not fit on the board!')
-        if self.board[row][column] == 'X':
-            self.board[row][column] = random.randint(1, 5)
-        self.destination = (row, column)
+        self.checkPoint(row, column)
+        if self.isObstacle(row, column):
+            self.changeCell(row, column, self.random.randint(1, 5))
+        if self.destination != (row, column):
+            self.destination = (row, column)
+            self.notifyListeners('destination', row, column)
 
     '''This function will change (row, column) into an obstacle'''
     def setObstacle(self, row, column):  # Turns board[row][column] into and obstacle!
-        self.board[row][column] = 'X'
+        self.changeCell(row, column, OBSTACLE)
 
-    '''Sets board[row][column] to a certain value, ca be used to turn an obstacle into a 'normal' value'''
+    '''Sets board[row][column] to a certain value, ca be used to turn an obstacle into a 'normal' value.
+    The value 'X' turns the cell into an obstacle, other values must be an int between 1 and MAX_VALUE.'''
     def setValue(self, row, column, value):
-        self.board[row][column] = value
+        if value == 'X':
+            value = OBSTACLE
+        elif not 1 <= value <= MAX_VALUE:
+            raise ValueError(f'The value of a cell must lie between 1 and {MAX_VALUE}!')
+        self.changeCell(row, column, value)
+
+    '''This function writes the board to a file in the binary format: the header (MAGIC, the size, the start and the
+    destination as 32-bit integers) followed by the grid, one byte per cell with OBSTACLE for an obstacle.'''
+    def save(self, path):
+        with open(path, 'wb') as file:
+            file.write(HEADER.pack(MAGIC, self.size, *self.start, *self.destination))
+            file.write(self.grid)
+
+    '''This function opens a board which was written by save(). The file is memory-mapped and the grid is a view on the
+    mapped bytes, so nothing is read or parsed up front: opening a huge board takes the same time as a small one and
+    processes which open the same file share its pages. By default the grid is read-only and changing a cell raises a
+    TypeError, with writable=True the board gets a private copy-on-write mapping whose changes never reach the file.'''
+    @classmethod
+    def load(cls, path, writable=False):
+        with open(path, 'rb') as file:
+            mapping = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_COPY if writable else mmap.ACCESS_READ)
+        if len(mapping) < HEADER.size:
+            raise ValueError(f'{path} is not a board!')
+        magic, size, start_row, start_column, destination_row, destination_column = HEADER.unpack_from(mapping)
+        if magic != MAGIC:
+            raise ValueError(f'{path} is not a board!')
+        if len(mapping) != HEADER.size + size ** 2:
+            raise ValueError(f'The board in {path} does not have size x size cells!')
+        board = cls(size, grid=memoryview(mapping)[HEADER.size:])
+        board.checkPoint(start_row, start_column)
+        board.checkPoint(destination_row, destination_column)
+        board.start, board.destination = (start_row, start_column), (destination_row, destination_column)
+        board.mapping = mapping  # Keeps the mapping open as long as the board exists
+        return board
+
+    '''This function writes the board as plain text: a comment line with the start and destination and then one line
+    per row with the values separated by spaces, an obstacle is written as X.'''
+    def exportText(self, path):
+        with open(path, 'w') as file:
+            file.write(f'# start {self.start[0]} {self.start[1]} destination {self.destination[0]} '
+                       f'{self.destination[1]}\n')
+            for row in self.board:
+                file.write(' '.join(str(value) for value in row) + '\n')
+
+    '''This function reads a board from plain text as written by exportText(): one line per row with the values (1 to
+    MAX_VALUE, or X for an obstacle) separated by whitespace. Lines starting with # are comments, except for the line
+    with the start and destination, without it they are the upper left and lower right corner.'''
+    @classmethod
+    def importText(cls, path):
+        rows, points = [], None
+        with open(path) as file:
+            for line in file:
+                words = line.split()
+                if not words:
+                    continue
+                if words[0].startswith('#'):
+                    if words[1:2] == ['start'] and len(words) == 7 and words[4] == 'destination':
+                        points = (int(words[2]), int(words[3])), (int(words[5]), int(words[6]))
+                    continue
+                rows.append(words)
+        if any(len(row) != len(rows) for row in rows):
+            raise ValueError(f'The grid in {path} is not square!')
+        grid = bytearray(len(rows) ** 2)
+        for index, word in enumerate(word for row in rows for word in row):
+            if word.upper() != 'X':
+                value = int(word)
+                if not 1 <= value <= MAX_VALUE:
+                    raise ValueError(f'The value of a cell must lie between 1 and {MAX_VALUE}!')
+                grid[index] = value
+        board = cls(len(rows), grid=grid)
+        if points is not None:
+            board.checkPoint(*points[0])
+            board.checkPoint(*points[1])
+            board.start, board.destination = points
+        return board
+
+
+class BoardBatch:
+    '''
+    This class generates count boards of the same size at once. All grids are stored in one stacked bytearray 'grids'
+    (board after board, count * size * size bytes), indexing the batch gives a Board whose grid is a view on its own part
+    of the stack. The whole batch follows from the seed.
+    '''
+    def __init__(self, count, size, seed=None):
+        rng = random.Random(seed)
+        cells = size ** 2
+        self.count = count
+        self.size = size
+        self.grids = randomValues(rng, count * cells)
+        stack = memoryview(self.grids)
+        self.boards = []
+        for number in range(count):
+            grid = stack[number * cells:(number + 1) * cells]
+            placeObstacles(rng, grid, cells // 4, (0, cells - 1))  # The start and destination are left alone
+            self.boards.append(Board(size, seed=rng.getrandbits(32), grid=grid))
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, number):
+        return self.boards[number]
+
+    def __iter__(self):
+        return iter(self.boards)
+
+
+'''This function returns a bytearray of amount random cell values (1-5). It draws one random byte per cell and maps the
+bytes onto 1-5 with VALUE_TABLE in one go, bytes of 255 are drawn again first so that every value is equally likely.'''
+def randomValues(rng, amount):
+    values = bytearray(rng.randbytes(amount))
+    index = values.find(255)
+    while index != -1:
+        values[index] = rng.randrange(255)
+        index = values.find(255, index + 1)
+    return values.translate(VALUE_TABLE)
+
+
+'''This function turns exactly amount cells of grid (a bytearray or a view on one) into obstacles. The cells are chosen
+uniformly among the cells which are no obstacle yet and which are not in excluded. Instead of drawing one cell at a time
+every cell gets an obstacle with a probability of about amount / free cells via a random byte mask, which is applied to
+the whole grid at once, afterwards a few random cells are added or removed until the amount is exactly right.'''
+def placeObstacles(rng, grid, amount, excluded=()):
+    cells = len(grid)
+    original = bytes(grid)
+    excluded = set(excluded)
+    existing = original.count(OBSTACLE)
+    free = cells - existing - sum(1 for index in excluded if original[index] != OBSTACLE)
+    if amount > free:
+        raise ValueError('There is no room for that many obstacles on the board!')
+    if amount == 0:
+        return
+    # The mask holds a 0 byte where a cell becomes an obstacle and a 255 byte elsewhere, a bitwise and of the grid and
+    # the mask (as big integers) turns those cells into OBSTACLE bytes and leaves the others as they are
+    threshold = round(256 * amount / free)
+    mask = rng.randbytes(cells).translate(bytes(OBSTACLE if byte < threshold else 255 for byte in range(256)))
+    combined = bytearray((int.from_bytes(original, 'big') & int.from_bytes(mask, 'big')).to_bytes(cells, 'big'))
+    for index in excluded:
+        combined[index] = original[index]
+    placed = combined.count(OBSTACLE) - existing
+    while placed > amount:  # Too many obstacles, turn a random new one back into its value
+        index = rng.randrange(cells)
+        if combined[index] == OBSTACLE and original[index] != OBSTACLE:
+            combined[index] = original[index]
+            placed -= 1
+    while placed < amount:  # Too few obstacles, turn a random free cell into one
+        index = rng.randrange(cells)
+        if combined[index] != OBSTACLE and index not in excluded:
+            combined[index] = OBSTACLE
+            placed += 1
+    grid[:] = combined
+
+
+class BoardRows:
+    '''
+    This class is the (n x n)-matrix view on the flat grid of a Board. Indexing it with a row gives a BoardRow, which
+    in turn gives the value (int or 'X') of a column. It does not copy the grid, so it always shows the current values.
+    '''
+    def __init__(self, board):
+        self.owner = board
+
+    def __len__(self):
+        return self.owner.size
+
+    def __getitem__(self, row):
+        if not 0 <= row < self.owner.size:
+            raise IndexError('The row does not fit on the board!')
+        return BoardRow(self.owner, row)
+
+    def __iter__(self):
+        return (BoardRow(self.owner, row) for row in range(self.owner.size))
+
+
+class BoardRow:
+    '''This class is the view on one row of the flat grid of a Board, see BoardRows.'''
+    def __init__(self, board, row):
+        self.owner = board
+        self.offset = row * board.size
+
+    def __len__(self):
+        return self.owner.size
+
+    def __getitem__(self, column):
+        if not 0 <= column < self.owner.size:
+            raise IndexError('The column does not fit on the board!')
+        value = self.owner.grid[self.offset + column]
+        return 'X' if value == OBSTACLE else value
+
+    def __iter__(self):
+        grid = self.owner.grid
+        return ('X' if value == OBSTACLE else value
+                for value in grid[self.offset:self.offset + self.owner.size])
+
+
+class ComponentIndex:
+    '''
+    This class labels the connected components of the passable cells of a board (4-connected, obstacles have no
+    component), so whether a pathway exists between two cells is known without searching. It is built in one pass over
+    the rows: every run of passable cells in a row is joined (union-find) with the runs of the previous row which it
+    touches. Afterwards it follows the changes of the board: a cell which is no obstacle anymore joins the components of
+    its neighbours, a new obstacle can only split its own component, which is checked locally: when its passable
+    neighbours are connected around it (via the diagonal cells) nothing changes, otherwise a search is started from
+    every neighbour at once, one cell per search in turn, searches which meet are merged and a search which runs out of
+    cells has found a part which was split off, so the cost is about the size of the smaller parts (beyond a quarter of
+    the board building the labels again is cheaper, then that happens instead). The label of a cell is followed to its
+    root in parent, the root is the component. When the board changed in another way than through a listener (e.g. a
+    new grid), the index is built again at the next query.
+    '''
+    def __init__(self, board):
+        self.board = board
+        self.labels = None
+        self.parent = []
+        self.version = None  # The version of the board the labels belong to, None when they must be built again
+        self.builds = 0
+        board.addListener(self.boardChanged)
+
+    '''This function labels every cell of the board from nothing'''
+    def build(self):
+        board, size = self.board, self.board.size
+        grid = board.grid
+        parent = []
+
+        def find(run):
+            while parent[run] != run:
+                parent[run] = parent[parent[run]]
+                run = parent[run]
+            return run
+
+        rows, previous = [], []
+        for row in range(size):
+            offset = row * size
+            current = []
+            for match in re.finditer(rb'[^\x00]+', bytes(grid[offset:offset + size])):
+                current.append((match.start(), match.end(), len(parent)))
+                parent.append(len(parent))
+            # Both lists of runs are sorted, so the touching pairs are found by walking along them together
+            first = second = 0
+            while first < len(current) and second < len(previous):
+                start, end, run = current[first]
+                other_start, other_end, other = previous[second]
+                if start < other_end and other_start < end:
+                    root, other_root = find(run), find(other)
+                    if root != other_root:
+                        parent[root] = other_root
+                if end < other_end:
+                    first += 1
+                else:
+                    second += 1
+            rows.append(current)
+            previous = current
+        # Every component gets a small label of its own, so parent only needs one entry per component
+        labels, compact = array('i', [UNVISITED]) * size ** 2, {}
+        for row, runs in enumerate(rows):
+            offset = row * size
+            for start, end, run in runs:
+                label = compact.setdefault(find(run), len(compact))
+                labels[offset + start:offset + end] = array('i', [label]) * (end - start)
+        self.labels, self.parent = labels, list(range(len(compact)))
+        self.version = board.version
+        self.builds += 1
+
+    '''This function builds the labels again when they do not belong to the current version of the board anymore'''
+    def refresh(self):
+        if self.version != self.board.version:
+            self.build()
+        return self
+
+    '''This function returns the component (the root of the label) of a label'''
+    def find(self, label):
+        parent = self.parent
+        while parent[label] != label:
+            parent[label] = parent[parent[label]]
+            label = parent[label]
+        return label
+
+    '''This function returns the component of the cell at index, or None for an obstacle'''
+    def component(self, index):
+        self.refresh()
+        label = self.labels[index]
+        return None if label == UNVISITED else self.find(label)
+
+    '''This function returns whether a pathway exists from index to target. The start may be an obstacle, which can be
+    left but not entered: then one of its passable neighbours must lie in the component of the target.'''
+    def connected(self, index, target):
+        if index == target:
+            return True
+        goal = self.component(target)
+        return goal is not None and goal in self.reachable(index)
+
+    '''This function returns the set of components which a pathway from index can enter: the component of the cell, or
+    for an obstacle (which can be left) the components of its passable neighbours.'''
+    def reachable(self, index):
+        component = self.component(index)
+        if component is not None:
+            return {component}
+        return {self.component(neighbor) for neighbor in self.board.passableNeighbors(index)}
+
+    '''This function is the listener on the board, it updates the labels of a changed cell'''
+    def boardChanged(self, change, row, column):
+        if change == 'board' or (change == 'cell' and self.version != self.board.version - 1):
+            self.version = None  # The labels were already out of date, build them again when they are needed
+        elif change == 'cell':
+            index = self.board.index(row, column)
+            if self.board.grid[index] == OBSTACLE:
+                updated = self.block(index)
+            else:
+                updated = self.labels[index] != UNVISITED or self.unblock(index)
+            self.version = self.board.version if updated else None
+
+    '''This function joins a cell which is no obstacle anymore with the components of its neighbours'''
+    def unblock(self, index):
+        roots = {self.find(self.labels[neighbor]) for neighbor in self.board.passableNeighbors(index)}
+        if not roots:
+            label = len(self.parent)
+            self.parent.append(label)
+        else:
+            label = roots.pop()
+            for root in roots:
+                self.parent[root] = label
+        self.labels[index] = label
+        return True
+
+    '''This function takes a new obstacle out of its component and splits the component when that is needed, it
+    returns False when the labels must be built again instead'''
+    def block(self, index):
+        if self.labels[index] == UNVISITED:
+            return True
+        self.labels[index] = UNVISITED
+        neighbors = self.board.passableNeighbors(index)
+        if len(neighbors) > 1 and not self.connectedAround(index, neighbors):
+            return self.split(neighbors)
+        return True
+
+    '''This function checks whether the passable neighbours of index are connected via the eight cells around it: that
+    is the case when they all lie on one unbroken arc of passable cells of that ring.'''
+    def connectedAround(self, index, neighbors):
+        board, size = self.board, self.board.size
+        row, column = board.point(index)
+        ring = [(row - 1, column), (row - 1, column + 1), (row, column + 1), (row + 1, column + 1), (row + 1, column),
+                (row + 1, column - 1), (row, column - 1), (row - 1, column - 1)]
+        passable = [0 <= r < size and 0 <= c < size and board.grid[r * size + c] != OBSTACLE for r, c in ring]
+        if all(passable):
+            return True
+        # Walk around the ring from a blocked cell and count the arcs which hold a neighbour (the even positions)
+        first = passable.index(False)
+        arcs, inside = 0, False
+        for step in range(1, 9):
+            position = (first + step) % 8
+            if not passable[position]:
+                inside = False
+            elif position % 2 == 0 and not inside:
+                arcs += 1
+                inside = True
+        return arcs == 1
+
+    '''This function searches from every neighbour at once and gives every part which turns out to be cut off a new
+    label, the last part keeps the label of the component. It returns False when it gives up since the searches grew
+    beyond a quarter of the board.'''
+    def split(self, neighbors):
+        board, labels = self.board, self.labels
+        limit = board.size ** 2 // 4
+        owner = {neighbor: number for number, neighbor in enumerate(neighbors)}  # Cell -> the search which reached it
+        merged = list(range(len(neighbors)))  # The search which a search was merged into
+        frontiers = [collections.deque([neighbor]) for neighbor in neighbors]
+        active = list(range(len(neighbors)))
+
+        def find(search):
+            while merged[search] != search:
+                search = merged[search]
+            return search
+
+        while len(active) > 1:
+            for search in list(active):
+                if search not in active:
+                    continue
+                frontier = frontiers[search]
+                if not frontier:  # Everything this search can reach is cut off from the other searches
+                    label = len(self.parent)
+                    self.parent.append(label)
+                    for cell, number in owner.items():
+                        if find(number) == search:
+                            labels[cell] = label
+                    active.remove(search)
+                    if len(active) == 1:
+                        break
+                    continue
+                cell = frontier.popleft()
+                for neighbor in board.passableNeighbors(cell):
+                    number = owner.get(neighbor)
+                    if number is None:
+                        owner[neighbor] = search
+                        frontier.append(neighbor)
+                        if len(owner) > limit:
+                            return False
+                        continue
+                    number = find(number)
+                    if number != search:  # Two searches meet, so their parts are connected
+                        merged[number] = search
+                        frontier.extend(frontiers[number])
+                        frontiers[number] = None
+                        active.remove(number)
+                if len(active) == 1:
+                    break
+        return True
@@ -0,0 +1,185 @@
+'''
+This module contains a board for maps which are too large to keep in memory. The map is split into square tiles of
+tile x tile cells. A tile is only made when a search (or anything else) reads one of its cells for the first time: it is
+loaded from the directory of the board when it was written there before, otherwise it is generated from its own seed,
+which follows from the seed of the board and the position of the tile, so the same map comes back every time. At most
+cache tiles are kept, the tile which was used the longest ago is evicted first and generated (or loaded) again when it
+is needed later. A tile with a changed cell is written to the directory when it is evicted, without a directory it is
+kept in memory instead. Since the board is sparse the searches of the Engine use SparseBuffers, so the memory depends on
+the explored area and not on the size of the map:
+    board = ChunkedBoard(1000000, seed=1)
+    Engine.solve(board, (500000, 500000), (500300, 500200))
+'''
+import collections
+import os
+import random
+
+import Board
+
+TILE_SIZE = 256  # The default amount of rows and columns of a tile
+TILE_CACHE = 64  # The default amount of tiles which are kept in memory
+
+
+class ChunkedBoard(Board.Board):
+    '''
+    This class is a Board whose grid is made tile by tile. It has the same interface as a Board (grid[index],
+    board.board[row][column], passableNeighbors, setValue, listeners, ...), so the searches run on it unchanged. Just
+    like a Board a quarter of the cells is an obstacle (per tile) and the upper left and lower right corner are not.
+    generated, loaded and evictions count how the tiles were made and dropped. Saving the board as one file is not
+    possible, flush() writes the changed tiles to the directory instead.
+    '''
+    sparse = True
+
+    def __init__(self, size, seed=None, tile=TILE_SIZE, cache=TILE_CACHE, directory=None):
+        if tile < 1 or cache < 1:
+            raise ValueError('The tiles must have at least one cell and at least one tile must be kept!')
+        self.size = size
+        self.tile = tile
+        self.cache = cache
+        self.directory = directory
+        self.random = random.Random(seed)
+        self.listeners = []
+        self.version = 0
+        self.board = Board.BoardRows(self)
+        self.start = (0, 0)
+        self.destination = (size - 1, size - 1)
+        self.tiles = collections.OrderedDict()  # (tile row, tile column) -> bytearray, the most recent use last
+        self.kept = {}  # The changed tiles which were evicted while there is no directory to write them to
+        self.changed = set()  # The tiles with a changed cell which have not been written yet
+        self.generated = self.loaded = self.evictions = 0
+        self.grid = TileGrid(self)
+        self.generateBoard()
+
+    '''This function starts a new map: every tile is dropped and the tiles get new seeds. Changed tiles are lost, tiles
+    which were written to the directory will be loaded again.'''
+    def generateBoard(self):
+        self.seed = self.random.getrandbits(64)
+        self.tiles.clear()
+        self.kept.clear()
+        self.changed.clear()
+        self.grid.forget()
+        self.version += 1
+        self.notifyListeners('board', None, None)
+
+    '''The obstacles of a tile are generated together with its values, so this starts a new map as well'''
+    def generateObstacles(self):
+        self.generateBoard()
+
+    '''This function returns the cells of a tile as a bytearray (tile rows of tile bytes), from the cache if possible'''
+    def tileAt(self, tile_row, tile_column):
+        key = tile_row, tile_column
+        tiles = self.tiles
+        cells = tiles.get(key)
+        if cells is not None:
+            tiles.move_to_end(key)
+            return cells
+        cells = self.kept.pop(key, None)
+        if cells is None:
+            cells = self.readTile(key)
+        if cells is None:
+            cells = self.makeTile(key)
+        tiles[key] = cells
+        if len(tiles) > self.cache:
+            self.evict()
+        return cells
+
+    '''This function drops the tile which was used the longest ago, a changed tile is written or kept'''
+    def evict(self):
+        key, cells = self.tiles.popitem(last=False)
+        self.evictions += 1
+        if key in self.changed:
+            if self.directory is None:
+                self.kept[key] = cells
+            else:
+                self.writeTile(key, cells)
+
+    '''This function returns the path of the file of a tile in the directory'''
+    def tilePath(self, key):
+        return os.path.join(self.directory, f'{key[0]}_{key[1]}.tile')
+
+    '''This function reads a tile from the directory, or returns None when it isn't there'''
+    def readTile(self, key):
+        if self.directory is None or not os.path.exists(self.tilePath(key)):
+            return None
+        with open(self.tilePath(key), 'rb') as file:
+            cells = bytearray(file.read())
+        if len(cells) != self.tile ** 2:
+            raise ValueError(f'{self.tilePath(key)} is not a tile of {self.tile} x {self.tile} cells!')
+        self.loaded += 1
+        return cells
+
+    '''This function writes a tile to the directory'''
+    def writeTile(self, key, cells):
+        os.makedirs(self.directory, exist_ok=True)
+        with open(self.tilePath(key), 'wb') as file:
+            file.write(cells)
+        self.changed.discard(key)
+
+    '''This function generates a tile from its own seed: values of 1-5 with a quarter of obstacles, the upper left and
+    lower right corner of the board are never an obstacle. Cells of the tile beyond the edge of the board are unused.'''
+    def makeTile(self, key):
+        tile = self.tile
+        rng = random.Random(f'{self.seed}-{key[0]}-{key[1]}')
+        cells = Board.randomValues(rng, tile ** 2)
+        excluded = []
+        for row, column in ((0, 0), (self.size - 1, self.size - 1)):
+            if (row // tile, column // tile) == key:
+                excluded.append(row % tile * tile + column % tile)
+        Board.placeObstacles(rng, cells, tile ** 2 // 4, excluded)
+        self.generated += 1
+        return cells
+
+    '''This function writes every changed tile to the directory'''
+    def flush(self):
+        if self.directory is None:
+            raise ValueError('The board has no directory to write its tiles to!')
+        for key in list(self.changed):
+            self.writeTile(key, self.tiles[key] if key in self.tiles else self.kept.pop(key))
+
+    def save(self, path):
+        raise ValueError('A chunked board cannot be saved as one file, use a directory and flush() instead!')
+
+    def exportText(self, path):
+        raise ValueError('A chunked board cannot be exported as one file, use a directory and flush() instead!')
+
+
+class TileGrid:
+    '''
+    This class is the grid of a ChunkedBoard: grid[index] gives the byte of a cell with the same flat index as in a
+    Board (a slice gives bytes), setting it changes the tile. The tile of the last read is remembered, searches mostly
+    read cells close to each other, so most reads don't need the cache of the board.
+    '''
+    def __init__(self, board):
+        self.owner = board
+        self.forget()
+
+    def __len__(self):
+        return self.owner.size ** 2
+
+    '''This function forgets the last tile, e.g. when the map of the board was generated again'''
+    def forget(self):
+        self.key = self.cells = None
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):  # The cells of a slice as bytes, like a slice of the bytearray of a Board
+            return bytes(self[position] for position in range(*index.indices(len(self))))
+        board = self.owner
+        tile = board.tile
+        row, column = divmod(index, board.size)
+        tile_row, row = divmod(row, tile)
+        tile_column, column = divmod(column, tile)
+        if (tile_row, tile_column) != self.key:
+            self.key = tile_row, tile_column
+            self.cells = board.tileAt(tile_row, tile_column)
+        return self.cells[row * tile + column]
+
+    def __setitem__(self, index, value):
+        board = self.owner
+        tile = board.tile
+        row, column = divmod(index, board.size)
+        tile_row, row = divmod(row, tile)
+        tile_column, column = divmod(column, tile)
+        self.key = tile_row, tile_column
+        self.cells = board.tileAt(tile_row, tile_column)  # The remembered tile must be the one which is changed
+        self.cells[row * tile + column] = value
+        board.changed.add(self.key)
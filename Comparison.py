@@ -1,45 +1,28 @@
 import Board
+import Engine
+import Hierarchical
 import time
 import queue
 import random
 
-def AStar(board):
-    board.resetVisitorFlags()
-    agenda = queue.PriorityQueue()
-    agenda.put((calculateHeuristic(board.start, board.destination)
-                - board.board[board.start[0]][board.start[1]], [board.start]))
-    while agenda.qsize() > 0:
-        pointer = agenda.get()
-        pathway, current_point = pointer[1], pointer[1][-1]
-        shortest_distance_to_current = board.visited[current_point[0]][current_point[1]]
-        travelled_distance = pointer[0] + board.board[current_point[0]][current_point[1]] - calculateHeuristic(current_point, board.destination)
-        if str(shortest_distance_to_current).isdigit() and travelled_distance >= shortest_distance_to_current:
-            continue
-        board.visited[current_point[0]][current_point[1]] = travelled_distance
-        if current_point == board.destination:
-            return travelled_distance, pathway
-        for point in filter(lambda point: not str(board.board[point[0]][point[1]]).isalpha()
-                                          and point not in pathway
-                                          and (not board.visited[point[0]][point[1]]
-                                               or travelled_distance > board.visited[point[0]][point[1]])
-                , findNeighbors(current_point, board.size)):
-            agenda.put((calculateHeuristic(point, board.destination) + travelled_distance, pathway + [point]))
-    return False
+# A state can be passed along to read the SearchStats of the search afterwards (state.stats), the callbacks are the
+# optional onExpand, onPush and onGoal hooks of Engine.aStar
+def AStar(board, frontier='heap', heuristic=None, state=None, **callbacks):
+    return Engine.aStar(board, frontier=frontier, heuristic=heuristic, state=state, **callbacks).asPair()
+
+def BidirectionalAStar(board, frontier='heap'):
+    return Engine.bidirectionalAStar(board, frontier=frontier).asPair()
+
+def HierarchicalAStar(board, index=None):
+    return Hierarchical.hierarchicalAStar(board, index=index).asPair()
+
+# IDA* only keeps the current pathway (and at most table cells in its transposition table) in memory
+def IDAStar(board, heuristic=None, table=Engine.TRANSPOSITION_LIMIT, **callbacks):
+    return Engine.iterativeDeepeningAStar(board, heuristic=heuristic, table=table, **callbacks).asPair()
 
-def calculateHeuristic(point1, point2):
-    return abs(point1[0] - point2[0]) + abs(point1[1] - point2[1])
-
-def findNeighbors(point, size):
-    nextPoints = []
-    if point[0] != 0:
-        nextPoints.append((point[0] - 1, point[1]))  # Add point above current
-    if point[1] != 0:
-        nextPoints.append((point[0], point[1] - 1))  # Add point left of current
-    if point[0] != size - 1:
-        nextPoints.append((point[0] + 1, point[1]))  # Add point below current
-    if point[1] != size - 1:
-        nextPoints.append((point[0], point[1] + 1))  # Add point right of current
-    return nextPoints
+# One search from all starts which stops at the k nearest goals, instead of an AStar for every (start, goal) pair
+def MultiAStar(board, starts, goals, k=1, field=None, **callbacks):
+    return [result.asPair() for result in Engine.multiSearch(board, starts, goals, k, field=field, **callbacks)]
 
 # ---------------------------------------------------------------------------------------------------------------------
 '''
@@ -242,17 +225,17 @@ def copyObstaclesAndWeights(board, grid):
                 grid.weights.update({(row, column): board.board[row][column]})
 
 # This function will perform the tests
-def test(size, amount, algorithms):
-    timer1, timer2, timer3 = 0, 0, 0
+def test(size, amount, algorithms, frontier='heap', seed=None):
+    timer1, timer2, timer3, timer4, timer5 = 0, 0, 0, 0, 0
+    rng = random.Random(seed)  # With a seed the boards, starts and destinations are the same every run
 
-    for i in range(amount):
-        board = Board.Board(size)
-        board.setStart(random.randint(0, board.size - 1), random.randint(0, board.size - 1))
-        board.setDestination(random.randint(0, board.size - 1), random.randint(0, board.size - 1))
+    for board in Board.BoardBatch(amount, size, rng.getrandbits(32)):
+        board.setStart(rng.randint(0, board.size - 1), rng.randint(0, board.size - 1))
+        board.setDestination(rng.randint(0, board.size - 1), rng.randint(0, board.size - 1))
 
         if 'personal' in algorithms:
             start = time.time()
-            personal = AStar(board)
+            personal = AStar(board, frontier)
             timer1 += (time.time() - start)
 
         if 'redblob' in algorithms:
@@ -263,10 +246,19 @@ def test(size, amount, algorithms):
             timer2 += (time.time() - start)
 
         if 'swift' in algorithms:
-            board.resetVisitorFlags()
             start = time.time()
             swift = astar(board.board, board.start, board.destination)
             timer3 += (time.time() - start)
+
+        if 'bidirectional' in algorithms:
+            start = time.time()
+            bidirectional = BidirectionalAStar(board, frontier)
+            timer4 += (time.time() - start)
+
+        if 'idastar' in algorithms:
+            start = time.time()
+            idastar = IDAStar(board)
+            timer5 += (time.time() - start)
         '''
         # This code can be activated to show the cases where the output of the three algorithms isn't the same.
         # Note that this will only work in test 1-4 
@@ -285,24 +277,30 @@ def test(size, amount, algorithms):
         result.append(round(timer2, 3))
     if 'swift' in algorithms:
         result.append(round(timer3, 3))
+    if 'bidirectional' in algorithms:
+        result.append(round(timer4, 3))
+    if 'idastar' in algorithms:
+        result.append(round(timer5, 3))
     print(result)
 
 
-# These are the tests, which are currently executed 10 times each.
-print('Test 1:')
-[test(5, 2000, ['personal', 'redblob', 'swift']) for x in range(10)]
+# These are the tests, which are currently executed 10 times each. They only run when this file is executed itself,
+# importing the implementations (e.g. in Benchmark.py) doesn't start them.
+if __name__ == '__main__':
+    print('Test 1:')
+    [test(5, 2000, ['personal', 'redblob', 'swift']) for x in range(10)]
 
-print('\nTest 2:')
-[test(10, 1000, ['personal', 'redblob', 'swift']) for x in range(10)]
+    print('\nTest 2:')
+    [test(10, 1000, ['personal', 'redblob', 'swift']) for x in range(10)]
 
-print('\nTest 3:')
-[test(20, 500, ['personal', 'redblob', 'swift']) for x in range(10)]
+    print('\nTest 3:')
+    [test(20, 500, ['personal', 'redblob', 'swift']) for x in range(10)]
 
-print('\nTest 4:')
-[test(50, 100, ['personal', 'redblob', 'swift']) for x in range(10)]
+    print('\nTest 4:')
+    [test(50, 100, ['personal', 'redblob', 'swift']) for x in range(10)]
 
-print('\nTest 5:')
-[test(100, 50, ['personal', 'redblob']) for x in range(10)]
+    print('\nTest 5:')
+    [test(100, 50, ['personal', 'redblob']) for x in range(10)]
 
-print('\nTest 6:')
-[test(200, 20, ['personal']) for x in range(10)]
+    print('\nTest 6:')
+    [test(200, 20, ['personal']) for x in range(10)]
@@ -0,0 +1,148 @@
+'''
+This module calculates the distance field of a source (see Engine.distanceField) on a huge board with delta-stepping on
+several worker processes. The rows of the board are split into bands, one band per worker, and the grid and the
+distances lie in shared memory, so nothing of the board is copied to the workers. The work goes in rounds which are led
+by this process: the distances are divided into buckets of delta, every round each worker relaxes the cells of its band
+whose distance lies below the end of the lowest bucket which still holds a cell, in order of distance. A neighbour in
+the own band is updated right away, a neighbour in another band is sent to its worker (only the lowest distance per
+cell), which applies it at the start of the next round. A cell whose distance is lowered later is relaxed again, so when
+no worker holds a cell anymore and no relaxation is underway every distance is final: the field is the same as the one
+of the sequential UCS (Engine.distanceField, the UCS of Main.uniformCostOrAStar without a goal). The values of 1-5 keep
+a bucket small, most rounds only exchange the cells on the borders of the bands. A larger delta means fewer rounds but
+more cells which are relaxed twice.
+    field = DeltaStepping.deltaStepping(board, (0, 0), workers=8)
+'''
+import multiprocessing
+import os
+from array import array
+from multiprocessing import shared_memory
+
+import Board
+import Engine
+import Frontier
+
+DELTA = 32  # The default width of a bucket of distances
+
+
+'''This function calculates the distance from source (a (row, column) point) to every cell of the board with at most
+workers processes (by default one per core) and buckets of delta. It returns a flat array('i') with the distance of
+every reachable cell and UNVISITED for the others, just like Engine.distanceField(board, source).'''
+def deltaStepping(board, source, workers=None, delta=DELTA):
+    board.checkPoint(*source)
+    if board.sparse:
+        raise ValueError('Delta-stepping needs a dense board, its distances take four bytes for every cell!')
+    if delta < 1:
+        raise ValueError('The buckets of delta-stepping must be at least 1 wide!')
+    size, cells = board.size, board.size ** 2
+    workers = max(1, min(workers or os.cpu_count() or 1, size))
+    height = -(-size // workers)  # The amount of rows of a band, the last band can have fewer
+    segments, processes, connections = [], [], []
+    try:
+        # Every segment is kept in segments as soon as it exists, so it is given free again when the next one fails
+        grid_memory = shared_memory.SharedMemory(create=True, size=cells)
+        segments.append(grid_memory)
+        distance_memory = shared_memory.SharedMemory(create=True, size=4 * cells)
+        segments.append(distance_memory)
+        grid_memory.buf[:cells] = board.grid
+        distance_memory.buf[:4 * cells] = memoryview(Engine.blankBuffer(cells)).cast('B')
+        for first in range(0, size, height):
+            connection, other = multiprocessing.Pipe()
+            process = multiprocessing.Process(target=relaxBand, daemon=True,
+                                              args=(grid_memory.name, distance_memory.name, size, first, height, other))
+            process.start()
+            other.close()
+            processes.append(process)
+            connections.append(connection)
+        inboxes = [array('i') for connection in connections]
+        source_index = board.index(*source)
+        inboxes[source_index // size // height].extend((source_index, 0))
+        lowest = 0
+        while lowest is not None:
+            limit = (lowest // delta + 1) * delta
+            for connection, inbox in zip(connections, inboxes):
+                connection.send((limit, inbox.tobytes()))
+            inboxes, lowest = [array('i') for connection in connections], None
+            for connection in connections:
+                reply = connection.recv()
+                if isinstance(reply, Exception):
+                    raise reply
+                outgoing, pending = reply
+                if pending is not None and (lowest is None or pending < lowest):
+                    lowest = pending
+                for band, messages in outgoing.items():
+                    inboxes[band].frombytes(messages)
+                    arrived = min(inboxes[band][1::2])
+                    if lowest is None or arrived < lowest:
+                        lowest = arrived
+        field = array('i')
+        field.frombytes(distance_memory.buf[:4 * cells])
+        return field
+    finally:
+        for connection in connections:
+            try:
+                connection.send(None)
+            except OSError:  # The worker has stopped already
+                pass
+            connection.close()
+        for process in processes:
+            process.join(1)
+            if process.is_alive():
+                process.terminate()
+        for memory in segments:
+            memory.close()
+            memory.unlink()
+
+
+'''This function is a worker process of delta-stepping, it owns the rows first up to first + height. Every round it
+gets the end of the bucket (limit) and the relaxations of the other bands (pairs of index and distance), and replies
+with its relaxations for the other bands (band -> pairs) and the lowest distance it still has to relax (or None).'''
+def relaxBand(grid_name, distance_name, size, first, height, connection):
+    grid_memory = shared_memory.SharedMemory(name=grid_name)
+    distance_memory = shared_memory.SharedMemory(name=distance_name)
+    grid = grid_memory.buf[:size ** 2]
+    distance = distance_memory.buf[:4 * size ** 2].cast('i')
+    board = Board.Board(size, grid=grid)
+    low, high = first * size, min(first + height, size) * size  # The indices of the band
+    agenda = Frontier.create('heap')
+    push, pop = agenda.push, agenda.pop
+    try:
+        while True:
+            command = connection.recv()
+            if command is None:
+                break
+            limit, incoming = command
+            messages = array('i')
+            messages.frombytes(incoming)
+            for position in range(0, len(messages), 2):
+                index, travelled_distance = messages[position], messages[position + 1]
+                if distance[index] == Board.UNVISITED or travelled_distance < distance[index]:
+                    distance[index] = travelled_distance
+                    push(travelled_distance, index)
+            outgoing = {}  # Index in another band -> the lowest distance found for it in this round
+            while agenda and agenda.peek() < limit:
+                travelled_distance, current_index = pop()
+                if travelled_distance != distance[current_index]:
+                    continue  # The distance of this cell has been lowered since it was pushed
+                for index in board.passableNeighbors(current_index):
+                    new_distance = travelled_distance + grid[index]
+                    # The distances of other bands are only read, a band only lowers them so an old value is safe
+                    old_distance = distance[index]
+                    if old_distance != Board.UNVISITED and new_distance >= old_distance:
+                        continue
+                    if low <= index < high:
+                        distance[index] = new_distance
+                        push(new_distance, index)
+                    elif index not in outgoing or new_distance < outgoing[index]:
+                        outgoing[index] = new_distance
+            bands = {}
+            for index, new_distance in outgoing.items():
+                bands.setdefault(index // size // height, array('i')).extend((index, new_distance))
+            connection.send(({band: pairs.tobytes() for band, pairs in bands.items()},
+                             agenda.peek() if agenda else None))
+    except Exception as error:  # The leading process raises it again
+        connection.send(error)
+    finally:
+        distance.release()
+        grid.release()
+        grid_memory.close()
+        distance_memory.close()
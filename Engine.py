@@ -0,0 +1,910 @@
+'''
+This module contains the search algorithms (A*, UCS, BFS, DFS, bidirectional A*/Dijkstra, IDA*, ARA* and beam search)
+without any link to the GUI, and multiSearch for many starts and goals at once. Every search works on the flat grid of a
+Board and keeps its own distance/predecessor buffers in a SearchState (IDA* only keeps its current pathway), so the
+board itself is never changed by a search. The GUI (Main.py) and the comparison (Comparison.py) call solve() and look at
+the SearchResult which it returns, a caller which wants to follow the calculation step by step can pass an onExpand
+callback.
+'''
+import collections
+import functools
+import time
+from array import array
+
+import Board
+import Frontier
+
+# The window of priorities which a bucket frontier must hold: a pushed priority lies at most the value of the entered
+# cell above the popped priority for UCS, and at most twice the largest cell value above it for A* with a consistent
+# heuristic (the heuristic can change by at most the value of a cell between two neighbours).
+BUCKET_SPAN = 2 * Board.MAX_VALUE + 2
+TRANSPOSITION_LIMIT = 2 ** 16  # The default amount of cells which the transposition table of IDA* remembers
+ANYTIME_WEIGHT = 3.0  # The weight of the heuristic in the first iteration of ARA*
+ANYTIME_STEP = 0.5  # The amount by which ARA* lowers the weight after every iteration
+BEAM_WIDTH = 1000  # The default cap on the amount of cells in the agenda of beam search
+
+
+class SearchCancelled(Exception):
+    '''
+    This exception can be raised by a callback (e.g. onExpand) to stop a search, the search doesn't catch it. This way
+    a search can be cancelled from another thread without any check in the search loop itself.
+    '''
+
+
+class SearchResult:
+    '''
+    This class holds the outcome of a search: the algorithm, the total distance (cost) of the pathway, the pathway itself
+    as a list of (row, column) points from start to goal, the amount of expanded cells and the elapsed time in seconds.
+    When no pathway exists then cost and path are None. The searches of this module add their SearchStats as well.
+    An anytime search (ARA*) and beam search add their suboptimality bound: the cost is at most bound times the lowest
+    cost, so a bound of 1 means that the pathway is optimal.
+    '''
+    def __init__(self, algorithm, cost, path, expanded, elapsed, stats=None, bound=None):
+        self.algorithm = algorithm
+        self.cost = cost
+        self.path = path
+        self.expanded = expanded
+        self.elapsed = elapsed
+        self.stats = stats
+        self.bound = bound
+
+    def __repr__(self):
+        return f'SearchResult(algorithm={self.algorithm!r}, cost={self.cost}, expanded={self.expanded}, ' \
+               f'elapsed={self.elapsed:.6f})'
+
+    '''Returns True when a pathway has been found'''
+    @property
+    def found(self):
+        return self.path is not None
+
+    '''Returns the result in the (cost, path) format of Comparison.AStar, or False when no pathway has been found'''
+    def asPair(self):
+        return (self.cost, self.path) if self.found else False
+
+
+class SearchStats:
+    '''
+    This class holds the counters of one search: the expanded cells, the pushes on the agenda, the stale pops (cells
+    which had already been expanded when they were taken from the agenda again), the peak size of the agenda, the cells
+    which were dropped from a full agenda (pruned, only by beam search) and the time in seconds of every phase: 'setup'
+    (preparing the buffers and agenda), 'search' and 'trace' (rebuilding the pathway). The searches count in local
+    variables and only write the totals here at the end.
+    '''
+    def __init__(self):
+        self.expanded = 0
+        self.pushed = 0
+        self.stale = 0
+        self.peakFrontier = 0
+        self.pruned = 0
+        self.phases = {}
+
+    def __repr__(self):
+        return f'SearchStats(expanded={self.expanded}, pushed={self.pushed}, stale={self.stale}, ' \
+               f'peakFrontier={self.peakFrontier}, pruned={self.pruned}, phases={self.phases})'
+
+    '''This function stores the totals of the counters of the search'''
+    def record(self, pushed, stale, peakFrontier, pruned=0):
+        self.pushed, self.stale, self.peakFrontier, self.pruned = pushed, stale, peakFrontier, pruned
+
+    '''Returns the counters and phases as a dictionary, e.g. to write them as JSON'''
+    def asDict(self):
+        return {'expanded': self.expanded, 'pushed': self.pushed, 'stale': self.stale,
+                'peakFrontier': self.peakFrontier, 'pruned': self.pruned, 'phases': dict(self.phases)}
+
+
+class SearchState:
+    '''
+    This class holds the buffers of one search: the travelled distance to every expanded cell and the index of the cell
+    it was reached from, together with the SearchStats of the search. It is handed to the callbacks (onExpand, onPush
+    and onGoal), which can rebuild the current pathway with it.
+    A caller which runs many searches on boards of the same size can pass the same state to every search (state=...),
+    the buffers are then reset with a copy of a blank buffer instead of being allocated again for every search. On a
+    sparse board (see Chunked.py) the buffers are SparseBuffers, which only hold the cells the search has reached.
+    '''
+    def __init__(self, board):
+        self.board = board
+        self.distance = scratchBuffer(board)
+        self.predecessor = scratchBuffer(board)
+        self.expanded = 0
+        self.stats = SearchStats()
+
+    '''This function prepares the state for a new search on board, which must have the same size'''
+    def reset(self, board):
+        if board.size != self.board.size or board.sparse != self.board.sparse:
+            raise ValueError('The search state was made for a board of a different size!')
+        self.board = board
+        if board.sparse:
+            self.distance.clear()
+            self.predecessor.clear()
+        else:
+            blank = blankBuffer(board.size ** 2)
+            self.distance[:] = blank
+            self.predecessor[:] = blank
+        self.expanded = 0
+        self.stats = SearchStats()
+
+    '''This function rebuilds the pathway (a list of indices) from the start up to index'''
+    def tracePathway(self, index):
+        pathway = []
+        while index != Board.UNVISITED:
+            pathway.append(index)
+            index = self.predecessor[index]
+        pathway.reverse()
+        return pathway
+
+    '''This function rebuilds the pathway as a list of (row, column) points from the start up to index'''
+    def pathway(self, index):
+        return [self.board.point(index) for index in self.tracePathway(index)]
+
+    '''This function wraps the state up into a SearchResult, goal is None when no pathway has been found. began is the
+    moment the search was called and searching the moment its setup was done, they give the times of the phases.'''
+    def result(self, algorithm, goal, began, searching):
+        tracing = time.perf_counter()
+        pathway = None if goal is None else self.pathway(goal)
+        finished = time.perf_counter()
+        self.stats.expanded = self.expanded
+        self.stats.phases.update(setup=searching - began, search=tracing - searching, trace=finished - tracing)
+        return SearchResult(algorithm, None if goal is None else self.distance[goal], pathway, self.expanded,
+                            finished - began, self.stats)
+
+
+'''This function returns a buffer of the given amount of UNVISITED values. The buffers of the last two sizes are kept,
+so resetting a SearchState only copies memory.'''
+@functools.lru_cache(maxsize=2)
+def blankBuffer(cells):
+    return array('i', [Board.UNVISITED]) * cells
+
+
+class SparseBuffer(dict):
+    '''
+    This class is a buffer for a sparse board: a dictionary from index to value which only holds the cells that have
+    been written, every other cell reads as default (without being stored). So its memory grows with the explored area
+    instead of with the size of the board.
+    '''
+    def __init__(self, default=Board.UNVISITED):
+        super().__init__()
+        self.default = default
+
+    def __missing__(self, index):
+        return self.default
+
+
+'''This function returns a new buffer for a search on board: a flat array of UNVISITED values, or of 0 bytes when flags
+is True, and a SparseBuffer with the same default when the board is sparse.'''
+def scratchBuffer(board, flags=False):
+    if board.sparse:
+        return SparseBuffer(0 if flags else Board.UNVISITED)
+    return bytearray(board.size ** 2) if flags else array('i', blankBuffer(board.size ** 2))
+
+
+'''This function returns the state for a new search: the given state after a reset, or a new one.'''
+def prepareState(board, state):
+    if state is None:
+        return SearchState(board)
+    state.reset(board)
+    return state
+
+
+'''Calculates the heuristic (Manhattan distance) from a certain point to the destination.'''
+def calculateHeuristic(point1, point2):
+    return abs(point1[0] - point2[0]) + abs(point1[1] - point2[1])
+
+
+'''This function fills in the board's start and destination when no start or goal is given and checks them.'''
+def endpoints(board, start, goal):
+    start = board.start if start is None else tuple(start)
+    goal = board.destination if goal is None else tuple(goal)
+    board.checkPoint(*start)
+    board.checkPoint(*goal)
+    return start, goal
+
+
+'''This function checks whether no pathway can exist from start_index to goal_index, so a search can give up before it
+starts: when the goal is an obstacle (it cannot be entered) or, when the ComponentIndex of the board has been built
+and is current (see Board.currentComponents), when they lie in different components. Without such an index only the
+first check is done and the search finds out about other components itself.'''
+def unreachable(board, start_index, goal_index):
+    if start_index != goal_index and board.grid[goal_index] == Board.OBSTACLE:
+        return True
+    components = board.currentComponents()
+    return components is not None and not components.connected(start_index, goal_index)
+
+
+'''Calculates the pathway with the Algorithm A*, the heuristic is the Manhattan distance to the goal. Since every cell
+costs at least 1 this heuristic is consistent, so the first time a cell is taken from the agenda its distance is final.
+Another consistent heuristic can be passed along, this is an object with a method estimator(board, goal_index) which
+returns a function that gives the lower bound of the distance from an index to the goal (see Landmarks.py).'''
+def aStar(board, start=None, goal=None, onExpand=None, frontier='heap', state=None, heuristic=None, onPush=None,
+          onGoal=None):
+    return bestFirstSearch('astar', board, start, goal, True, onExpand, frontier, state, heuristic, onPush, onGoal)
+
+
+'''Calculates the pathway with Uniform Cost Search (UCS).'''
+def uniformCost(board, start=None, goal=None, onExpand=None, frontier='heap', state=None, onPush=None, onGoal=None):
+    return bestFirstSearch('ucs', board, start, goal, False, onExpand, frontier, state, None, onPush, onGoal)
+
+
+'''Calculates a pathway with Breadth First Search (BFS), the pathway has the least cells but not the lowest cost.'''
+def breadthFirst(board, start=None, goal=None, onExpand=None, state=None, onPush=None, onGoal=None):
+    return blindSearch('bfs', board, start, goal, True, onExpand, state, onPush, onGoal)
+
+
+'''Calculates a pathway with Depth First Search (DFS).'''
+def depthFirst(board, start=None, goal=None, onExpand=None, state=None, onPush=None, onGoal=None):
+    return blindSearch('dfs', board, start, goal, False, onExpand, state, onPush, onGoal)
+
+
+'''This function is the shared implementation of A* and UCS. The agenda is a frontier (see Frontier.py) of the given
+kind, its priority is heuristic + travelled distance (A*) or just the travelled distance (UCS) and an item looks like
+this (index, previous_index, travelled_distance). The distance to the start is 0, the value of a cell is paid when
+entering it. The callbacks are optional: onExpand(state, index) when a cell is expanded, onPush(state, index, priority)
+when a cell is put on the agenda and onGoal(state, index) when the goal is reached. The counters of the SearchStats are
+kept in local variables, the size of the agenda follows from them (pushes - expansions - stale pops).'''
+def bestFirstSearch(algorithm, board, start, goal, astar, onExpand, frontier='heap', state=None, heuristic=None,
+                    onPush=None, onGoal=None):
+    began = time.perf_counter()
+    start, goal = endpoints(board, start, goal)
+    state = prepareState(board, state)
+    grid, distance, predecessor, size = board.grid, state.distance, state.predecessor, board.size
+    goal_index, (goal_row, goal_column) = board.index(*goal), goal
+    estimate = heuristic.estimator(board, goal_index) if astar and heuristic is not None else None
+    agenda = Frontier.create(frontier, BUCKET_SPAN)
+    push, pop = agenda.push, agenda.pop
+    start_index = board.index(*start)
+    if unreachable(board, start_index, goal_index):
+        state.stats.record(0, 0, 0)
+        return state.result(algorithm, None, began, time.perf_counter())
+    if not astar:
+        priority = 0
+    else:
+        priority = calculateHeuristic(start, goal) if estimate is None else estimate(start_index)
+    push(priority, (start_index, Board.UNVISITED, 0))
+    if onPush is not None:
+        onPush(state, start_index, priority)
+    pushed, stale, peak, found = 1, 0, 1, None
+    searching = time.perf_counter()
+    while agenda:
+        value, (current_index, previous_index, travelled_distance) = pop()
+        if distance[current_index] != Board.UNVISITED:
+            stale += 1
+            continue  # This cell has already been expanded via a pathway which was at least as short
+        distance[current_index] = travelled_distance
+        predecessor[current_index] = previous_index
+        state.expanded += 1
+        if onExpand is not None:
+            onExpand(state, current_index)
+        if current_index == goal_index:
+            found = current_index
+            if onGoal is not None:
+                onGoal(state, current_index)
+            break
+        for index in board.passableNeighbors(current_index):
+            if distance[index] == Board.UNVISITED:
+                new_distance = travelled_distance + grid[index]
+                if estimate is not None:
+                    priority = new_distance + estimate(index)
+                elif astar:
+                    row, column = divmod(index, size)
+                    priority = new_distance + abs(row - goal_row) + abs(column - goal_column)
+                else:
+                    priority = new_distance
+                push(priority, (index, current_index, new_distance))
+                pushed += 1
+                if onPush is not None:
+                    onPush(state, index, priority)
+        if pushed - state.expanded - stale > peak:
+            peak = pushed - state.expanded - stale
+    state.stats.record(pushed, stale, peak)
+    return state.result(algorithm, found, began, searching)
+
+
+'''Calculates the pathway with bidirectional A*: one A* from the start and one from the goal at the same time.'''
+def bidirectionalAStar(board, start=None, goal=None, onExpand=None, frontier='heap', state=None, onPush=None,
+                       onGoal=None):
+    return bidirectionalSearch('biastar', board, start, goal, True, onExpand, frontier, state, onPush, onGoal)
+
+
+'''Calculates the pathway with bidirectional Dijkstra (UCS from the start and from the goal at the same time).'''
+def bidirectionalDijkstra(board, start=None, goal=None, onExpand=None, frontier='heap', state=None, onPush=None,
+                          onGoal=None):
+    return bidirectionalSearch('bidijkstra', board, start, goal, False, onExpand, frontier, state, onPush, onGoal)
+
+
+'''This function is the shared implementation of bidirectional A* and Dijkstra. The forward search works like UCS from
+the start. The backward search walks from the goal against the direction of the pathway: the value of a cell is paid
+when entering it, so stepping back from a cell to its neighbour costs the value of the cell which is being left.
+Both searches use the same (averaged) potential p(v) = (h_goal(v) - h_start(v)) / 2, with the Manhattan distances to the
+goal and to the start, the forward priority is d_forward(v) + p(v) and the backward priority d_backward(v) - p(v). All
+priorities are doubled to keep them integer. mu is the cost of the best pathway through a cell which both searches have
+reached, the search stops when the two smallest priorities add up to at least mu (twice mu, doubled): every pathway
+which has not been seen yet costs at least that much. Without a heuristic p is 0 and this is bidirectional Dijkstra.
+The forward search uses state, its predecessors lead back to the start, and its SearchStats count both sides. The
+callbacks get the state of the side which expanded or pushed the cell, the pathway of the backward state runs from the
+goal to the cell. onGoal gets the forward state and the cell where the two searches met.'''
+def bidirectionalSearch(algorithm, board, start, goal, astar, onExpand, frontier='heap', state=None, onPush=None,
+                        onGoal=None):
+    began = time.perf_counter()
+    start, goal = endpoints(board, start, goal)
+    states = (prepareState(board, state), SearchState(board))
+    grid, size = board.grid, board.size
+    start_index, goal_index = board.index(*start), board.index(*goal)
+    (start_row, start_column), (goal_row, goal_column) = start, goal
+
+    def potential(index):
+        if not astar:
+            return 0
+        row, column = divmod(index, size)
+        return abs(row - goal_row) + abs(column - goal_column) - abs(row - start_row) - abs(column - start_column)
+
+    if start_index == goal_index:
+        states[0].distance[start_index] = 0
+        states[0].expanded = 1
+        if onGoal is not None:
+            onGoal(states[0], start_index)
+        return states[0].result(algorithm, start_index, began, began)
+    if unreachable(board, start_index, goal_index):
+        states[0].stats.record(0, 0, 0)
+        return states[0].result(algorithm, None, began, time.perf_counter())
+    tentative = (scratchBuffer(board), scratchBuffer(board))
+    agendas = (Frontier.create(frontier, 2 * BUCKET_SPAN), Frontier.create(frontier, 2 * BUCKET_SPAN))
+    tentative[0][start_index] = 0
+    agendas[0].push(potential(start_index), (start_index, Board.UNVISITED, 0))
+    if onPush is not None:
+        onPush(states[0], start_index, potential(start_index))
+    if grid[goal_index] != Board.OBSTACLE:  # An obstacle cannot be entered, so then only the forward search runs
+        tentative[1][goal_index] = 0
+        agendas[1].push(-potential(goal_index), (goal_index, Board.UNVISITED, 0))
+        if onPush is not None:
+            onPush(states[1], goal_index, -potential(goal_index))
+    pushed, stale = len(agendas[0]) + len(agendas[1]), 0
+    peak, mu, meeting = pushed, None, None
+    searching = time.perf_counter()
+    while agendas[0] and agendas[1]:
+        tops = agendas[0].peek(), agendas[1].peek()
+        if mu is not None and tops[0] + tops[1] >= 2 * mu:
+            break  # No pathway which hasn't been seen yet can be shorter than mu
+        side = 0 if tops[0] <= tops[1] else 1
+        value, (current_index, previous_index, travelled_distance) = agendas[side].pop()
+        current = states[side]
+        if current.distance[current_index] != Board.UNVISITED:
+            stale += 1
+            continue  # This cell has already been expanded by this side via a pathway which was at least as short
+        current.distance[current_index] = travelled_distance
+        current.predecessor[current_index] = previous_index
+        current.expanded += 1
+        if onExpand is not None:
+            onExpand(current, current_index)
+        # Forward the step costs the value of the entered cell, backward the value of the cell which is left
+        step = None if side == 0 else grid[current_index]
+        sign = 1 if side == 0 else -1
+        for index in board.passableNeighbors(current_index):
+            if current.distance[index] != Board.UNVISITED:
+                continue
+            new_distance = travelled_distance + (grid[index] if step is None else step)
+            if tentative[side][index] == Board.UNVISITED or new_distance < tentative[side][index]:
+                tentative[side][index] = new_distance
+                current.predecessor[index] = current_index  # Tentative, it is final once index is expanded
+                priority = 2 * new_distance + sign * potential(index)
+                agendas[side].push(priority, (index, current_index, new_distance))
+                pushed += 1
+                if onPush is not None:
+                    onPush(current, index, priority)
+                if tentative[1 - side][index] != Board.UNVISITED:
+                    total = new_distance + tentative[1 - side][index]
+                    if mu is None or total < mu:
+                        mu, meeting = total, index
+        if pushed - states[0].expanded - states[1].expanded - stale > peak:
+            peak = pushed - states[0].expanded - states[1].expanded - stale
+    tracing = time.perf_counter()
+    expanded = states[0].expanded + states[1].expanded
+    stats = states[0].stats
+    stats.record(pushed, stale, peak)
+    stats.expanded = expanded
+    if mu is None:
+        pathway = None
+    else:
+        if onGoal is not None:
+            onGoal(states[0], meeting)
+        # The forward predecessors lead from the meeting cell back to the start, the backward ones on to the goal
+        indices = states[0].tracePathway(meeting) + states[1].tracePathway(meeting)[-2::-1]
+        pathway = [board.point(index) for index in indices]
+    finished = time.perf_counter()
+    stats.phases.update(setup=searching - began, search=tracing - searching, trace=finished - tracing)
+    return SearchResult(algorithm, mu, pathway, expanded, finished - began, stats)
+
+
+'''This function is the shared implementation of BFS (queue as agenda, FIFO) and DFS (stack as agenda, LIFO), both
+agendas are a deque without locks. An item in the agenda consists of the index of a cell and the index of the cell it
+was reached from. The callbacks work like in bestFirstSearch, onPush gets None as priority.'''
+def blindSearch(algorithm, board, start, goal, breadth, onExpand, state=None, onPush=None, onGoal=None):
+    began = time.perf_counter()
+    start, goal = endpoints(board, start, goal)
+    state = prepareState(board, state)
+    grid, distance, predecessor = board.grid, state.distance, state.predecessor
+    goal_index, start_index = board.index(*goal), board.index(*start)
+    if unreachable(board, start_index, goal_index):
+        state.stats.record(0, 0, 0)
+        return state.result(algorithm, None, began, time.perf_counter())
+    agenda = collections.deque([(start_index, Board.UNVISITED)])
+    if onPush is not None:
+        onPush(state, start_index, None)
+    get = agenda.popleft if breadth else agenda.pop
+    pushed, stale, peak, found = 1, 0, 1, None
+    searching = time.perf_counter()
+    while agenda:
+        current_index, previous_index = get()
+        if distance[current_index] != Board.UNVISITED:
+            stale += 1
+            continue  # If we already visited this point then we will not add it again
+        # The distance along the pathway is the distance of the previous cell plus the value of this cell
+        distance[current_index] = 0 if previous_index == Board.UNVISITED \
+            else distance[previous_index] + grid[current_index]
+        predecessor[current_index] = previous_index
+        state.expanded += 1
+        if onExpand is not None:
+            onExpand(state, current_index)
+        if current_index == goal_index:
+            found = current_index
+            if onGoal is not None:
+                onGoal(state, current_index)
+            break
+        for index in board.passableNeighbors(current_index):
+            if distance[index] == Board.UNVISITED:
+                agenda.append((index, current_index))
+                pushed += 1
+                if onPush is not None:
+                    onPush(state, index, None)
+        if len(agenda) > peak:
+            peak = len(agenda)
+    state.stats.record(pushed, stale, peak)
+    return state.result(algorithm, found, began, searching)
+
+
+class DepthState:
+    '''
+    This class is the state of IDA* which is handed to the callbacks instead of a SearchState: it only holds the pathway
+    from the start to the cell which is being expanded (path, a list of indices), the amount of expansions of all
+    iterations together, the amount of iterations and the SearchStats. tracePathway() and pathway() work like the ones
+    of a SearchState, but only for the last cell of the current pathway.
+    '''
+    def __init__(self, board):
+        self.board = board
+        self.path = []
+        self.expanded = 0
+        self.iterations = 0
+        self.stats = SearchStats()
+
+    '''This function returns the current pathway (a list of indices) from the start up to index, the last cell'''
+    def tracePathway(self, index):
+        return self.path[:self.path.index(index, len(self.path) - 1) + 1]
+
+    '''This function returns the current pathway as a list of (row, column) points from the start up to index'''
+    def pathway(self, index):
+        return [self.board.point(index) for index in self.tracePathway(index)]
+
+
+'''Calculates the pathway with Iterative Deepening A* (IDA*). Every iteration is a depth first search which doesn't go
+past cells whose travelled distance + heuristic is above a threshold, the next iteration raises the threshold to the
+lowest value which was cut off. So the memory only grows with the length of the pathway instead of with the explored
+area, in return cells are expanded again in every iteration. The heuristic is the Manhattan distance (as in
+calculateHeuristic) or another consistent heuristic like in aStar. The transposition table remembers the lowest
+travelled distance of at most table cells in the current iteration, a cell which is reached again without a lower
+distance is not searched again; table=0 turns it off. state is accepted like for the other searches but not used,
+since its buffers are as large as the board. The SearchStats count the expansions and pushes of all iterations, stale
+counts the cells which were skipped thanks to the transposition table and peakFrontier is the deepest pathway.'''
+def iterativeDeepeningAStar(board, start=None, goal=None, onExpand=None, state=None, heuristic=None,
+                            table=TRANSPOSITION_LIMIT, onPush=None, onGoal=None):
+    began = time.perf_counter()
+    start, goal = endpoints(board, start, goal)
+    grid, size = board.grid, board.size
+    goal_index, (goal_row, goal_column) = board.index(*goal), goal
+    if heuristic is not None:
+        estimate = heuristic.estimator(board, goal_index)
+    else:
+        def estimate(index):
+            row, column = divmod(index, size)
+            return abs(row - goal_row) + abs(column - goal_column)
+    depth = DepthState(board)
+    start_index = board.index(*start)
+    threshold = estimate(start_index)
+    if onPush is not None:
+        onPush(depth, start_index, threshold)
+    pushed, stale, peak, found, cost = 1, 0, 1, None, None
+    if unreachable(board, start_index, goal_index):
+        threshold = None  # The goal is an obstacle or lies in another component, so there is no need to search
+    searching = time.perf_counter()
+    while threshold is not None and found is None:
+        depth.iterations += 1
+        cutoff = None  # The lowest travelled distance + heuristic above the threshold
+        seen = {}  # The transposition table: index -> lowest travelled distance in this iteration
+        path, travelled, branches = [start_index], [0], []
+        depth.path = path
+        on_path = {start_index}
+        while path:
+            if len(branches) < len(path):  # The last cell of the pathway is new, expand it
+                current_index, travelled_distance = path[-1], travelled[-1]
+                depth.expanded += 1
+                if onExpand is not None:
+                    onExpand(depth, current_index)
+                if current_index == goal_index:
+                    found, cost = current_index, travelled_distance
+                    if onGoal is not None:
+                        onGoal(depth, current_index)
+                    break
+                children = []
+                for index in board.passableNeighbors(current_index):
+                    if index in on_path:
+                        continue
+                    new_distance = travelled_distance + grid[index]
+                    if seen.get(index, new_distance + 1) <= new_distance:
+                        stale += 1
+                        continue
+                    priority = new_distance + estimate(index)
+                    if priority > threshold:
+                        if cutoff is None or priority < cutoff:
+                            cutoff = priority
+                        continue
+                    children.append((priority, new_distance, index))
+                    pushed += 1
+                    if onPush is not None:
+                        onPush(depth, index, priority)
+                children.sort(reverse=True)  # The most promising cell is searched first
+                branches.append(children)
+                if len(path) > peak:
+                    peak = len(path)
+            children = branches[-1]
+            if not children:  # Every cell after the last one has been searched, go back
+                branches.pop()
+                travelled.pop()
+                on_path.discard(path.pop())
+                continue
+            priority, new_distance, index = children.pop()
+            if seen.get(index, new_distance + 1) <= new_distance:
+                stale += 1  # Another branch reached this cell with at most this distance in the meantime
+                continue
+            if index in seen or len(seen) < table:
+                seen[index] = new_distance
+            path.append(index)
+            travelled.append(new_distance)
+            on_path.add(index)
+        threshold = cutoff
+    depth.stats.record(pushed, stale, peak)
+    tracing = time.perf_counter()
+    pathway = None if found is None else depth.pathway(found)
+    finished = time.perf_counter()
+    depth.stats.expanded = depth.expanded
+    depth.stats.phases.update(setup=searching - began, search=tracing - searching, trace=finished - tracing)
+    return SearchResult('idastar', cost, pathway, depth.expanded, finished - began, depth.stats)
+
+
+'''Calculates the pathway with Anytime Repairing A* (ARA*). The first iteration is a weighted A* with priority
+travelled distance + weight * heuristic, which finds a pathway quickly whose cost is at most weight times the lowest
+cost. Every next iteration lowers the weight by step (down to 1) and improves the pathway, reusing the distances of the
+previous iterations: only the cells whose distance was lowered after they had been expanded (the inconsistent cells)
+and the rest of the agenda are searched again. The search stops with the optimal pathway once the weight is 1, or with
+the best pathway so far when deadline_ms milliseconds have passed since the call (a search without any pathway by then
+returns no pathway). onImprove(result) is called with the SearchResult of every better pathway, its bound is
+min(weight, cost / lowest travelled distance + heuristic on the agenda). The heuristic is the Manhattan distance or
+another consistent heuristic like in aStar, the agenda is always a heap since the priorities are not integers.'''
+def anytimeAStar(board, start=None, goal=None, onExpand=None, state=None, heuristic=None, weight=ANYTIME_WEIGHT,
+                 step=ANYTIME_STEP, deadline_ms=None, onImprove=None, onPush=None, onGoal=None):
+    began = time.perf_counter()
+    if weight < 1 or step <= 0:
+        raise ValueError('The weight of ARA* must be at least 1 and its step above 0!')
+    deadline = None if deadline_ms is None else began + deadline_ms / 1000
+    start, goal = endpoints(board, start, goal)
+    state = prepareState(board, state)
+    grid, distance, predecessor, size = board.grid, state.distance, state.predecessor, board.size
+    goal_index, (goal_row, goal_column) = board.index(*goal), goal
+    if heuristic is not None:
+        estimate = heuristic.estimator(board, goal_index)
+    else:
+        def estimate(index):
+            row, column = divmod(index, size)
+            return abs(row - goal_row) + abs(column - goal_column)
+    start_index = board.index(*start)
+    if unreachable(board, start_index, goal_index):
+        state.stats.record(0, 0, 0)
+        return SearchResult('arastar', None, None, 0, time.perf_counter() - began, state.stats)
+    distance[start_index] = 0
+    agenda = Frontier.create('heap')
+    agenda.push(weight * estimate(start_index), start_index)
+    if onPush is not None:
+        onPush(state, start_index, weight * estimate(start_index))
+    closed = scratchBuffer(board, flags=True)  # The cells which have been expanded in the current iteration
+    inconsistent = set()  # The cells whose distance was lowered after they had been expanded in this iteration
+    pushed, stale, peak, best, expired = 1, 0, 1, None, False
+    searching = time.perf_counter()
+    while True:
+        # Improve the pathway: expand until the goal has the lowest priority (its heuristic is 0)
+        while agenda and (distance[goal_index] == Board.UNVISITED or agenda.peek() < distance[goal_index]):
+            if deadline is not None and not state.expanded % 64 and time.perf_counter() > deadline:
+                expired = True
+                break
+            priority, current_index = agenda.pop()
+            if closed[current_index] or priority > distance[current_index] + weight * estimate(current_index):
+                stale += 1
+                continue  # Expanded already or pushed again with a lower distance since
+            closed[current_index] = 1
+            state.expanded += 1
+            if onExpand is not None:
+                onExpand(state, current_index)
+            travelled_distance = distance[current_index]
+            for index in board.passableNeighbors(current_index):
+                new_distance = travelled_distance + grid[index]
+                if distance[index] == Board.UNVISITED or new_distance < distance[index]:
+                    distance[index] = new_distance
+                    predecessor[index] = current_index
+                    if closed[index]:
+                        inconsistent.add(index)
+                    else:
+                        priority = new_distance + weight * estimate(index)
+                        agenda.push(priority, index)
+                        pushed += 1
+                        if onPush is not None:
+                            onPush(state, index, priority)
+            if len(agenda) > peak:
+                peak = len(agenda)
+        # Every cell on the agenda and every inconsistent cell gets the priority of the next weight
+        cells = inconsistent
+        while agenda:
+            priority, index = agenda.pop()
+            if not closed[index]:
+                cells.add(index)
+        lowest = min((distance[index] + estimate(index) for index in cells), default=None)
+        if distance[goal_index] != Board.UNVISITED:
+            # The predecessors always lead to a pathway, which can be cheaper than the distance of the goal when cells
+            # on it were improved later. The weight only bounds its cost when the iteration was finished, the agenda
+            # always gives a lower bound of the lowest cost.
+            pathway = state.tracePathway(goal_index)
+            cost = sum(grid[index] for index in pathway[1:])
+            bound = 1.0 if lowest is None or lowest >= cost else cost / lowest
+            if not expired:
+                bound = min(bound, weight)
+            if best is None or cost < best.cost or bound < best.bound:
+                if onGoal is not None and (best is None or cost < best.cost):
+                    onGoal(state, goal_index)
+                state.stats.record(pushed, stale, peak)  # The counters so far, in case the search is cancelled
+                state.stats.expanded = state.expanded
+                best = SearchResult('arastar', cost, [board.point(index) for index in pathway], state.expanded,
+                                    time.perf_counter() - began, state.stats, bound)
+                if onImprove is not None:
+                    onImprove(best)
+            if bound == 1.0:
+                break
+        if expired or weight == 1.0 or not cells:
+            break  # The time is up, the optimal iteration is done or every reachable cell has been expanded
+        weight = max(1.0, weight - step)
+        closed = scratchBuffer(board, flags=True)
+        inconsistent = set()
+        for index in cells:
+            agenda.push(distance[index] + weight * estimate(index), index)
+    state.stats.record(pushed, stale, peak)
+    state.stats.expanded = state.expanded
+    finished = time.perf_counter()
+    state.stats.phases.update(setup=searching - began, search=finished - searching, trace=0.0)
+    if best is None:
+        return SearchResult('arastar', None, None, state.expanded, finished - began, state.stats)
+    best.expanded, best.elapsed = state.expanded, finished - began
+    return best
+
+
+'''Calculates a pathway with beam search: A* whose agenda holds at most width cells. The agenda is a min-max heap (see
+Frontier.py), so when a push makes it too large the cell with the highest priority is dropped in O(log n). The memory
+and the time of the search are bounded this way, but a dropped cell can lie on the best pathway: every pathway through
+it costs at least its priority, so the lowest cost is at least min(cost, lowest dropped priority). The bound of the
+result is the cost divided by this, 1 means the pathway is optimal after all. When no pathway is found while cells were
+dropped (stats.pruned) there can still be one. The heuristic is the Manhattan distance or another consistent heuristic
+like in aStar.'''
+def beamSearch(board, start=None, goal=None, onExpand=None, state=None, heuristic=None, width=BEAM_WIDTH, onPush=None,
+               onGoal=None):
+    began = time.perf_counter()
+    if width < 1:
+        raise ValueError('The width of beam search must be at least 1!')
+    start, goal = endpoints(board, start, goal)
+    state = prepareState(board, state)
+    grid, distance, predecessor, size = board.grid, state.distance, state.predecessor, board.size
+    goal_index, (goal_row, goal_column) = board.index(*goal), goal
+    estimate = heuristic.estimator(board, goal_index) if heuristic is not None else None
+    agenda = Frontier.create('minmax')
+    push, pop, popMax = agenda.push, agenda.pop, agenda.popMax
+    start_index = board.index(*start)
+    if unreachable(board, start_index, goal_index):
+        state.stats.record(0, 0, 0)
+        return state.result('beam', None, began, time.perf_counter())
+    priority = calculateHeuristic(start, goal) if estimate is None else estimate(start_index)
+    push(priority, (start_index, Board.UNVISITED, 0))
+    if onPush is not None:
+        onPush(state, start_index, priority)
+    pushed, stale, peak, pruned, dropped, found = 1, 0, 1, 0, None, None
+    searching = time.perf_counter()
+    while agenda:
+        value, (current_index, previous_index, travelled_distance) = pop()
+        if distance[current_index] != Board.UNVISITED:
+            stale += 1
+            continue
+        distance[current_index] = travelled_distance
+        predecessor[current_index] = previous_index
+        state.expanded += 1
+        if onExpand is not None:
+            onExpand(state, current_index)
+        if current_index == goal_index:
+            found = current_index
+            if onGoal is not None:
+                onGoal(state, current_index)
+            break
+        for index in board.passableNeighbors(current_index):
+            if distance[index] == Board.UNVISITED:
+                new_distance = travelled_distance + grid[index]
+                if estimate is not None:
+                    priority = new_distance + estimate(index)
+                else:
+                    row, column = divmod(index, size)
+                    priority = new_distance + abs(row - goal_row) + abs(column - goal_column)
+                push(priority, (index, current_index, new_distance))
+                pushed += 1
+                if onPush is not None:
+                    onPush(state, index, priority)
+                if len(agenda) > width:  # Drop the worst cell, which can be the one which was just pushed
+                    worst, item = popMax()
+                    pruned += 1
+                    if dropped is None or worst < dropped:
+                        dropped = worst
+        if len(agenda) > peak:
+            peak = len(agenda)
+    state.stats.record(pushed, stale, peak, pruned)
+    result = state.result('beam', found, began, searching)
+    if result.found:
+        result.bound = 1.0 if dropped is None or dropped >= result.cost else result.cost / dropped
+    return result
+
+
+'''This function searches from many starts to many goals at once (lists of (row, column) points) instead of once per
+pair: the agenda begins with every start at distance 0 and the search stops as soon as k goals have been expanded
+(k=None for every goal). It returns a list with a SearchResult (algorithm 'multi') for each of those goals, the nearest
+first, whose pathway comes from the start which is nearest to that goal; goals which cannot be reached are left out, so
+the list can be shorter. With astar the priority includes a lower bound of the distance to the nearest goal:
+field[index] when a field is given (distanceField(board, goals, reverse=True), which is exact and can be reused for
+other starts), otherwise the lowest Manhattan distance (or estimate of heuristic, see aStar) over the goals, which takes
+one step per goal; without astar this is Dijkstra. The minimum of consistent heuristics is consistent, so every goal is
+expanded with its lowest distance and in the order of that distance. With a current ComponentIndex (see
+Board.currentComponents) the goals which lie in another component than every start are dropped first, so they cannot
+make the search run through the whole board. A bucket frontier only holds a window of BUCKET_SPAN priorities, when the
+priorities of the starts lie further apart the heap is used instead.
+The callbacks and the SearchStats (shared by the results) work like in bestFirstSearch, onGoal is called for every
+goal.'''
+def multiSearch(board, starts, goals, k=1, onExpand=None, frontier='heap', state=None, astar=True, heuristic=None,
+                field=None, onPush=None, onGoal=None):
+    began = time.perf_counter()
+    if not starts or not goals or (k is not None and k < 1):
+        raise ValueError('A multi search needs at least one start, one goal and a k of at least 1!')
+    for point in list(starts) + list(goals):
+        board.checkPoint(*point)
+    state = prepareState(board, state)
+    grid, distance, predecessor, size = board.grid, state.distance, state.predecessor, board.size
+    start_indices = {board.index(*point) for point in starts}
+    # An obstacle can be left but not entered, so it is only a goal when it is a start as well
+    targets = {board.index(*point) for point in goals}
+    targets = {index for index in targets if index in start_indices or grid[index] != Board.OBSTACLE}
+    components = board.currentComponents()
+    if components is not None:
+        entered = set().union(*(components.reachable(index) for index in start_indices))
+        targets = {index for index in targets if index in start_indices or components.component(index) in entered}
+    wanted = len(targets) if k is None else min(k, len(targets))
+    if not astar:
+        def estimate(index):
+            return 0
+    elif field is not None:
+        estimate = field.__getitem__  # UNVISITED: no goal can be reached from the cell
+    elif heuristic is not None:
+        estimators = [heuristic.estimator(board, index) for index in targets]
+
+        def estimate(index):
+            return min(estimator(index) for estimator in estimators)
+    else:
+        points = [divmod(index, size) for index in targets]
+
+        def estimate(index):
+            row, column = divmod(index, size)
+            return min(abs(row - goal_row) + abs(column - goal_column) for goal_row, goal_column in points)
+    pushed = stale = peak = 0
+    seeds = []
+    for index in start_indices if wanted else ():
+        priority = estimate(index)
+        if priority == Board.UNVISITED and grid[index] == Board.OBSTACLE:  # An obstacle is left via a neighbour
+            priority = min((grid[neighbor] + field[neighbor] for neighbor in board.passableNeighbors(index)
+                            if field[neighbor] != Board.UNVISITED), default=Board.UNVISITED)
+        if priority != Board.UNVISITED:
+            seeds.append((priority, index))
+    seeds.sort()  # In order, since a bucket frontier cannot go back to a lower priority
+    if frontier == 'bucket' and seeds and seeds[-1][0] - seeds[0][0] >= BUCKET_SPAN:
+        frontier = 'heap'  # The starts lie further apart than the window of the buckets
+    agenda = Frontier.create(frontier, BUCKET_SPAN)
+    push, pop = agenda.push, agenda.pop
+    for priority, index in seeds:
+        push(priority, (index, Board.UNVISITED, 0))
+        pushed += 1
+        if onPush is not None:
+            onPush(state, index, priority)
+    peak, found = pushed, []
+    searching = time.perf_counter()
+    while agenda:
+        value, (current_index, previous_index, travelled_distance) = pop()
+        if distance[current_index] != Board.UNVISITED:
+            stale += 1
+            continue
+        distance[current_index] = travelled_distance
+        predecessor[current_index] = previous_index
+        state.expanded += 1
+        if onExpand is not None:
+            onExpand(state, current_index)
+        if current_index in targets:
+            found.append(current_index)
+            if onGoal is not None:
+                onGoal(state, current_index)
+            if len(found) == wanted:
+                break
+        for index in board.passableNeighbors(current_index):
+            if distance[index] == Board.UNVISITED:
+                new_distance = travelled_distance + grid[index]
+                remaining = estimate(index)
+                if remaining == Board.UNVISITED:
+                    continue
+                push(new_distance + remaining, (index, current_index, new_distance))
+                pushed += 1
+                if onPush is not None:
+                    onPush(state, index, new_distance + remaining)
+        if pushed - state.expanded - stale > peak:
+            peak = pushed - state.expanded - stale
+    state.stats.record(pushed, stale, peak)
+    tracing = time.perf_counter()
+    pathways = [state.pathway(index) for index in found]
+    finished = time.perf_counter()
+    state.stats.expanded = state.expanded
+    state.stats.phases.update(setup=searching - began, search=tracing - searching, trace=finished - tracing)
+    return [SearchResult('multi', distance[index], pathway, state.expanded, finished - began, state.stats)
+            for index, pathway in zip(found, pathways)]
+
+
+'''This function calculates the distance from source (a (row, column) point, or a list of points for the distance from
+the nearest of them) to every cell of the board with UCS without a goal. It returns a flat array('i') with the distance
+of every reachable cell and UNVISITED for the others. With reverse=True it gives the distance from every cell to source
+instead (the cost-to-go when source is the goal, see multiSearch for a list of goals): the search walks backwards, so a
+step costs the value of the cell which is left instead of the entered one.'''
+def distanceField(board, source, frontier='bucket', reverse=False):
+    sources = [source] if isinstance(source[0], int) else source
+    for point in sources:
+        board.checkPoint(*point)
+    grid = board.grid
+    distance = array('i', blankBuffer(board.size ** 2))
+    agenda = Frontier.create(frontier, BUCKET_SPAN)
+    push, pop = agenda.push, agenda.pop
+    for point in sources:
+        source_index = board.index(*point)
+        if reverse and grid[source_index] == Board.OBSTACLE:  # An obstacle cannot be entered, only it reaches itself
+            distance[source_index] = 0
+        else:
+            push(0, source_index)
+    while agenda:
+        travelled_distance, current_index = pop()
+        if distance[current_index] != Board.UNVISITED:
+            continue
+        distance[current_index] = travelled_distance
+        for index in board.passableNeighbors(current_index):
+            if distance[index] == Board.UNVISITED:
+                push(travelled_distance + grid[current_index if reverse else index], index)
+    return distance
+
+
+# The algorithms which can be selected by name in solve()
+ALGORITHMS = {'astar': aStar, 'ucs': uniformCost, 'bfs': breadthFirst, 'dfs': depthFirst,
+              'biastar': bidirectionalAStar, 'bidijkstra': bidirectionalDijkstra, 'idastar': iterativeDeepeningAStar,
+              'arastar': anytimeAStar, 'beam': beamSearch}
+
+
+'''This function calculates the pathway on the board from start to goal (by default board.start and
+board.destination) with the algorithm of the given name and returns a SearchResult.'''
+def solve(board, start=None, goal=None, algorithm='astar', **options):
+    if algorithm not in ALGORITHMS:
+        raise ValueError(f'Unknown algorithm {algorithm!r}, choose one of {", ".join(ALGORITHMS)}')
+    return ALGORITHMS[algorithm](board, start, goal, **options)
@@ -0,0 +1,86 @@
+'''
+This module caches cost-to-go fields for queries which share their destination. A field holds for every cell the
+distance from that cell to the destination (see Engine.distanceField with reverse=True), so the cost of any start is one
+lookup and its pathway follows from walking downhill: every step goes to the neighbour with the smallest value plus
+cost-to-go, which takes O(length of the pathway). The fields are kept in a least recently used cache with a limit on
+the memory they take. An entry belongs to a destination and to the version of the board, every change of a value raises
+the version, so a field of an older board is never used again (values written into board.grid directly, without the
+methods of the Board, are not noticed).
+'''
+import collections
+import time
+
+import Board
+import Engine
+
+
+class FieldCache:
+    '''
+    This class holds the cost-to-go fields of a board, at most limit bytes of them. Use solve(start, goal) to get the
+    pathway as an Engine.SearchResult (algorithm 'field') or field(goal) for the field itself. hits, misses and
+    evictions count how the cache was used.
+    '''
+    def __init__(self, board, limit=64 * 1024 ** 2):
+        self.board = board
+        self.limit = limit
+        self.fields = collections.OrderedDict()  # (destination index, version) -> field, the most recent use last
+        self.bytes = 0
+        self.version = board.version
+        self.hits = self.misses = self.evictions = 0
+
+    '''This function returns the cost-to-go field of goal (a (row, column) point) and whether it was in the cache'''
+    def lookup(self, goal):
+        board = self.board
+        board.checkPoint(*goal)
+        if board.version != self.version:  # Fields of an older version are never used again
+            self.fields.clear()
+            self.bytes = 0
+            self.version = board.version
+        key = board.index(*goal), board.version
+        field = self.fields.get(key)
+        if field is not None:
+            self.hits += 1
+            self.fields.move_to_end(key)
+            return field, True
+        self.misses += 1
+        field = Engine.distanceField(board, goal, reverse=True)
+        size = field.itemsize * len(field)
+        if size <= self.limit:  # A field which is larger than the whole cache is handed out but not kept
+            while self.bytes + size > self.limit:
+                key_out, evicted = self.fields.popitem(last=False)
+                self.bytes -= evicted.itemsize * len(evicted)
+                self.evictions += 1
+            self.fields[key] = field
+            self.bytes += size
+        return field, False
+
+    '''This function returns the cost-to-go field of goal, from the cache when possible'''
+    def field(self, goal):
+        return self.lookup(goal)[0]
+
+    '''This function returns the pathway from start to goal (by default board.start and board.destination) as an
+    Engine.SearchResult, expanded is the amount of cells of the field when it had to be calculated and 0 otherwise.'''
+    def solve(self, start=None, goal=None):
+        began = time.perf_counter()
+        board, grid = self.board, self.board.grid
+        start, goal = Engine.endpoints(board, start, goal)
+        field, hit = self.lookup(goal)
+        expanded = 0 if hit else len(field) - field.count(Board.UNVISITED)
+        index, goal_index = board.index(*start), board.index(*goal)
+        # The start may be an obstacle (it can be left but not entered), then the best neighbour decides its cost
+        best = None
+        if index == goal_index:
+            best = 0
+        else:
+            for neighbor in board.passableNeighbors(index):
+                if field[neighbor] != Board.UNVISITED and (best is None or grid[neighbor] + field[neighbor] < best):
+                    best = grid[neighbor] + field[neighbor]
+        if best is None:
+            return Engine.SearchResult('field', None, None, expanded, time.perf_counter() - began)
+        pathway = [index]
+        while index != goal_index:
+            index = min((neighbor for neighbor in board.passableNeighbors(index) if field[neighbor] != Board.UNVISITED),
+                        key=lambda neighbor: grid[neighbor] + field[neighbor])
+            pathway.append(index)
+        return Engine.SearchResult('field', best, [board.point(index) for index in pathway], expanded,
+                                   time.perf_counter() - began)
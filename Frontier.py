@@ -0,0 +1,246 @@
+'''
+This module contains the agendas (frontiers) which the best-first searches (A* and UCS) in the Engine can use. Every
+frontier has the same interface: push(priority, item), pop() which returns the (priority, item) pair with the lowest
+priority, peek() which returns that lowest priority without popping, and len(). Use create() to make one by name:
+    'heap'   - a heapq based frontier without locks, equal priorities are broken by a counter (first in, first out)
+    'bucket' - a circular bucket queue (Dial's algorithm) for integer priorities which never decrease, pops in O(1)
+    'queue'  - the original queue.PriorityQueue, which takes a lock on every put and get, kept for comparisons
+    'minmax' - a min-max heap, which can also pop the item with the highest priority (popMax) in O(log n), e.g. to
+               drop the worst item when the frontier has a cap (beam search)
+'''
+import heapq
+import itertools
+import queue
+
+
+class HeapFrontier:
+    '''
+    This class is a binary heap on a plain list. Every entry is (priority, counter, item), the counter makes sure that
+    two items with the same priority are never compared with each other and that they are popped in the order in which
+    they were pushed.
+    '''
+    def __init__(self):
+        self.heap = []
+        self.counter = itertools.count()
+
+    def __len__(self):
+        return len(self.heap)
+
+    def push(self, priority, item):
+        heapq.heappush(self.heap, (priority, next(self.counter), item))
+
+    def pop(self):
+        priority, count, item = heapq.heappop(self.heap)
+        return priority, item
+
+    def peek(self):
+        return self.heap[0][0]
+
+
+class BucketFrontier:
+    '''
+    This class is a circular bucket queue (Dial's algorithm). It only works for integer priorities where a pushed
+    priority is never lower than the last popped priority and never span (or more) higher, which holds for UCS and A*
+    with a consistent heuristic on a board with bounded integer cell values. Since there are span buckets and all
+    priorities in the queue lie in a window of span values, every bucket holds items of only one priority, so a bucket
+    is just a list and popping takes O(1) apart from skipping empty buckets.
+    '''
+    def __init__(self, span):
+        self.span = span
+        self.buckets = [[] for bucket in range(span)]
+        self.current = None  # The priority of the bucket which is being emptied, set by the first push
+        self.count = 0
+
+    def __len__(self):
+        return self.count
+
+    def push(self, priority, item):
+        if self.current is None:
+            self.current = priority  # Start at the priority of the first item instead of skipping buckets
+        if not self.current <= priority < self.current + self.span:
+            raise ValueError(f'The priority {priority} does not fit in the bucket window starting at {self.current} '
+                             f'with a span of {self.span}!')
+        self.buckets[priority % self.span].append(item)
+        self.count += 1
+
+    def pop(self):
+        if self.count == 0:
+            raise IndexError('pop from an empty frontier')
+        bucket = self.buckets[self.current % self.span]
+        while not bucket:  # Skip the empty buckets, there are at most span of them
+            self.current += 1
+            bucket = self.buckets[self.current % self.span]
+        self.count -= 1
+        return self.current, bucket.pop()
+
+    def peek(self):
+        if self.count == 0:
+            raise IndexError('peek in an empty frontier')
+        while not self.buckets[self.current % self.span]:
+            self.current += 1
+        return self.current
+
+
+class PriorityQueueFrontier:
+    '''This class wraps the original queue.PriorityQueue, equal priorities are broken by a counter as well.'''
+    def __init__(self):
+        self.queue = queue.PriorityQueue()
+        self.counter = itertools.count()
+
+    def __len__(self):
+        return self.queue.qsize()
+
+    def push(self, priority, item):
+        self.queue.put((priority, next(self.counter), item))
+
+    def pop(self):
+        priority, count, item = self.queue.get()
+        return priority, item
+
+    def peek(self):
+        return self.queue.queue[0][0]
+
+
+class MinMaxHeapFrontier:
+    '''
+    This class is a min-max heap on a plain list: the levels of the tree alternate between min levels (the root, its
+    grandchildren, ...) and max levels, every entry on a min level is at most all entries below it and every entry on a
+    max level is at least all entries below it. So the lowest priority is the root and the highest one of its children,
+    both ends can be popped in O(log n), like any other entry (remove). Entries are (priority, counter, item) like in
+    the HeapFrontier.
+    '''
+    def __init__(self):
+        self.heap = []
+        self.counter = itertools.count()
+
+    def __len__(self):
+        return len(self.heap)
+
+    def push(self, priority, item):
+        heap = self.heap
+        entry = (priority, next(self.counter), item)
+        heap.append(entry)
+        self.siftUp(len(heap) - 1, entry)
+
+    def pop(self):
+        if not self.heap:
+            raise IndexError('pop from an empty frontier')
+        priority, count, item = self.remove(0)
+        return priority, item
+
+    def peek(self):
+        return self.heap[0][0]
+
+    '''This function pops the (priority, item) pair with the highest priority'''
+    def popMax(self):
+        if not self.heap:
+            raise IndexError('pop from an empty frontier')
+        priority, count, item = self.remove(self.maxIndex())
+        return priority, item
+
+    '''This function returns the highest priority without popping'''
+    def peekMax(self):
+        return self.heap[self.maxIndex()][0]
+
+    '''This function returns the index of the entry with the highest priority: the root or one of its children'''
+    def maxIndex(self):
+        heap = self.heap
+        if len(heap) <= 2:
+            return len(heap) - 1
+        return 1 if heap[1] > heap[2] else 2
+
+    '''This function takes the entry at index out of the heap and returns it, the last entry takes its place and goes
+    up (see siftUp) or, when it belongs there or below, trickles down (see trickleDown).'''
+    def remove(self, index):
+        heap = self.heap
+        last = heap.pop()
+        if index == len(heap):
+            return last
+        removed = heap[index]
+        if not self.siftUp(index, last):
+            self.trickleDown(index, last)
+        return removed
+
+    '''This function places entry at index or above it and returns whether it went up. When entry lies on the wrong side
+    of the parent they swap (the entry of the parent trickles down from index), then entry goes up along its
+    grandparents on the levels of the same kind as long as it lies on their wrong side.'''
+    def siftUp(self, index, entry):
+        heap = self.heap
+        start = index
+        minimum = (index + 1).bit_length() & 1
+        if index and minimum == (entry > heap[(index - 1) >> 1]):
+            parent = (index - 1) >> 1
+            self.trickleDown(index, heap[parent])
+            index, minimum = parent, not minimum
+        while index > 2:
+            grandparent = (index - 3) >> 2
+            if (entry < heap[grandparent]) if minimum else (entry > heap[grandparent]):
+                heap[index] = heap[grandparent]
+                index = grandparent
+            else:
+                break
+        heap[index] = entry
+        return index != start
+
+    '''This function places entry at index or below it: it swaps with the lowest (on a min level) or highest (on a max
+    level) child or grandchild as long as that one lies on its wrong side.'''
+    def trickleDown(self, index, entry):
+        heap = self.heap
+        size = len(heap)
+        if (index + 1).bit_length() & 1:
+            while True:  # On a min level: swap with the lowest child or grandchild while it is lower
+                first = 2 * index + 1
+                if first >= size:
+                    break
+                best, grandchild = first, 2 * first + 1
+                for candidate in (first + 1, grandchild, grandchild + 1, grandchild + 2, grandchild + 3):
+                    if candidate >= size:
+                        break
+                    if heap[candidate] < heap[best]:
+                        best = candidate
+                if not heap[best] < entry:
+                    break
+                heap[index] = heap[best]
+                index = best
+                if best < grandchild:  # A child has no descendants which are on a min level
+                    break
+                parent = (best - 1) >> 1
+                if entry > heap[parent]:
+                    entry, heap[parent] = heap[parent], entry
+        else:
+            while True:  # On a max level: swap with the highest child or grandchild while it is higher
+                first = 2 * index + 1
+                if first >= size:
+                    break
+                best, grandchild = first, 2 * first + 1
+                for candidate in (first + 1, grandchild, grandchild + 1, grandchild + 2, grandchild + 3):
+                    if candidate >= size:
+                        break
+                    if heap[candidate] > heap[best]:
+                        best = candidate
+                if not heap[best] > entry:
+                    break
+                heap[index] = heap[best]
+                index = best
+                if best < grandchild:  # A child has no descendants which are on a max level
+                    break
+                parent = (best - 1) >> 1
+                if entry < heap[parent]:
+                    entry, heap[parent] = heap[parent], entry
+        heap[index] = entry
+
+# The frontiers which can be selected by name in create()
+FRONTIERS = {'heap': HeapFrontier, 'bucket': BucketFrontier, 'queue': PriorityQueueFrontier,
+             'minmax': MinMaxHeapFrontier}
+
+
+'''This function creates a frontier by name, span is the window of priorities which a bucket frontier must be able to
+hold and is ignored by the other frontiers.'''
+def create(kind='heap', span=None):
+    if kind not in FRONTIERS:
+        raise ValueError(f'Unknown frontier {kind!r}, choose one of {", ".join(FRONTIERS)}')
+    if kind == 'bucket':
+        if span is None:
+            raise ValueError('A bucket frontier needs the span of its priorities!')
+        return BucketFrontier(span)
+    return FRONTIERS[kind]()
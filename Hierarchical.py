@@ -0,0 +1,280 @@
+'''
+This module contains hierarchical pathfinding (HPA*) for large boards. The board is split into square clusters of
+clusterSize x clusterSize cells. Along the border of two neighbouring clusters every run of adjacent cell pairs which are
+both passable is an entrance, and every entrance gets one transition (a pair of cells, one in each cluster) per
+'spacing' cells. The transition cells are the nodes of an abstract graph: two transition cells of one pair are connected
+by a step across the border and the transition cells inside one cluster are connected by their exact distance within
+that cluster, which is calculated once when the index is built.
+A query adds the start and the goal to the abstract graph, searches the abstract graph with A* and then refines every
+abstract edge into cells by a search which stays inside one cluster. When a cell changes only its cluster is built again,
+together with the entrances on its border (and the neighbouring cluster) when the cell lies on the border of a cluster.
+
+Bound: take a shortest pathway with cost C* which crosses the borders of the clusters k times. Every crossing lies in an
+entrance, within spacing // 2 cells of a transition of that entrance, so the crossing can be moved to that transition by
+walking spacing // 2 cells along the border on both sides. That costs at most 2 * (spacing // 2) * largest cell value
+extra per crossing. So the cost of the pathway of HPA* is at most C* + 2 * (spacing // 2) * largest value * k. With
+spacing=1 every border cell is a transition and the pathway is optimal.
+'''
+import heapq
+import time
+
+import Board
+import Engine
+
+
+class HierarchicalIndex:
+    '''
+    This class holds the abstract graph of a board: the transitions of every border of two clusters and the distances
+    between the transition cells within every cluster. It listens to the board and rebuilds the changed clusters before
+    the next query. Use solve(start, goal) to get a Engine.SearchResult, result.asPair() gives the (cost, path) format of
+    Comparison.AStar.
+    '''
+    def __init__(self, board, clusterSize=16, spacing=4):
+        if clusterSize < 1 or spacing < 1:
+            raise ValueError('The cluster size and the spacing must be at least 1!')
+        self.board = board
+        self.clusterSize = clusterSize
+        self.spacing = spacing
+        self.clusters = -(-board.size // clusterSize)  # The amount of clusters along one side of the board
+        self.transitions = {}  # Border -> list of (cell, cell) pairs, a border is ('v'|'h', cluster row, cluster column)
+        self.intra = {}  # Cluster -> {node: {node: distance within the cluster}}
+        self.inter = {}  # Node -> {node: cost of the step across the border}
+        self.dirtyBorders = set(self.borders())
+        self.dirtyClusters = {(row, column) for row in range(self.clusters) for column in range(self.clusters)}
+        self.refresh()
+        board.addListener(self.boardChanged)
+
+    '''This function returns all borders between two neighbouring clusters. ('v', row, column) is the vertical border
+    between cluster (row, column) and (row, column + 1), ('h', row, column) the horizontal one between cluster
+    (row, column) and (row + 1, column).'''
+    def borders(self):
+        for row in range(self.clusters):
+            for column in range(self.clusters):
+                if column + 1 < self.clusters:
+                    yield 'v', row, column
+                if row + 1 < self.clusters:
+                    yield 'h', row, column
+
+    '''This function returns the cluster of an index'''
+    def clusterOf(self, index):
+        row, column = divmod(index, self.board.size)
+        return row // self.clusterSize, column // self.clusterSize
+
+    '''This function returns the first and last (exclusive) row and column of a cluster'''
+    def bounds(self, cluster):
+        size, step = self.board.size, self.clusterSize
+        return (cluster[0] * step, min((cluster[0] + 1) * step, size),
+                cluster[1] * step, min((cluster[1] + 1) * step, size))
+
+    '''This function is the listener on the board: it marks the cluster of a changed cell, and the borders it lies on
+    together with the cluster on the other side of those borders'''
+    def boardChanged(self, change, row, column):
+        if change == 'board':
+            self.dirtyBorders.update(self.borders())
+            self.dirtyClusters.update((row, column) for row in range(self.clusters) for column in range(self.clusters))
+        elif change == 'cell':
+            cluster_row, cluster_column = row // self.clusterSize, column // self.clusterSize
+            first_row, last_row, first_column, last_column = self.bounds((cluster_row, cluster_column))
+            self.dirtyClusters.add((cluster_row, cluster_column))
+            if row == first_row and cluster_row > 0:
+                self.dirtyBorders.add(('h', cluster_row - 1, cluster_column))
+            if row == last_row - 1 and cluster_row + 1 < self.clusters:
+                self.dirtyBorders.add(('h', cluster_row, cluster_column))
+            if column == first_column and cluster_column > 0:
+                self.dirtyBorders.add(('v', cluster_row, cluster_column - 1))
+            if column == last_column - 1 and cluster_column + 1 < self.clusters:
+                self.dirtyBorders.add(('v', cluster_row, cluster_column))
+
+    '''This function stops listening to the board, e.g. when the index is no longer used'''
+    def detach(self):
+        if self.boardChanged in self.board.listeners:
+            self.board.removeListener(self.boardChanged)
+
+    '''This function finds the entrances of a border and places their transitions: an entrance of length L is split in
+    ceil(L / spacing) equal pieces and the middle pair of every piece becomes a transition'''
+    def findTransitions(self, border):
+        kind, row, column = border
+        board, grid = self.board, self.board.grid
+        first_row, last_row, first_column, last_column = self.bounds((row, column))
+        if kind == 'v':  # Pairs of the last column of this cluster and the first column of the next one
+            pairs = [(board.index(line, last_column - 1), board.index(line, last_column))
+                     for line in range(first_row, last_row)]
+        else:  # Pairs of the last row of this cluster and the first row of the next one
+            pairs = [(board.index(last_row - 1, line), board.index(last_row, line))
+                     for line in range(first_column, last_column)]
+        transitions, entrance = [], []
+        for pair in pairs + [None]:
+            if pair is not None and grid[pair[0]] != Board.OBSTACLE and grid[pair[1]] != Board.OBSTACLE:
+                entrance.append(pair)
+                continue
+            if entrance:
+                pieces = -(-len(entrance) // self.spacing)
+                for piece in range(pieces):
+                    part = entrance[piece * len(entrance) // pieces:(piece + 1) * len(entrance) // pieces]
+                    transitions.append(part[len(part) // 2])
+                entrance = []
+        return transitions
+
+    '''This function returns the transition cells which lie inside a cluster'''
+    def nodes(self, cluster):
+        row, column = cluster
+        nodes = set()
+        for border, side in ((('v', row, column), 0), (('h', row, column), 0),
+                             (('v', row, column - 1), 1), (('h', row - 1, column), 1)):
+            for pair in self.transitions.get(border, ()):
+                nodes.add(pair[side])
+        return nodes
+
+    '''This function builds the changed borders and clusters again before a query'''
+    def refresh(self):
+        if self.dirtyBorders:
+            for border in self.dirtyBorders:
+                kind, row, column = border
+                self.transitions[border] = self.findTransitions(border)
+                # The transitions on a border are nodes of the clusters on both sides
+                self.dirtyClusters.add((row, column))
+                self.dirtyClusters.add((row, column + 1) if kind == 'v' else (row + 1, column))
+            self.inter = {}
+            grid = self.board.grid
+            for pairs in self.transitions.values():
+                for first, second in pairs:
+                    self.inter.setdefault(first, {})[second] = grid[second]
+                    self.inter.setdefault(second, {})[first] = grid[first]
+            self.dirtyBorders.clear()
+        for cluster in self.dirtyClusters:
+            nodes = self.nodes(cluster)
+            edges = {}
+            for node in nodes:
+                distance, predecessor, expanded = self.clusterSearch(node, cluster)
+                edges[node] = {other: distance[other] for other in nodes if other != node and other in distance}
+            self.intra[cluster] = edges
+        self.dirtyClusters.clear()
+
+    '''This function runs UCS from source which stays inside a cluster, it stops when target is expanded (if given).
+    It returns the distances, the predecessors and the amount of expanded cells.'''
+    def clusterSearch(self, source, cluster, target=None):
+        board, grid = self.board, self.board.grid
+        first_row, last_row, first_column, last_column = self.bounds(cluster)
+        distance, predecessor = {}, {source: Board.UNVISITED}
+        agenda = [(0, source, Board.UNVISITED)]
+        while agenda:
+            travelled_distance, current_index, previous_index = heapq.heappop(agenda)
+            if current_index in distance:
+                continue
+            distance[current_index] = travelled_distance
+            predecessor[current_index] = previous_index
+            if current_index == target:
+                break
+            for index in board.passableNeighbors(current_index):
+                row, column = divmod(index, board.size)
+                if index not in distance and first_row <= row < last_row and first_column <= column < last_column:
+                    heapq.heappush(agenda, (travelled_distance + grid[index], index, current_index))
+        return distance, predecessor, len(distance)
+
+    '''This function returns the pathway (a list of indices) from source to target inside a cluster and the amount of
+    expanded cells, the pathway is None when the target cannot be reached inside the cluster'''
+    def clusterPathway(self, source, target, cluster):
+        distance, predecessor, expanded = self.clusterSearch(source, cluster, target)
+        if target not in distance:
+            return None, expanded
+        pathway, index = [], target
+        while index != Board.UNVISITED:
+            pathway.append(index)
+            index = predecessor[index]
+        pathway.reverse()
+        return pathway, expanded
+
+    '''This function calculates the pathway from start to goal ((row, column) points, by default board.start and
+    board.destination) and returns it as a Engine.SearchResult with algorithm 'hpastar'.'''
+    def solve(self, start=None, goal=None):
+        began = time.perf_counter()
+        board, grid = self.board, self.board.grid
+        start, goal = Engine.endpoints(board, start, goal)
+        self.refresh()
+        source, target = board.index(*start), board.index(*goal)
+        source_cluster, target_cluster = self.clusterOf(source), self.clusterOf(target)
+        best_cost, best_pathway, expanded = None, None, 0
+        # Connect the start to the nodes of its cluster, and of the clusters of its neighbours as well since the first
+        # step may cross a border (the start can be an obstacle, which is not a transition). start_edges maps a node to
+        # its distance from the start and the cluster in which that pathway lies.
+        start_edges = {}
+        for cluster in {source_cluster} | {self.clusterOf(index) for index in board.passableNeighbors(source)}:
+            if cluster == target_cluster:  # The pathway which stays inside the cluster is a candidate as well
+                pathway, count = self.clusterPathway(source, target, cluster)
+                expanded += count
+                if pathway is not None and (best_cost is None or sum(grid[index] for index in pathway[1:]) < best_cost):
+                    best_cost, best_pathway = sum(grid[index] for index in pathway[1:]), pathway
+            distance, predecessor, count = self.clusterSearch(source, cluster)
+            expanded += count
+            for node in self.nodes(cluster):
+                if node in distance and (node not in start_edges or distance[node] < start_edges[node][0]):
+                    start_edges[node] = distance[node], cluster
+        # Connect the nodes of the goal's cluster to the goal. The distance to the goal follows from the distance from
+        # the goal: d(v, goal) = d(goal, v) + value(goal) - value(v)
+        goal_edges = {}
+        if grid[target] != Board.OBSTACLE:  # An obstacle cannot be entered, so it cannot be reached at all
+            distance, predecessor, count = self.clusterSearch(target, target_cluster)
+            expanded += count
+            goal_edges = {node: distance[node] + grid[target] - grid[node]
+                          for node in self.nodes(target_cluster) if node in distance}
+        cost, abstract, count = self.abstractSearch(source, target, start_edges, goal_edges)
+        expanded += count
+        if abstract is not None and (best_cost is None or cost < best_cost):
+            pathway = [source]
+            for first, second in zip(abstract, abstract[1:]):
+                cluster = start_edges[second][1] if first == source else self.clusterOf(first)
+                if cluster != self.clusterOf(second):
+                    pathway.append(second)  # A step across the border
+                else:
+                    part, count = self.clusterPathway(first, second, cluster)
+                    expanded += count
+                    pathway.extend(part[1:])
+            best_cost, best_pathway = cost, pathway
+        elapsed = time.perf_counter() - began
+        if best_pathway is None:
+            return Engine.SearchResult('hpastar', None, None, expanded, elapsed)
+        return Engine.SearchResult('hpastar', best_cost, [board.point(index) for index in best_pathway], expanded,
+                                   elapsed)
+
+    '''This function runs A* on the abstract graph from source to target, start_edges and goal_edges connect them to
+    the nodes of their clusters. It returns the cost, the abstract pathway (a list of cells) and the amount of expanded
+    nodes, or None, None and that amount when the target cannot be reached.'''
+    def abstractSearch(self, source, target, start_edges, goal_edges):
+        size = self.board.size
+        target_row, target_column = divmod(target, size)
+        distance, predecessor = {}, {}
+        agenda = [(0, 0, source, None)]
+        while agenda:
+            value, travelled_distance, current, previous = heapq.heappop(agenda)
+            if current in distance:
+                continue
+            distance[current] = travelled_distance
+            predecessor[current] = previous
+            if current == target:
+                pathway = []
+                while current is not None:
+                    pathway.append(current)
+                    current = predecessor[current]
+                return travelled_distance, pathway[::-1], len(distance)
+            if current == source:
+                edges = [(node, cost) for node, (cost, cluster) in start_edges.items()]
+            else:
+                edges = list(self.intra[self.clusterOf(current)].get(current, {}).items()) \
+                        + list(self.inter.get(current, {}).items())
+                if current in goal_edges:
+                    edges.append((target, goal_edges[current]))
+            for node, cost in edges:
+                if node not in distance:
+                    row, column = divmod(node, size)
+                    heapq.heappush(agenda, (travelled_distance + cost + abs(row - target_row)
+                                            + abs(column - target_column), travelled_distance + cost, node, current))
+        return None, None, len(distance)
+
+
+'''This function calculates the pathway from start to goal with HPA*, with the given index or with a new one for the
+board, and returns a Engine.SearchResult.'''
+def hierarchicalAStar(board, start=None, goal=None, index=None, clusterSize=16, spacing=4):
+    if index is None:
+        index = HierarchicalIndex(board, clusterSize, spacing)
+        index.detach()
+    return index.solve(start, goal)
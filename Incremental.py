@@ -0,0 +1,176 @@
+'''
+This module contains an incremental planner (D* Lite) which keeps its search state between calls. It searches backwards
+from the destination: g(s) is the distance from s to the destination as far as it has been calculated and rhs(s) is the
+one-step lookahead min over the neighbours s' of (value(s') + g(s')). A cell is inconsistent when g and rhs differ, only
+those cells are put in the agenda. The planner listens to the board: when a value changes only the changed cell and its
+neighbours get a new rhs, and the next plan() only repairs the part of the search tree which depends on them. Moving
+the start is cheap as well (the keys are corrected by km instead of being calculated again), moving the destination or
+regenerating the board starts the search from nothing.
+'''
+import heapq
+import time
+from array import array
+
+import Board
+import Engine
+
+INFINITY = 2 ** 31 - 1  # The distance of a cell which cannot reach the destination (as far as known)
+
+
+class IncrementalPlanner:
+    '''
+    This class is a D* Lite planner on a board. Call plan() to get the pathway from board.start to board.destination as
+    an Engine.SearchResult, between two calls the board can be changed via setValue, setObstacle, setStart and
+    setDestination. The amount of expanded cells in the result only counts the work done by that call.
+    '''
+    def __init__(self, board):
+        self.board = board
+        self.changed = set()  # The indices of the cells which changed since the last plan()
+        self.initialize()
+        board.addListener(self.boardChanged)
+
+    '''This function throws the search state away and starts again from the current destination'''
+    def initialize(self):
+        cells = self.board.size ** 2
+        self.g = array('i', [INFINITY]) * cells
+        self.rhs = array('i', [INFINITY]) * cells
+        self.agenda = []  # A heap of (key1, key2, index), entries whose key is not in queued anymore are stale
+        self.queued = {}  # The current key of every cell in the agenda
+        self.km = 0
+        self.last = self.board.start
+        self.start = self.board.index(*self.board.start)
+        self.goal = self.board.index(*self.board.destination)
+        self.changed.clear()
+        self.restart = False
+        self.rhs[self.goal] = 0
+        self.insert(self.goal)
+
+    '''This function is the listener on the board'''
+    def boardChanged(self, change, row, column):
+        if change == 'cell':
+            self.changed.add(self.board.index(row, column))
+        elif change in ('destination', 'board'):
+            self.restart = True
+        # A moved start is picked up by plan() via km
+
+    '''This function stops listening to the board, e.g. when the planner is no longer used'''
+    def detach(self):
+        if self.boardChanged in self.board.listeners:
+            self.board.removeListener(self.boardChanged)
+
+    '''This function calculates the heuristic from the start to an index, the Manhattan distance'''
+    def heuristic(self, index):
+        row, column = divmod(index, self.board.size)
+        return abs(row - self.board.start[0]) + abs(column - self.board.start[1])
+
+    '''This function calculates the key of an index in the agenda'''
+    def calculateKey(self, index):
+        best = min(self.g[index], self.rhs[index])
+        if best == INFINITY:
+            return INFINITY, INFINITY
+        return best + self.heuristic(index) + self.km, best
+
+    '''This function (re)inserts an index in the agenda with its current key'''
+    def insert(self, index):
+        key = self.calculateKey(index)
+        self.queued[index] = key
+        heapq.heappush(self.agenda, (key[0], key[1], index))
+
+    '''This function returns the smallest key in the agenda, stale entries are dropped on the way'''
+    def topKey(self):
+        while self.agenda:
+            key1, key2, index = self.agenda[0]
+            if self.queued.get(index) == (key1, key2):
+                return key1, key2
+            heapq.heappop(self.agenda)
+        return INFINITY, INFINITY
+
+    '''This function calculates the rhs of an index again from its neighbours and puts it in the agenda when it is
+    inconsistent (or takes it out when it is consistent)'''
+    def updateVertex(self, index):
+        board, grid, g = self.board, self.board.grid, self.g
+        if index != self.goal:
+            best = INFINITY
+            # An obstacle cannot be entered, so its distance is never used, except for the start which is only left
+            if grid[index] != Board.OBSTACLE or index == self.start:
+                for neighbor in board.passableNeighbors(index):
+                    if g[neighbor] != INFINITY and grid[neighbor] + g[neighbor] < best:
+                        best = grid[neighbor] + g[neighbor]
+            self.rhs[index] = best
+        if self.g[index] != self.rhs[index]:
+            self.insert(index)
+        else:
+            self.queued.pop(index, None)
+
+    '''This function updates the cells which changed since the last plan(): a changed value changes the edges into
+    the cell (so the rhs of its neighbours) and a new or removed obstacle also changes the edges out of the cell'''
+    def applyChanges(self):
+        size = self.board.size
+        for index in self.changed:
+            row, column = divmod(index, size)
+            self.updateVertex(index)
+            if row != 0:
+                self.updateVertex(index - size)
+            if column != 0:
+                self.updateVertex(index - 1)
+            if row != size - 1:
+                self.updateVertex(index + size)
+            if column != size - 1:
+                self.updateVertex(index + 1)
+        self.changed.clear()
+
+    '''This function expands inconsistent cells until the start is consistent and no key in the agenda is smaller than
+    the key of the start, it returns the amount of expanded cells'''
+    def computeShortestPath(self, start):
+        board, g, rhs = self.board, self.g, self.rhs
+        # The neighbours of a start which is an obstacle don't reach it via passableNeighbors, so they update it here
+        around = set(board.passableNeighbors(start)) if board.grid[start] == Board.OBSTACLE else ()
+        expanded = 0
+        while self.topKey() < self.calculateKey(start) or rhs[start] != g[start]:
+            key1, key2, index = heapq.heappop(self.agenda)
+            del self.queued[index]
+            expanded += 1
+            new_key = self.calculateKey(index)
+            if (key1, key2) < new_key:
+                self.insert(index)  # The key was out of date because the start moved, try again later
+            elif g[index] > rhs[index]:
+                g[index] = rhs[index]  # The cell became consistent with a shorter distance
+                for neighbor in board.passableNeighbors(index):
+                    self.updateVertex(neighbor)
+            else:
+                g[index] = INFINITY  # The cell became more expensive, all cells which depend on it are updated
+                self.updateVertex(index)
+                for neighbor in board.passableNeighbors(index):
+                    self.updateVertex(neighbor)
+            if index in around:
+                self.updateVertex(start)
+        return expanded
+
+    '''This function repairs the search state after the changes of the board and returns the pathway from board.start
+    to board.destination as an Engine.SearchResult'''
+    def plan(self):
+        began = time.perf_counter()
+        board = self.board
+        if self.restart or self.board.index(*board.destination) != self.goal:
+            self.initialize()
+        if board.start != self.last:
+            self.km += Engine.calculateHeuristic(self.last, board.start)
+            self.last = board.start
+        start = self.start = board.index(*board.start)
+        self.applyChanges()
+        self.updateVertex(start)  # The start may have become an obstacle, which is still left
+        expanded = self.computeShortestPath(start)
+        if self.g[start] == INFINITY:
+            return Engine.SearchResult('dstarlite', None, None, expanded, time.perf_counter() - began)
+        return Engine.SearchResult('dstarlite', self.g[start], self.pathway(start), expanded,
+                                   time.perf_counter() - began)
+
+    '''This function follows the distances from start to the destination, every step goes to the neighbour with the
+    smallest value + g'''
+    def pathway(self, start):
+        board, grid, g = self.board, self.board.grid, self.g
+        pathway, index = [start], start
+        while index != self.goal:
+            index = min(board.passableNeighbors(index), key=lambda neighbor: grid[neighbor] + g[neighbor])
+            pathway.append(index)
+        return [board.point(index) for index in pathway]
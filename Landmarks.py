@@ -0,0 +1,133 @@
+'''
+This module contains the ALT heuristic (A*, Landmarks and the Triangle inequality) for repeated A* queries on the same
+board. A LandmarkIndex picks a few landmark cells and stores the exact distance from every landmark to every cell.
+For a landmark L, a cell v and the goal t the triangle inequality gives two lower bounds of the distance d(v, t):
+    d(L, t) - d(L, v)    since d(L, t) <= d(L, v) + d(v, t)
+    d(v, L) - d(t, L)    since d(v, L) <= d(v, t) + d(t, L)
+The value of a cell is paid when entering it, so the distance back to a landmark follows from the distance from it:
+walking the same pathway the other way round pays the value of the first cell instead of the last one, which gives
+d(v, L) = d(L, v) + value(L) - value(v). The heuristic is the largest bound over all landmarks and the Manhattan
+distance, it is consistent, so it can be used by Engine.aStar(board, heuristic=index) with every frontier.
+The index listens to the board and becomes invalid as soon as a value of the board changes, it must then be built again.
+'''
+import random
+import struct
+import zlib
+from array import array
+
+import Board
+import Engine
+
+MAGIC = b'ALT1'  # The first bytes of a saved landmark index
+HEADER = struct.Struct('<4sIII')  # Magic, board size, amount of landmarks, checksum of the grid
+
+
+class LandmarkIndex:
+    '''
+    This class holds the landmarks (indices in the flat grid) of a board and the distance field of every landmark.
+    Use LandmarkIndex.build(board) to make one, or LandmarkIndex.load(path, board) to read a saved one.
+    '''
+    def __init__(self, board, landmarks, distances):
+        self.board = board
+        self.landmarks = landmarks
+        self.distances = distances
+        self.valid = True
+        board.addListener(self.boardChanged)
+
+    '''This function picks count landmarks on the board and calculates their distance fields. The first landmark is
+    the cell furthest away from a random cell, every next landmark is the reachable cell which lies furthest from the
+    landmarks which have already been picked.'''
+    @classmethod
+    def build(cls, board, count=8, seed=None):
+        rng = random.Random(seed)
+        passable = [index for index in range(board.size ** 2) if board.grid[index] != Board.OBSTACLE]
+        if not passable:
+            raise ValueError('The board has no cells which can be used as landmark!')
+        field = Engine.distanceField(board, board.point(rng.choice(passable)))
+        nearest = array('i', (-1 if distance == Board.UNVISITED else distance for distance in field))
+        landmarks, distances = [], []
+        for number in range(count):
+            furthest = max(range(len(nearest)), key=nearest.__getitem__)
+            if nearest[furthest] <= 0:
+                break  # Every reachable cell is a landmark already
+            field = Engine.distanceField(board, board.point(furthest))
+            landmarks.append(furthest)
+            distances.append(field)
+            for index, distance in enumerate(field):
+                if distance != Board.UNVISITED and distance < nearest[index]:
+                    nearest[index] = distance
+        return cls(board, landmarks, distances)
+
+    '''This function is the listener on the board, every change of a value makes the distance fields out of date'''
+    def boardChanged(self, change, row, column):
+        if change in ('cell', 'board'):
+            self.valid = False
+
+    '''This function stops listening to the board, e.g. when the index is no longer used'''
+    def detach(self):
+        if self.boardChanged in self.board.listeners:
+            self.board.removeListener(self.boardChanged)
+
+    '''This function builds the index again for the current values of the board, with the same amount of landmarks'''
+    def rebuild(self, seed=None):
+        fresh = LandmarkIndex.build(self.board, len(self.landmarks), seed)
+        fresh.detach()
+        self.landmarks, self.distances, self.valid = fresh.landmarks, fresh.distances, True
+
+    '''This function writes the index to a file: a header with the size of the board, the amount of landmarks and a
+    checksum of the grid, then the landmarks and their distance fields as 32-bit integers.'''
+    def save(self, path):
+        with open(path, 'wb') as file:
+            file.write(HEADER.pack(MAGIC, self.board.size, len(self.landmarks), zlib.crc32(self.board.grid)))
+            array('i', self.landmarks).tofile(file)
+            for field in self.distances:
+                field.tofile(file)
+
+    '''This function reads an index which was saved for this board, it raises a ValueError when the file belongs to
+    another board or to other values of this board.'''
+    @classmethod
+    def load(cls, path, board):
+        with open(path, 'rb') as file:
+            magic, size, count, checksum = HEADER.unpack(file.read(HEADER.size))
+            if magic != MAGIC:
+                raise ValueError(f'{path} is not a landmark index!')
+            if size != board.size or checksum != zlib.crc32(board.grid):
+                raise ValueError(f'The landmark index in {path} was made for another board!')
+            landmarks = array('i')
+            landmarks.fromfile(file, count)
+            distances = []
+            for number in range(count):
+                field = array('i')
+                field.fromfile(file, size ** 2)
+                distances.append(field)
+        return cls(board, list(landmarks), distances)
+
+    '''This function returns the function which gives the lower bound of the distance from an index to goal (an index),
+    this is the interface which Engine.aStar expects from a heuristic.'''
+    def estimator(self, board, goal):
+        if board is not self.board:
+            raise ValueError('The landmark index was made for another board!')
+        if not self.valid:
+            raise ValueError('The board has changed since the landmark index was built, rebuild it first!')
+        grid, size = board.grid, board.size
+        goal_row, goal_column = divmod(goal, size)
+        goal_value = grid[goal]
+        # Only the landmarks which can reach the goal give a bound
+        fields = [(field, field[goal]) for field in self.distances if field[goal] != Board.UNVISITED]
+
+        def estimate(index):
+            row, column = divmod(index, size)
+            best = abs(row - goal_row) + abs(column - goal_column)
+            value = grid[index]
+            for field, to_goal in fields:
+                to_index = field[index]
+                if to_index == Board.UNVISITED:
+                    continue  # The landmark cannot reach this cell, so neither can the goal
+                bound = to_goal - to_index  # d(L, t) - d(L, v)
+                if bound > best:
+                    best = bound
+                bound = to_index - to_goal + goal_value - value  # d(v, L) - d(t, L)
+                if bound > best:
+                    best = bound
+            return best
+        return estimate
@@ -1,62 +1,59 @@
 import Board
 import datetime
-import functools
+import Engine
+import Incremental
 import queue
 import random
-import time
+import Renderer
+import threading
 import tkinter as tk
 
+# The names of the algorithms in the Engine and the way they are shown on the GUI
+ALGORITHMS = {'astar': "Algorithm A*", 'bfs': "Breadth First Search", 'dfs': "Depth First Search",
+              'ucs': "Uniform Cost Search", 'biastar': "Bidirectional A*", 'bidijkstra': "Bidirectional Dijkstra",
+              'dstarlite': "D* Lite (incremental)", 'idastar': "IDA* (low memory)",
+              'arastar': "ARA* (anytime)", 'beam': "Beam search (capped agenda)"}
+DRAIN_INTERVAL = 15  # The time in milliseconds between two calls of drainEvents() while a search runs
+DRAIN_BATCH = 2000  # The largest amount of events which drainEvents() shows at once
+EVENT_LIMIT = 20000  # The largest amount of events which wait in the queue, a faster search waits for the GUI
+worker = None  # The SearchWorker of the last calculation
+
 '''This function will generate a board and then call a function (showMatrix()) to visualize the field to the user.
 It takes an optional parameter size as input which defines the size (n) of the (n x n)-matrix. Default value is
 randomly chosen somewhere between 10 & 50 (including both 10 and 50).'''
 def createBoard(size=random.randint(10, 51)):
-    global board
+    global board, planner
+    if searching():
+        showMessage('A calculation is still running, cancel it first.\n')
+        return
+    if 'renderer' in globals():
+        renderer.detach()  # The previous board is not shown anymore
+        planner.detach()
     board = Board.Board(size)       #  Creates a global variable 'board'
+    # The incremental planner keeps its search state between two calculations, it follows the edits of the board
+    planner = Incremental.IncrementalPlanner(board)
     showMatrix()                    # Calls the showMatrix function for visualizing the board
 
 
-'''This function visualizes the board as a matrix of buttons and places them in a separate frame.'''
+'''This function visualizes the board on the canvas. The renderer draws the cells as rectangles (or as one image on
+large boards), follows the changes of the board by itself and calls updateValue when a cell is clicked. The mouse wheel
+zooms in and out, dragging with the right mouse button moves the board.'''
 def showMatrix():
-    global buttonmatrix, matrixframe
-    matrixcanvas.delete("all") # Clears the matrix shown on the GUI
-    matrixframe = tk.Frame(matrixcanvas)  # This results in emptying the matrixframe more or less
-    # This will generate a button for each cell on the field, see the 'generateMatrixButton' for more detailed info
-    buttonmatrix = [[generateMatrixButton(row, column) for column in range(board.size)] for row in range(board.size)]
-    # This places the matrixframe with all the buttons on the right place in the canvas
-    matrixcanvas.create_window(matrixcanvas.winfo_width() // 2, 0,
-                               anchor='n', window=matrixframe)
-    # The next few lines are in order to generate and implement the scrollbar which can be used for large matrices
-    matrixcanvas.update()
-    matrixcanvas.pack(fill='both')
-    matrixcanvas.bind("<MouseWheel>", lambda event: matrixcanvas.yview_scroll(int(-1*(event.delta/120)), "units"))
-
-'''This function generates a button on the GUI, this button is of course related to the board.board matrix.'''
-def generateMatrixButton(row, column):
-    # Firstly, we will check which color we will need to set the background to, based on the board.board cell value
-    bg = 'white'
-    if board.board[row][column] == 'X':
-        bg = 'black'
-    elif (row, column) == board.start:
-        bg = 'green'
-    elif (row, column) == board.destination:
-        bg = 'red'
-    # This generates a button which displays the value of the board matrix on the button
-    button = tk.Button(matrixframe, text=board.board[row][column], width=3, bg=bg,
-                       command=lambda r=row, c=column: updateValue(r, c))
-    # This makes it possible to scroll over the buttons to go down/up in large matrices
-    button.bind("<MouseWheel>", lambda event: matrixcanvas.yview_scroll(int(-1*(event.delta/120)), "units"))
-    # This places the button on the right spot in the GUI
-    button.grid(row=row, column=column)
-    return button
+    global renderer
+    matrixcanvas.update()  # Make sure the size of the canvas is known, so the whole board fits on it
+    renderer = Renderer.BoardRenderer(matrixcanvas, board, onClick=updateValue)
 
 
 '''This function updates the values of the matrix based on which option is active (increase or decrease the value of a 
-cell, turn it into an obstacle/start/destination or turn it into 1.'''
+cell, turn it into an obstacle/start/destination or turn it into 1. The renderer recolors the changed cells.'''
 def updateValue(row, column):
+    if searching():  # The search reads the board in another thread, so the board stays as it is until it is done
+        return
     current_action = actionvar.get()  # Get the current selected status of the button
     current_value = board.board[row][column]
     if current_action == "increment it by 1":
-        if str(current_value).isdigit():  # Only when the pressed cell is a number we will increase it by 1
+        # Only when the pressed cell is a number we will increase it by 1, as long as it still fits in the grid
+        if str(current_value).isdigit() and current_value < Board.MAX_VALUE:
             board.setValue(row, column, current_value + 1)
     elif current_action == 'lower it by 1':
         if str(current_value).isdigit():  # Only when the pressed cell is a number we will decrease it by 1
@@ -65,44 +62,22 @@ def updateValue(row, column):
     elif current_action == 'turn it into an obstacle':
         if (row, column) != board.start and (row, column) != board.destination:
             board.setValue(row, column, 'X')
-            buttonmatrix[row][column]["bg"] = 'black'
     elif current_action == 'turn the obstacle into a 1':
         if (row, column) != board.start and (row, column) != board.destination:
             board.setValue(row, column, 1)
-            buttonmatrix[row][column]["bg"] = 'white'
     elif current_action == "set the start location there":
         resetColors()  # Remove the currently shown path since the previous path becomes irrelevant
-        pointer = board.start
         board.setStart(row, column)
-        if pointer == board.destination:
-            buttonmatrix[pointer[0]][pointer[1]].config(bg='red', text=board.board[pointer[0]][pointer[1]])
-        else:
-            buttonmatrix[pointer[0]][pointer[1]].config(bg='white', text=board.board[pointer[0]][pointer[1]])
-        buttonmatrix[row][column]["bg"] = 'green'
     elif current_action == "set the destination there":
         resetColors()  # Remove the currently shown path since the previous path becomes irrelevant
-        pointer = board.destination
         board.setDestination(row, column)
-        if pointer == board.start:
-            buttonmatrix[pointer[0]][pointer[1]].config(bg='green', text=board.board[pointer[0]][pointer[1]])
-        else:
-            buttonmatrix[pointer[0]][pointer[1]].config(bg='white', text=board.board[pointer[0]][pointer[1]])
-        buttonmatrix[row][column]["bg"] = 'red'
-    buttonmatrix[row][column]["text"] = board.board[row][column]
 
 
 '''This function resets the colors of the board before calculating the pathway. This is so that the user can keep
 looking at the pathway once the calculation is finished and so that it disappears when the model is run again,
-potentially with a different algorithm.'''
+potentially with a different algorithm. Only the cells of the shown pathway are recolored.'''
 def resetColors():
-    for row in range(board.size):
-        for column in range(board.size):
-            if buttonmatrix[row][column]['bg'] == 'green' and (row, column) != board.start:
-                if (row, column) != board.destination:
-                    buttonmatrix[row][column]['bg'] = 'white'
-                else:
-                    buttonmatrix[row][column]['bg'] = 'red'
-    root.update()
+    renderer.clearMarks()
 
 
 '''This function configures the output for the label which is shown when an action (set start, increase by 1, ...)
@@ -124,171 +99,169 @@ def calculatePathway():
     tracepath = tracevar.get()
     sleeptime = sleepscale.get()
     algorithm = algvar.get()
-    if algorithm == "Algorithm A*":
-        uniformCostOrAStar(sleeptime=sleeptime, tracepath=tracepath)
-    elif algorithm == "Breadth First Search":
-        depthOrBreadthFirstSearch(sleeptime=sleeptime, tracepath=tracepath)
-    elif algorithm == "Depth First Search":
-        depthOrBreadthFirstSearch(sleeptime=sleeptime, breadth=False, tracepath=tracepath)
-    elif algorithm == "Uniform Cost Search":
-        uniformCostOrAStar(sleeptime=sleeptime, astar=False, tracepath=tracepath)
+    for name, label in ALGORITHMS.items():
+        if algorithm == label:
+            runSearch(name, sleeptime=sleeptime, tracepath=tracepath)
 
 
-'''This function colors every button in 'pathway' green, this will be called between every step of the calculation or
-after a path has been found based on the selection of 'trace pathway' in the GUI'''
-def showCalculation(pathway):
-    for row, column in pathway:
-        buttonmatrix[row][column]["bg"] = 'green'
-    root.update()
+'''This function will be used to calculate the pathway for the Algorithm A* and Uniform Cost Search (UCS).'''
+def uniformCostOrAStar(sleeptime=0, astar=True, tracepath=False, frontier='heap'):
+    runSearch('astar' if astar else 'ucs', sleeptime=sleeptime, tracepath=tracepath, frontier=frontier)
 
 
-'''This function colors every button in 'pathway' white, this will be called between every step of the calculation
-if the 'trace path' in the GUI is active and right after pressing 'calculate pathway' on the GUI'''
-def unshowCalculation(pathway):
-    for row, column in pathway:
-        buttonmatrix[row][column]["bg"] = 'white'
-    root.update()
+'''This function is used to calculate the pathway for the Depth First Search (DFS) and Breadth First Search (BFS).'''
+def depthOrBreadthFirstSearch(sleeptime=0, breadth=True, tracepath=False):
+    runSearch('bfs' if breadth else 'dfs', sleeptime=sleeptime, tracepath=tracepath)
 
 
-'''This function will be used to calculate the pathway for the Algorithm A* and Uniform Cost Search (UCS).'''
-def uniformCostOrAStar(sleeptime=0, astar=True, tracepath=False):
-    start = datetime.datetime.now() # Starts a timer
+'''This function starts the calculation of the pathway on the board with the given algorithm in a SearchWorker thread,
+so the GUI keeps responding while the search runs. The worker sends its steps and its outcome as events, which
+drainEvents() shows on the GUI. Extra options (such as the frontier of A* and UCS) are passed on to the Engine.'''
+def runSearch(algorithm, sleeptime=0, tracepath=False, **options):
+    global worker
+    if searching():
+        showMessage('A calculation is still running, cancel it first.\n')
+        return
     resetColors()   # Recolors the previous shown pathway (if there is one) back to white
-    board.resetVisitorFlags()   # Resets the visitor flags back to False
-    # Both A* and UCS use a priorityqueue as agenda, that's also why I have combined both in one function
-    agenda = queue.PriorityQueue()
-    previous_pathway = []
-    # If the algorithm is A* then we will incorporate a heuristic, we will subtract the board.start value since this
-    # will be added later on. If the algorithm is UCS then we will not incorporate the heuristic. An item in the agenda
-    # will look like this (value, [travelled_pathway]) where value is either heuristic + travelled distance (A*) or just
-    # travelled distance in case of UCS.
-    if astar:
-        agenda.put((calculateHeuristic(board.start, board.destination)
-                    - board.board[board.start[0]][board.start[1]], [board.start]))
-        alg = "Algorithm A*"
-    else:
-        agenda.put([- board.board[board.start[0]][board.start[1]], [board.start]])
-        alg = "Uniform Cost Search"
-    while agenda.qsize() > 0:
-        pointer = agenda.get() # Gets the first item from the priorityqueue
-        pathway, current_point = pointer[1], pointer[1][-1]
-        shortest_distance_to_current = board.visited[current_point[0]][current_point[1]]
-        travelled_distance = pointer[0] + board.board[current_point[0]][current_point[1]]
-        if astar:
-            # In the A* algorithm the heuristic is incorporated in the first value of the agenda
-            travelled_distance -= calculateHeuristic(current_point, board.destination)
-        if str(shortest_distance_to_current).isdigit() and travelled_distance >= shortest_distance_to_current:
-            # If this point has been visited yet and the current travelled distance is more than the previous
-            # shortest distance to this point then we will not continue with this pathway
-            continue
-        # Else we will update the shortest distance to this point to the current travelled distance
-        board.visited[current_point[0]][current_point[1]] = travelled_distance
-        # If the tracepath is selected on the GUI then we will update the pathway each iteration
-        if tracepath:
-            time.sleep(sleeptime)
-            # Delete the part of the previous pathway which isn't present in the current pathway
-            unshowCalculation([coord for coord in previous_pathway if coord not in pathway])
-            # Show the part of the current pathway which isn't active yet
-            showCalculation([coord for coord in pathway if coord not in previous_pathway])
-        if current_point == board.destination: # If we have reached the destination
-            if not tracepath:   # Show the pathway if tracepath was disabled, otherwise it is already shown
-                showCalculation(pathway)
-            messagebox.config(state='normal')   # Allow us to make a change in the messagebox
-            messagebox.insert('end', f'Algorithm: {alg}\nTotal Distance: {travelled_distance}\n'
-                                        f'Elapsed time: {datetime.datetime.now() - start}\n')  # update messagebox
-            messagebox.config(state='disabled') # Close access to messagebox again (prevents user input/disrupt)
+    # The searches only use a component index which is built already, it is (re)built here before the worker starts
+    board.components().refresh()
+    worker = SearchWorker(algorithm, sleeptime, tracepath, options)
+    worker.start()
+    root.after(DRAIN_INTERVAL, drainEvents)
+
+
+'''This function returns True while a SearchWorker is calculating a pathway, the board cannot be changed then.'''
+def searching():
+    return worker is not None and worker.is_alive()
+
+
+'''This function cancels the running calculation (if there is one), the worker stops at its next step.'''
+def cancelSearch():
+    if searching():
+        worker.cancelled.set()
+
+
+'''This function shows the events of the worker on the GUI. It is called by the Tk event loop (root.after) and handles
+at most DRAIN_BATCH events per call, so the animation rate only depends on the interval and not on the search speed.'''
+def drainEvents():
+    current = worker
+    for handled in range(DRAIN_BATCH):
+        try:
+            kind, data = current.events.get_nowait()
+        except queue.Empty:
+            break
+        if kind == 'step':
+            removed, added = data
+            renderer.unmark(removed)
+            renderer.mark(added)
+        elif kind == 'improved':
+            resetColors()  # An anytime search shows every better pathway as soon as it has been found
+            renderer.mark(data.path)
+            showMessage(f'Improved pathway: Total Distance {data.cost}, at most {data.bound:.3f} times the lowest\n')
+        else:
+            showOutcome(current, kind, data)
             return
-        # If we are not at the destination yet then we will add all possible and viable neighbors to the agenda
-        # Viable neighbors are those which are on the board, which are not obstacles, which are not in the pathway
-        # yet (prevents cycles) and which have not been visited yet or have only been visited by a longer path
-        for point in filter(lambda point: not str(board.board[point[0]][point[1]]).isalpha()
-                                and point not in pathway
-                                and (not board.visited[point[0]][point[1]]
-                                     or travelled_distance > board.visited[point[0]][point[1]])
-                            , findNeighbors(current_point, board.size)):
-            if astar:
-                agenda.put((calculateHeuristic(point, board.destination) + travelled_distance, pathway + [point]))
+    root.after(DRAIN_INTERVAL, drainEvents)
+
+
+'''This function shows the outcome of a calculation: the result, or that it was cancelled.'''
+def showOutcome(finished, kind, result):
+    name = ALGORITHMS[finished.algorithm]
+    if kind == 'cancelled':
+        resetColors()
+        showMessage(f'Algorithm: {name} \nThe calculation was cancelled!\n')
+    elif result.found:
+        resetColors()  # A traced bidirectional search ends with the pathway of one side, so show the whole pathway
+        renderer.mark(result.path)
+        showMessage(f'Algorithm: {name}\nTotal Distance: {result.cost}\n'
+                    f'Expanded cells: {result.expanded}\n'
+                    f'Elapsed time: {datetime.timedelta(seconds=result.elapsed)}\n')
+        if result.bound is not None:  # An anytime search tells how far its pathway can be from the lowest cost
+            showMessage(f'Suboptimality bound: {result.bound:.3f}\n')
+        if result.stats is not None:  # The searches of the Engine also count their agenda
+            showMessage(f'Agenda pushes: {result.stats.pushed}, stale pops: {result.stats.stale}, '
+                        f'peak size: {result.stats.peakFrontier}\n')
+            if result.stats.pruned:
+                showMessage(f'Dropped from the full agenda: {result.stats.pruned}\n')
+    else:
+        resetColors()  # Decolor the last pathway of the calculation
+        showMessage(f'Algorithm: {name} \nNo pathway found!\n')
+
+
+class SearchWorker(threading.Thread):
+    '''
+    This class runs one search in its own thread and never touches the GUI: it puts events in a queue instead. Its
+    step() is the onExpand callback of the search. When tracepath is active every step waits sleeptime seconds and sends
+    a ('step', (removed, added)) event with the part of the previous pathway which isn't in the current pathway and the
+    part of the current pathway which wasn't shown yet. Both pathways start at the same cell, so everything after their
+    common beginning is the difference, which is found in O(length). At the end it sends ('done', result), or
+    ('cancelled', None) when the cancelled event was set: then step() raises Engine.SearchCancelled, which stops the
+    search. D* Lite is not run by the Engine but by the incremental planner of the board, which only repairs its
+    previous calculation, so it can neither be traced nor cancelled. ARA* sends an ('improved', result) event for every
+    better pathway it finds, cancelling it ends the calculation with the best pathway so far.
+    '''
+    def __init__(self, algorithm, sleeptime, tracepath, options):
+        super().__init__(daemon=True)
+        self.algorithm = algorithm
+        self.sleeptime = sleeptime
+        self.tracepath = tracepath
+        self.options = options
+        self.events = queue.Queue(EVENT_LIMIT)  # A full queue makes the search wait for the GUI
+        self.cancelled = threading.Event()
+        self.previous_pathway = []  # The indices of the last sent pathway
+        self.best = None  # The best pathway of an anytime search so far
+
+    def run(self):
+        options = dict(self.options)
+        if self.algorithm == 'arastar':
+            options['onImprove'] = self.improve
+        try:
+            if self.algorithm == 'dstarlite':
+                result = planner.plan()
             else:
-                agenda.put((travelled_distance, pathway + [point]))
-        previous_pathway = pathway
-    # This will only execute when no pathway has been found
-    unshowCalculation(previous_pathway[1:]) # Decolor the last pathway of the calculation
-    messagebox.config(state='normal')  # Allow us to make a change in the messagebox
-    messagebox.insert('end', f'Algorithm: {alg} \nNo pathway found!\n')
-    messagebox.config(state='disabled')  # Close access to messagebox again (prevents user input/disrupt)
-    return
-
-
-'''This function is used to calculate the pathway for the Depth First Search (DFS) and Breadth First Search (BFS).'''
-def depthOrBreadthFirstSearch(sleeptime=0, breadth=True, tracepath=False):
-    start = datetime.datetime.now()
-    resetColors()
-    board.resetVisitorFlags()
-    previous_pathway = []
-    if breadth: # BFS will use a queue as agenda (FIFO)
-        agenda = queue.Queue()
-        alg = "Breadth First Search"
-    else: # DFS will use a stack as agenda (LIFO), not that this could be implemented
-        # with a simple list as well, yet the usage of queue.LifoQueue() allows me to combine both DFS and BFS in one
-        # function due to the identical 'put' and 'get' commands as opposed to 'append' and 'pop' if a list were used.
-        agenda = queue.LifoQueue()
-        alg = "Depth First Search"
-    agenda.put([board.start])
-    while agenda.qsize() > 0:
-        pathway = agenda.get() # One item in the agenda consists of a pathway (list of coordinates), nothing else.
-        current_point = pathway[-1] # The current point is the last point in the pathway
-        if board.visited[current_point[0]][current_point[1]]:
-            continue  # If we already visited this point then we will not add it again
-        if tracepath:   # If the tracepath is selected on the GUI then we will update the pathway each iteration
-            time.sleep(sleeptime)
-            # Delete the part of the previous pathway which isn't present in the current pathway
-            unshowCalculation([coord for coord in previous_pathway if coord not in pathway])
-            # Show the part of the current pathway which isn't active yet
-            showCalculation([coord for coord in pathway if coord not in previous_pathway])
-        board.visited[current_point[0]][current_point[1]] = True  # Set the visited flag for this node to True
-        if current_point == board.destination:  # If we have reached the destination
-            if not tracepath: # Show the pathway if tracepath was disabled, otherwise it is already shown
-                showCalculation(pathway)
-            # Calculate the distance by adding all values of the point in the pathway
-            travelled_distance = functools.reduce(lambda x, y: x + y,
-                            map(lambda x: board.board[x[0]][x[1]], pathway[1:]))
-            messagebox.config(state='normal')   # Allow us to make a change in the messagebox
-            messagebox.insert('end', f'Algorithm: {alg}\nTotal Distance: {travelled_distance}\n'
-                                        f'Elapsed time: {datetime.datetime.now() - start}\n') # update messagebox
-            messagebox.config(state='disabled') # Close access to messagebox again (prevents user input/disrupt)
+                result = Engine.solve(board, algorithm=self.algorithm, onExpand=self.step, **options)
+        except Engine.SearchCancelled:
+            result = None
+        if result is None or self.cancelled.is_set():
+            result = self.best
+        self.send(('cancelled', None) if result is None else ('done', result))
+
+    '''This function is the onImprove callback of an anytime search'''
+    def improve(self, result):
+        self.best = result
+        self.send(('improved', result))
+
+    def step(self, state, index):
+        if self.cancelled.is_set():
+            raise Engine.SearchCancelled()
+        if not self.tracepath:
             return
-        # If we are not at the destination yet then we will add all possible and viable neighbors to the agenda
-        # Viable neighbours are those which are on the board and have not been visited yet
-        for point in filter(lambda point: not str(board.board[point[0]][point[1]]).isalpha()
-                            and not board.visited[point[0]][point[1]], findNeighbors(current_point, board.size)):
-            agenda.put(pathway + [point])
-        previous_pathway = pathway
-    # This will only execute when no pathway has been found
-    unshowCalculation(previous_pathway[1:])  # Decolor the last pathway of the calculation
-    messagebox.config(state='normal')  # Allow us to make a change in the messagebox
-    messagebox.insert('end', f'Algorithm: {alg} \nNo pathway found!\n')
-    messagebox.config(state='disabled')  # Close access to messagebox again (prevents user input/disrupt)
-    return
-
-
-'''Calculates the heuristic (Manhattan distance) from a certain point to the destination.'''
-def calculateHeuristic(point1, point2):
-    return abs(point1[0] - point2[0]) + abs(point1[1] - point2[1])
-
-
-'''This function will return a list of all neighbours of a certain point which are on the board.
-In practise this will check whether the point lies on the edge of the board or not, it does not check for obstacles!'''
-def findNeighbors(point, size):
-    nextPoints = []
-    if point[0] != 0:
-        nextPoints.append((point[0] - 1, point[1]))  # Add point above current
-    if point[1] != 0:
-        nextPoints.append((point[0], point[1] - 1))  # Add point left of current
-    if point[0] != size - 1:
-        nextPoints.append((point[0] + 1, point[1]))  # Add point below current
-    if point[1] != size - 1:
-        nextPoints.append((point[0], point[1] + 1))  # Add point right of current
-    return nextPoints
+        if self.sleeptime:
+            self.cancelled.wait(self.sleeptime)  # Returns right away when the calculation is cancelled meanwhile
+        pathway, previous = state.tracePathway(index), self.previous_pathway
+        common = 0
+        while common < len(pathway) and common < len(previous) and pathway[common] == previous[common]:
+            common += 1
+        self.send(('step', ([board.point(cell) for cell in previous[common:]],
+                            [board.point(cell) for cell in pathway[common:]])))
+        self.previous_pathway = pathway
+
+    '''This function puts an event in the queue, it waits while the queue is full but not when a step is cancelled'''
+    def send(self, event):
+        while True:
+            try:
+                self.events.put(event, timeout=0.1)
+                return
+            except queue.Full:
+                if event[0] == 'step' and self.cancelled.is_set():
+                    raise Engine.SearchCancelled()
+
+
+'''This function adds a message to the messagebox.'''
+def showMessage(message):
+    messagebox.config(state='normal')   # Allow us to make a change in the messagebox
+    messagebox.insert('end', message)
+    messagebox.config(state='disabled') # Close access to messagebox again (prevents user input/disrupt)
 
 
 '''This will delete the current messages on display.'''
@@ -321,14 +294,11 @@ if __name__ == "__main__":
     bottomframe = tk.Frame(mainframe)
     bottomframe.pack(side='bottom', expand=True, fill='both')
 
-    matrixcanvas = tk.Canvas(bottomframe)
-    matrixframe = tk.Frame(matrixcanvas)
-    yscrollbar = tk.Scrollbar(bottomframe, orient="vertical", command=matrixcanvas.yview)   # Vertical scrollbar
-    yscrollbar.pack(fill='y', side='right')  # Stretch scrollbar vertically and put it on the right side
-    matrixcanvas.pack(fill='both', expand=True)
+    matrixcanvas = tk.Canvas(bottomframe, background='white', highlightthickness=0)
+    matrixcanvas.pack(fill='both', expand=True)     # The board is drawn on this canvas by the renderer
 
 
-    matrixsizeslider = tk.Scale(settingsframe, from_=10, to=50, orient='horizontal', length=200, label='Matrix size')
+    matrixsizeslider = tk.Scale(settingsframe, from_=10, to=1000, orient='horizontal', length=200, label='Matrix size')
     matrixsizeslider.pack(anchor='n')       # Matrix size slider
 
     actionvar = tk.StringVar()
@@ -357,9 +327,7 @@ if __name__ == "__main__":
                                 value=False).pack() # Disbale tracepath
 
     algvar = tk.StringVar()             # Parameter which indicates the selected algorithm
-    algorithmbuttons = ["Algorithm A*", "Breadth First Search", "Depth First Search", "Uniform Cost Search"]
-
-    for algorithm in algorithmbuttons:
+    for algorithm in ALGORITHMS.values():
         algorithmbutton = tk.Radiobutton(algorithmframe, text=algorithm, indicatoron=0, width=25, variable=algvar,
                                          value=algorithm, command=algsel)
         algorithmbutton.pack()          # Buttons for selecting the desired algorithm
@@ -375,6 +343,9 @@ if __name__ == "__main__":
                                        command=lambda: calculatePathway())
     calculatepathwaybutton.pack(anchor='s') # Button for calculating the pathway
 
+    cancelbutton = tk.Button(algorithmframe, text='Cancel Calculation', command=lambda: cancelSearch())
+    cancelbutton.pack(anchor='s')           # Button for stopping a running calculation
+
     messagebox = tk.Text(messageframe, height=10, width=50, state='disabled')
     messagebox.pack()                       # The message window, used for showing the user results.
                                             # User input has been disabled
@@ -0,0 +1,199 @@
+'''
+This module draws a board on one tk.Canvas instead of one tk.Button per cell. Only the visible part of the board (the
+viewport) is drawn: as a rectangle (with its value when the cells are large enough) per cell, or as one image when so
+many cells are visible that rectangles would be too slow. The renderer keeps the color of every cell itself, so a change
+only recolors the cells which changed: it listens to the board for changed values, a moved start or destination and a
+new board, and mark()/unmark() color cells of a pathway on top of their normal color. A click is mapped to a cell by its
+coordinates. The mouse wheel zooms around the pointer, dragging with the right (or middle) mouse button pans.
+'''
+import tkinter as tk
+
+import Board
+
+# The colors of the cells, marked cells (the pathway) get the color they are marked with
+COLORS = {'free': '#ffffff', 'obstacle': '#000000', 'start': '#008000', 'destination': '#ff0000'}
+RECTANGLE_LIMIT = 10000  # Above this amount of visible cells the viewport is drawn as one image instead of rectangles
+TEXT_SIZE = 18  # From this cell size (in pixels) on the values are written in the cells
+MAX_CELL = 64  # The largest cell size (in pixels) when zooming in
+
+
+class BoardRenderer:
+    '''
+    This class draws a board on a canvas and keeps it up to date. onClick(row, column) is called when a cell is
+    clicked with the left mouse button. The first visible row and column are top and left, every cell is cell pixels
+    wide and high.
+    '''
+    def __init__(self, canvas, board, onClick=None):
+        self.canvas = canvas
+        self.board = board
+        self.onClick = onClick
+        self.marks = {}  # The index and color of every marked cell
+        self.items = {}  # The index and (rectangle, text) items of every visible cell when drawn as rectangles
+        self.image = None  # The PhotoImage of the viewport when it is drawn as one image
+        self.start, self.destination = board.start, board.destination
+        self.top = self.left = 0
+        self.cell = self.fittingCell()
+        self.dragging = None  # The last mouse position while panning
+        canvas.bind('<Button-1>', self.click)
+        for button in (2, 3):
+            canvas.bind(f'<ButtonPress-{button}>', self.startPan)
+            canvas.bind(f'<B{button}-Motion>', self.pan)
+        canvas.bind('<MouseWheel>', lambda event: self.zoom(1.25 if event.delta > 0 else 0.8, event.x, event.y))
+        canvas.bind('<Button-4>', lambda event: self.zoom(1.25, event.x, event.y))  # The mouse wheel on Linux
+        canvas.bind('<Button-5>', lambda event: self.zoom(0.8, event.x, event.y))
+        canvas.bind('<Configure>', lambda event: self.redraw())
+        board.addListener(self.boardChanged)
+        self.redraw()
+
+    '''This function returns the cell size at which the whole board fits on the canvas'''
+    def fittingCell(self):
+        space = min(max(self.canvas.winfo_width(), 1), max(self.canvas.winfo_height(), 1))
+        return max(1, min(space // self.board.size, MAX_CELL // 2))
+
+    '''This function stops listening to the board, e.g. when a new board is shown'''
+    def detach(self):
+        if self.boardChanged in self.board.listeners:
+            self.board.removeListener(self.boardChanged)
+
+    '''This function returns the color of a cell: the color it is marked with or the color of what it is'''
+    def color(self, index):
+        if index in self.marks:
+            return self.marks[index]
+        point = self.board.point(index)
+        if point == self.start:
+            return COLORS['start']
+        if point == self.destination:
+            return COLORS['destination']
+        return COLORS['obstacle'] if self.board.grid[index] == Board.OBSTACLE else COLORS['free']
+
+    '''This function returns the rows and columns (as ranges) of the cells which are visible on the canvas'''
+    def viewport(self):
+        rows = -(-max(self.canvas.winfo_height(), 1) // self.cell)
+        columns = -(-max(self.canvas.winfo_width(), 1) // self.cell)
+        return (range(self.top, min(self.board.size, self.top + rows)),
+                range(self.left, min(self.board.size, self.left + columns)))
+
+    '''This function draws the viewport again from nothing, after zooming, panning or a new board'''
+    def redraw(self):
+        canvas, board, cell = self.canvas, self.board, self.cell
+        canvas.delete('board')
+        self.items.clear()
+        self.image = None
+        rows, columns = self.viewport()
+        if len(rows) * len(columns) <= RECTANGLE_LIMIT:
+            for row in rows:
+                for column in columns:
+                    index = board.index(row, column)
+                    x, y = (column - self.left) * cell, (row - self.top) * cell
+                    rectangle = canvas.create_rectangle(x, y, x + cell, y + cell, fill=self.color(index),
+                                                        outline='grey' if cell >= TEXT_SIZE else '', tags='board')
+                    text = None
+                    if cell >= TEXT_SIZE:
+                        text = canvas.create_text(x + cell // 2, y + cell // 2, text=board.board[row][column],
+                                                  fill=self.textColor(index), tags='board')
+                    self.items[index] = rectangle, text
+        elif rows and columns:
+            # One pixel per cell, which is then enlarged to the cell size. The rows of colors are put in one go.
+            image = tk.PhotoImage(width=len(columns), height=len(rows))
+            image.put(' '.join('{' + ' '.join(self.color(board.index(row, column)) for column in columns) + '}'
+                               for row in rows))
+            self.image = image.zoom(cell) if cell > 1 else image
+            canvas.create_image(0, 0, anchor='nw', image=self.image, tags='board')
+
+    '''This function returns the color of the value written in a cell, white on obstacles and black elsewhere'''
+    def textColor(self, index):
+        return 'white' if self.board.grid[index] == Board.OBSTACLE else 'black'
+
+    '''This function recolors a single cell (and writes its value again), cells outside the viewport are skipped'''
+    def recolor(self, index):
+        row, column = self.board.point(index)
+        if self.image is not None:
+            rows, columns = self.viewport()
+            if row in rows and column in columns:
+                x, y = (column - self.left) * self.cell, (row - self.top) * self.cell
+                self.image.put(self.color(index), to=(x, y, x + self.cell, y + self.cell))
+        elif index in self.items:
+            rectangle, text = self.items[index]
+            self.canvas.itemconfig(rectangle, fill=self.color(index))
+            if text is not None:
+                self.canvas.itemconfig(text, text=self.board.board[row][column], fill=self.textColor(index))
+
+    '''This function marks the cells of points (a list of (row, column) points) with a color, e.g. a pathway'''
+    def mark(self, points, color=COLORS['start']):
+        for point in points:
+            index = self.board.index(*point)
+            self.marks[index] = color
+            self.recolor(index)
+
+    '''This function takes the mark away from the cells of points, they get their normal color again'''
+    def unmark(self, points):
+        for point in points:
+            index = self.board.index(*point)
+            if self.marks.pop(index, None) is not None:
+                self.recolor(index)
+
+    '''This function takes every mark away, only the marked cells are recolored'''
+    def clearMarks(self):
+        for index in list(self.marks):
+            del self.marks[index]
+            self.recolor(index)
+
+    '''This function is the listener on the board'''
+    def boardChanged(self, change, row, column):
+        if change == 'cell':
+            self.recolor(self.board.index(row, column))
+        elif change == 'start':
+            previous, self.start = self.start, self.board.start
+            self.recolor(self.board.index(*previous))
+            self.recolor(self.board.index(*self.start))
+        elif change == 'destination':
+            previous, self.destination = self.destination, self.board.destination
+            self.recolor(self.board.index(*previous))
+            self.recolor(self.board.index(*self.destination))
+        elif change == 'board':
+            self.start, self.destination = self.board.start, self.board.destination
+            self.marks.clear()
+            self.redraw()
+
+    '''This function returns the (row, column) point of the cell at pixel (x, y) of the canvas, or None'''
+    def cellAt(self, x, y):
+        row, column = self.top + int(y) // self.cell, self.left + int(x) // self.cell
+        if 0 <= row < self.board.size and 0 <= column < self.board.size:
+            return row, column
+        return None
+
+    '''This function handles a click with the left mouse button'''
+    def click(self, event):
+        point = self.cellAt(event.x, event.y)
+        if point is not None and self.onClick is not None:
+            self.onClick(*point)
+
+    '''This function multiplies the cell size by factor, the cell under pixel (x, y) stays where it is'''
+    def zoom(self, factor, x=0, y=0):
+        cell = max(1, min(MAX_CELL, round(self.cell * factor)))
+        if cell == self.cell:  # Small cells would never change with a rounded factor
+            cell = max(1, min(MAX_CELL, self.cell + (1 if factor > 1 else -1)))
+        if cell == self.cell:
+            return
+        row, column = self.top + int(y) // self.cell, self.left + int(x) // self.cell
+        self.cell = cell
+        self.moveTo(row - int(y) // cell, column - int(x) // cell)
+
+    '''This function makes (row, column) the first visible cell, within the board'''
+    def moveTo(self, row, column):
+        self.top = max(0, min(self.board.size - 1, row))
+        self.left = max(0, min(self.board.size - 1, column))
+        self.redraw()
+
+    '''This function remembers where panning starts'''
+    def startPan(self, event):
+        self.dragging = event.x, event.y
+
+    '''This function pans the viewport by the whole cells the mouse has been dragged over'''
+    def pan(self, event):
+        if self.dragging is None:
+            return
+        rows, columns = int((event.y - self.dragging[1]) / self.cell), int((event.x - self.dragging[0]) / self.cell)
+        if rows or columns:
+            self.dragging = self.dragging[0] + columns * self.cell, self.dragging[1] + rows * self.cell
+            self.moveTo(self.top - rows, self.left - columns)
@@ -0,0 +1,123 @@
+'''
+This module runs scenarios from the command line without the GUI. Every line of the input (a JSONL file or standard
+input) is one scenario, for example:
+    {"id": 1, "board": {"file": "map.tab"}, "start": [0, 0], "goal": [99, 99], "algorithm": "astar"}
+The board is {"file": path} for a board written by Board.save(), {"text": path} for a text grid (Board.importText) or
+{"size": n, "seed": s} for a generated board, start and goal default to the start and destination of the board, the
+algorithm (see Engine.ALGORITHMS) defaults to astar and "options" are passed on to Engine.solve. For every scenario one
+JSON line is written as soon as it is done: the id (or the line number), the algorithm, cost, expanded cells and elapsed
+time (and the suboptimality bound of an anytime search such as arastar with a "deadline_ms" option), or an error. The
+scenarios are read, solved and written one by one by generators, so the memory stays the same however many scenarios
+there are. With --workers the scenarios are solved by worker processes; at most --inflight of them are underway at once
+and the results are still written in the order of the input.
+    python Runner.py scenarios.jsonl --workers 4 --output results.jsonl
+'''
+import argparse
+import collections
+import concurrent.futures
+import functools
+import json
+import sys
+
+import Board
+import Engine
+
+BOARD_CACHE = 4  # The amount of boards which every process keeps open for the next scenarios
+
+
+'''This function opens the board of a board specification (as a JSON string, so it can be cached). The last BOARD_CACHE
+boards are kept, scenarios on the same board follow each other most of the time.'''
+@functools.lru_cache(maxsize=BOARD_CACHE)
+def openBoard(specification):
+    return makeBoard(json.loads(specification))
+
+
+'''This function makes a new board from a board specification (a dictionary), see the description of this module.'''
+def makeBoard(specification):
+    if 'file' in specification:
+        return Board.Board.load(specification['file'])
+    if 'text' in specification:
+        return Board.Board.importText(specification['text'])
+    if 'size' in specification:
+        return Board.Board(specification['size'], seed=specification.get('seed'))
+    raise ValueError('A board needs a file, a text or a size!')
+
+
+'''This function solves the scenario on one line of the input and returns the JSON line with its result and whether the
+scenario failed. A scenario which cannot be solved gives a line with the error instead, so one bad line doesn't stop
+the rest.'''
+def runScenario(number, line, paths=False):
+    identifier = number
+    try:
+        scenario = json.loads(line)
+        identifier = scenario.get('id', number)
+        board = openBoard(json.dumps(scenario['board'], sort_keys=True))
+        start, goal = scenario.get('start'), scenario.get('goal')
+        result = Engine.solve(board, start, goal, scenario.get('algorithm', 'astar'), **scenario.get('options', {}))
+    except Exception as error:  # Every problem with a scenario is reported on its own line
+        return json.dumps({'id': identifier, 'error': f'{type(error).__name__}: {error}'}), True
+    output = {'id': identifier, 'algorithm': result.algorithm, 'cost': result.cost, 'expanded': result.expanded,
+              'elapsed': round(result.elapsed, 6)}
+    if result.bound is not None:
+        output['bound'] = result.bound
+    if paths:
+        output['path'] = result.path
+    return json.dumps(output), False
+
+
+'''This generator yields the (line number, line) of every scenario in the stream, empty lines are skipped.'''
+def readScenarios(stream):
+    for number, line in enumerate(stream, 1):
+        if line.strip():
+            yield number, line
+
+
+'''This generator yields the (result line, failed) pairs of the scenarios in their order. Without workers the scenarios
+are solved here one at a time, otherwise by a pool of worker processes with at most inflight scenarios submitted at
+once: a new scenario is only read when the oldest one has been written.'''
+def runScenarios(scenarios, workers=0, inflight=None, paths=False):
+    if not workers:
+        for number, line in scenarios:
+            yield runScenario(number, line, paths)
+        return
+    inflight = inflight or 4 * workers
+    with concurrent.futures.ProcessPoolExecutor(workers) as pool:
+        pending = collections.deque()
+        for number, line in scenarios:
+            pending.append(pool.submit(runScenario, number, line, paths))
+            if len(pending) >= inflight:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+'''This function is the command line interface, it returns the exit status: 1 when a scenario gave an error.'''
+def main(arguments=None):
+    parser = argparse.ArgumentParser(description='Solve a stream of scenarios (JSON lines) and write their results.')
+    parser.add_argument('input', nargs='?', default='-', help='the JSONL file with the scenarios (default: stdin)')
+    parser.add_argument('--output', default='-', help='the file for the result lines (default: stdout)')
+    parser.add_argument('--workers', type=int, default=0, help='the amount of worker processes (default: none)')
+    parser.add_argument('--inflight', type=int, help='the most scenarios underway at once (default: 4 per worker)')
+    parser.add_argument('--paths', action='store_true', help='write the pathway of every scenario as well')
+    options = parser.parse_args(arguments)
+    if options.workers < 0 or (options.inflight is not None and options.inflight < 1):
+        parser.error('--workers cannot be negative and --inflight must be at least 1')
+
+    source = sys.stdin if options.input == '-' else open(options.input)
+    target = sys.stdout if options.output == '-' else open(options.output, 'w')
+    failed = False
+    try:
+        for result, error in runScenarios(readScenarios(source), options.workers, options.inflight, options.paths):
+            target.write(result + '\n')
+            target.flush()  # Every result is visible as soon as its scenario is done
+            failed = failed or error
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        if target is not sys.stdout:
+            target.close()
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,469 @@
+'''
+This module is a local solve service: an asyncio server on a TCP or Unix socket which keeps boards in memory and solves
+(start, goal) queries on them for many clients at once. Every line which a client sends is one JSON request and every
+request gets one JSON line back with the same id, requests on one connection are handled concurrently so the answers can
+come back in another order:
+    {"id": 1, "op": "load", "board": "map", "spec": {"size": 500, "seed": 1}}  (a board specification as in Runner.py)
+    {"id": 2, "op": "solve", "board": "map", "start": [0, 0], "goal": [499, 499], "algorithm": "astar", "paths": true}
+    {"id": 3, "op": "edit", "board": "map", "row": 3, "column": 4, "value": "X"}
+    {"id": 4, "op": "stats"}
+The searches run in a pool of worker processes (or threads) and never on the event loop. The grid of every board lies in
+shared memory, so a worker attaches to it once instead of getting the board with every query, and every search has its
+own SearchState, so concurrent queries never share a buffer. Identical queries (board, version, start, goal, algorithm
+and options) which arrive while the first one is still being solved wait for that solve instead of starting their own.
+Finished results are kept in a least recently used cache, which forgets the results of a board as soon as it changes.
+An edit or a load of a client waits until the solves which are running on its board are done and new solves of that
+board wait for it, so a search never sees a board which changes under it and every answer belongs to one version of the
+board.
+A client can only load generated boards of at most --max-size rows, or board files (and text grids) which lie in the
+--directory of the service, so the socket gives no access to other files and cannot exhaust the memory.
+The load generator connects with many clients at once and reports the throughput and the tail latency:
+    python Service.py serve --port 8765 --board map='{"size": 500, "seed": 1}'
+    python Service.py load --port 8765 --board map --requests 2000 --concurrency 32
+'''
+import argparse
+import asyncio
+import collections
+import concurrent.futures
+import contextlib
+import json
+import os
+import random
+import sys
+import time
+from multiprocessing import shared_memory
+
+import Benchmark
+import Board
+import Engine
+import Runner
+
+PORT = 8765  # The default TCP port of the service
+RESULT_CACHE = 1024  # The default amount of results which the service keeps
+ATTACHED_LIMIT = 8  # The amount of shared boards which a worker process keeps attached
+MAX_SIZE = 4096  # The default largest size of a generated board which a client can load
+
+# The shared boards which the current worker process has attached to: memory name -> (memory, board, state)
+attached = collections.OrderedDict()
+
+
+class HostedBoard:
+    '''
+    This class is a board which the service holds: a copy of the loaded board whose grid lies in shared memory (or in a
+    plain bytearray for a pool of threads), so edits of the service are seen by the workers right away.
+    '''
+    def __init__(self, board, shared):
+        cells = board.size ** 2
+        self.memory = None
+        if shared:
+            self.memory = shared_memory.SharedMemory(create=True, size=cells)
+            self.memory.buf[:cells] = board.grid
+            grid = self.memory.buf[:cells]
+        else:
+            grid = bytearray(board.grid)
+        self.board = Board.Board(board.size, grid=grid)
+        self.board.start, self.board.destination = board.start, board.destination
+
+    '''This function gives the shared memory free again, the workers which are attached keep their own mapping'''
+    def close(self):
+        if self.memory is not None:
+            self.board.grid.release()
+            self.memory.close()
+            self.memory.unlink()
+            self.memory = None
+
+
+class SolveService:
+    '''
+    This class holds the boards, the pool, the in-flight queries and the result cache of the service. executor is
+    'process' or 'thread', workers the size of the pool and cache the amount of results which are kept. Clients can
+    load generated boards of at most maxSize rows and the board files in directory (None: no files at all). requests,
+    hits (answered from the cache), coalesced (waited for an identical query) and solves count how it was used.
+    '''
+    def __init__(self, executor='process', workers=None, cache=RESULT_CACHE, maxSize=MAX_SIZE, directory=None):
+        if executor not in ('process', 'thread'):
+            raise ValueError(f'Unknown executor {executor!r}, choose process or thread')
+        self.shared = executor == 'process'
+        if self.shared:
+            self.pool = concurrent.futures.ProcessPoolExecutor(workers)
+        else:
+            self.pool = concurrent.futures.ThreadPoolExecutor(workers)
+        self.cache = cache
+        self.maxSize = maxSize
+        self.directory = None if directory is None else os.path.realpath(directory)
+        self.boards = {}
+        self.results = collections.OrderedDict()  # Query key -> result record, the most recent use last
+        self.inflight = {}  # Query key -> the future of the solve which is running for it
+        self.editing = {}  # Board name -> a future which is done when the change of that board is done (see exclusive)
+        self.requests = self.hits = self.coalesced = self.solves = 0
+
+    '''This function makes a board available under name, a board which was there under that name is replaced'''
+    def load(self, name, board):
+        self.unload(name)
+        hosted = HostedBoard(board, self.shared)
+        hosted.board.addListener(lambda change, row, column: self.invalidate(name, change))
+        if not self.shared:
+            hosted.board.components().build()  # The threads share the index, so it is not built by several at once
+        self.boards[name] = hosted
+        return hosted.board
+
+    '''This function makes the board of a specification from a client: a generated board of at most maxSize rows with
+    an integer seed, or a file or text grid in the directory of the service. Anything else raises a ValueError.'''
+    def clientBoard(self, specification):
+        if not isinstance(specification, dict) or len(specification.keys() & {'file', 'text', 'size'}) != 1:
+            raise ValueError('A board needs exactly one of a file, a text or a size!')
+        if 'size' in specification:
+            size, seed = specification['size'], specification.get('seed')
+            if type(size) is not int or not 1 <= size <= self.maxSize:
+                raise ValueError(f'The size of a board must be an integer between 1 and {self.maxSize}!')
+            if seed is not None and type(seed) is not int:
+                raise ValueError('The seed of a board must be an integer!')
+            return Board.Board(size, seed=seed)
+        kind = 'file' if 'file' in specification else 'text'
+        if self.directory is None:
+            raise ValueError('This service has no directory to load boards from!')
+        path = specification[kind]
+        if not isinstance(path, str):
+            raise ValueError(f'The {kind} of a board must be a path!')
+        path = os.path.realpath(os.path.join(self.directory, path))
+        if os.path.commonpath((path, self.directory)) != self.directory or not os.path.isfile(path):
+            raise ValueError(f'There is no board {specification[kind]!r} in the directory of the service!')
+        return Runner.makeBoard({kind: path})
+
+    '''This function removes a board together with its results'''
+    def unload(self, name):
+        hosted = self.boards.pop(name, None)
+        if hosted is not None:
+            self.invalidate(name, 'board')
+            hosted.close()
+
+    '''This function is the listener on the boards: the results of a board are dropped when its values change'''
+    def invalidate(self, name, change):
+        if change in ('cell', 'board'):
+            for key in [key for key in self.results if key[0] == name]:
+                del self.results[key]
+
+    '''This function returns the board of a name, or raises a KeyError'''
+    def board(self, name):
+        if name not in self.boards:
+            raise KeyError(f'There is no board {name!r}, load it first')
+        return self.boards[name].board
+
+    '''This function solves a query and returns its result record and where it came from: 'cache', 'coalesced' (from a
+    solve of an identical query which was already running) or 'solved'.'''
+    async def solve(self, name, start=None, goal=None, algorithm='astar', options=None):
+        while name in self.editing:
+            await asyncio.shield(self.editing[name])
+        board = self.board(name)
+        hosted = self.boards[name]
+        if algorithm not in Engine.ALGORITHMS:
+            raise ValueError(f'Unknown algorithm {algorithm!r}, choose one of {", ".join(Engine.ALGORITHMS)}')
+        options = options or {}
+        start, goal = Engine.endpoints(board, start, goal)
+        key = name, board.version, start, goal, algorithm, json.dumps(options, sort_keys=True)
+        self.requests += 1
+        record = self.results.get(key)
+        if record is not None:
+            self.hits += 1
+            self.results.move_to_end(key)
+            return record, 'cache'
+        future = self.inflight.get(key)
+        if future is not None:
+            self.coalesced += 1
+            return await asyncio.shield(future), 'coalesced'
+        self.solves += 1
+        loop = asyncio.get_running_loop()
+        if self.shared:
+            future = loop.run_in_executor(self.pool, solveShared, hosted.memory.name, board.size, start, goal,
+                                          algorithm, options)
+        else:
+            future = loop.run_in_executor(self.pool, solveRecord, board, start, goal, algorithm, options, None)
+        self.inflight[key] = future
+
+        def finished(future):
+            self.inflight.pop(key, None)
+            # A result is only kept when the board didn't change while it was being solved
+            if not future.cancelled() and future.exception() is None and self.boards.get(name) is hosted \
+                    and board.version == key[1]:
+                self.results[key] = future.result()
+                if len(self.results) > self.cache:
+                    self.results.popitem(last=False)
+        future.add_done_callback(finished)
+        return await asyncio.shield(future), 'solved'
+
+    '''This function is the gate of a board name for the changes of a client: it waits for the other changes of that
+    name and then for the solves which are running on it, in the meantime new solves of the name wait for the change.'''
+    @contextlib.asynccontextmanager
+    async def exclusive(self, name):
+        while name in self.editing:  # One change of a board at a time
+            await asyncio.shield(self.editing[name])
+        done = asyncio.get_running_loop().create_future()
+        self.editing[name] = done
+        try:
+            running = [future for key, future in self.inflight.items() if key[0] == name]
+            if running:
+                await asyncio.wait(running)
+            yield
+        finally:
+            del self.editing[name]
+            done.set_result(None)
+
+    '''This function changes a cell of a board (see Board.setValue) behind the gate of its name (see exclusive) and
+    returns the new version of the board. With threads the component index is brought up to date before the solves
+    continue. When the board was unloaded or replaced while the edit waited, it raises a KeyError.'''
+    async def edit(self, name, row, column, value):
+        self.board(name)
+        hosted = self.boards[name]
+        async with self.exclusive(name):
+            if self.boards.get(name) is not hosted:
+                raise KeyError(f'The board {name!r} was unloaded or replaced before the edit')
+            board = hosted.board
+            board.setValue(row, column, value)
+            if not self.shared:
+                board.components().refresh()  # A split which gave up is built again here, not by several solves at once
+            return board.version
+
+    '''This function loads a board for a client (see load) behind the gate of its name (see exclusive), so a board is
+    never replaced while solves are running on it.'''
+    async def replace(self, name, board):
+        async with self.exclusive(name):
+            return self.load(name, board)
+
+    '''This function returns the counters of the service'''
+    def statistics(self):
+        return {'boards': {name: {'size': hosted.board.size, 'version': hosted.board.version}
+                           for name, hosted in self.boards.items()},
+                'requests': self.requests, 'hits': self.hits, 'coalesced': self.coalesced, 'solves': self.solves,
+                'cached': len(self.results), 'inflight': len(self.inflight)}
+
+    '''This function answers one request (a dictionary) and returns the response without its id'''
+    async def answer(self, request):
+        operation = request.get('op', 'solve')
+        if operation == 'solve':
+            record, source = await self.solve(request['board'], request.get('start'), request.get('goal'),
+                                              request.get('algorithm', 'astar'), request.get('options'))
+            response = {key: value for key, value in record.items() if key != 'path' or request.get('paths')}
+            response['source'] = source
+            return response
+        if operation == 'load':
+            board = await self.replace(request['board'], self.clientBoard(request['spec']))
+            return {'board': request['board'], 'size': board.size, 'version': board.version}
+        if operation == 'edit':
+            version = await self.edit(request['board'], request['row'], request['column'], request['value'])
+            return {'board': request['board'], 'version': version}
+        if operation == 'stats':
+            return self.statistics()
+        raise ValueError(f'Unknown operation {operation!r}')
+
+    '''This function serves one connection: every line is answered in its own task, a lock keeps the lines whole'''
+    async def handleConnection(self, reader, writer):
+        lock = asyncio.Lock()
+        tasks = set()
+
+        async def respond(line):
+            identifier = None
+            try:
+                request = json.loads(line)
+                identifier = request.get('id')
+                response = await self.answer(request)
+            except Exception as error:  # Every problem with a request is sent back to the client
+                response = {'error': f'{type(error).__name__}: {error}'}
+            response['id'] = identifier
+            async with lock:
+                writer.write(json.dumps(response).encode() + b'\n')
+                await writer.drain()
+
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                if line.strip():
+                    task = asyncio.create_task(respond(line))
+                    tasks.add(task)
+                    task.add_done_callback(tasks.discard)
+            if tasks:
+                await asyncio.gather(*tasks, return_exceptions=True)
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    '''This function shuts the pool down and gives every shared board free'''
+    def close(self):
+        self.pool.shutdown(cancel_futures=True)
+        for name in list(self.boards):
+            self.unload(name)
+
+
+'''This function solves a query on a board and returns the result as a JSON record'''
+def solveRecord(board, start, goal, algorithm, options, state):
+    if state is not None:
+        options = dict(options, state=state)
+    result = Engine.solve(board, start, goal, algorithm, **options)
+    record = {'algorithm': result.algorithm, 'cost': result.cost, 'expanded': result.expanded,
+              'elapsed': round(result.elapsed, 6), 'path': result.path}
+    if result.bound is not None:
+        record['bound'] = result.bound
+    return record
+
+
+'''This function solves a query in a worker process on a shared board, the worker attaches to the shared memory the
+first time and keeps the board and a SearchState for the next queries. The edits reach the worker through the shared
+memory and not through the listeners of its board, so that board never gets a ComponentIndex (which would have to be
+built again after every edit): the searches of a worker only reject obstacle goals up front (see Engine.unreachable).'''
+def solveShared(name, size, start, goal, algorithm, options):
+    if name in attached:
+        attached.move_to_end(name)
+    else:
+        memory = shared_memory.SharedMemory(name=name)
+        board = Board.Board(size, grid=memory.buf[:size ** 2])
+        attached[name] = memory, board, Engine.SearchState(board)
+        if len(attached) > ATTACHED_LIMIT:
+            memory, board, state = attached.popitem(last=False)[1]
+            board.grid.release()
+            memory.close()
+    memory, board, state = attached[name]
+    return solveRecord(board, start, goal, algorithm, options, state)
+
+
+'''This function runs the service until it is interrupted. boards is a list of (name, specification) pairs which are
+loaded before the first connection.'''
+async def serve(host='127.0.0.1', port=PORT, unix=None, executor='process', workers=None, cache=RESULT_CACHE,
+                boards=(), maxSize=MAX_SIZE, directory=None):
+    service = SolveService(executor, workers, cache, maxSize, directory)
+    for name, specification in boards:  # The boards of the command line are trusted, they may lie anywhere
+        service.load(name, Runner.makeBoard(specification))
+    if unix is not None:
+        server = await asyncio.start_unix_server(service.handleConnection, unix)
+    else:
+        server = await asyncio.start_server(service.handleConnection, host, port)
+    print(f'Serving on {unix or f"{host}:{port}"} with a {executor} pool', file=sys.stderr)
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        service.close()
+
+
+'''This function opens a connection to the service'''
+async def connect(host='127.0.0.1', port=PORT, unix=None):
+    if unix is not None:
+        return await asyncio.open_unix_connection(unix)
+    return await asyncio.open_connection(host, port)
+
+
+'''This function sends one request over a connection and returns the response, a connection sends one at a time'''
+async def request(reader, writer, message):
+    writer.write(json.dumps(message).encode() + b'\n')
+    await writer.drain()
+    return json.loads(await reader.readline())
+
+
+'''This function is the load generator: concurrency clients send requests solve queries in total, picked at random
+from distinct (start, goal) queries on the board so identical queries meet in the cache and in flight. When spec is
+given the board is loaded first. It returns the report: the throughput, the latency percentiles in milliseconds, the
+amount of errors, where the results came from and the statistics of the service afterwards.'''
+async def generateLoad(board, requests=1000, concurrency=16, distinct=100, algorithm='astar', spec=None, seed=0,
+                       host='127.0.0.1', port=PORT, unix=None):
+    reader, writer = await connect(host, port, unix)
+    if spec is not None:
+        response = await request(reader, writer, {'op': 'load', 'board': board, 'spec': spec})
+    else:
+        response = (await request(reader, writer, {'op': 'stats'}))['boards'].get(board)
+    if response is None or 'error' in response:
+        raise ValueError(f'The board {board!r} could not be used: {response}')
+    rng = random.Random(seed)
+    size = response['size']
+    queries = [([rng.randrange(size), rng.randrange(size)], [rng.randrange(size), rng.randrange(size)])
+               for query in range(distinct)]
+    pending = iter(range(requests))
+    latencies, sources, errors = [], collections.Counter(), 0
+
+    async def client():
+        nonlocal errors
+        client_reader, client_writer = await connect(host, port, unix)
+        try:
+            for number in pending:  # The clients share the iterator, so every request is sent once
+                start, goal = rng.choice(queries)
+                began = time.perf_counter()
+                response = await request(client_reader, client_writer, {'id': number, 'op': 'solve', 'board': board,
+                                                                        'start': start, 'goal': goal,
+                                                                        'algorithm': algorithm})
+                latencies.append(time.perf_counter() - began)
+                if 'error' in response:
+                    errors += 1
+                else:
+                    sources[response['source']] += 1
+        finally:
+            client_writer.close()
+
+    began = time.perf_counter()
+    await asyncio.gather(*(client() for number in range(concurrency)))
+    elapsed = time.perf_counter() - began
+    service = await request(reader, writer, {'op': 'stats'})
+    writer.close()
+    return {'requests': requests, 'concurrency': concurrency, 'distinct': distinct, 'elapsed_s': round(elapsed, 3),
+            'throughput_rps': round(requests / elapsed, 1),
+            'p50_ms': round(Benchmark.percentile(latencies, 0.5) * 1000, 3),
+            'p95_ms': round(Benchmark.percentile(latencies, 0.95) * 1000, 3),
+            'p99_ms': round(Benchmark.percentile(latencies, 0.99) * 1000, 3),
+            'max_ms': round(max(latencies) * 1000, 3), 'errors': errors, 'sources': dict(sources),
+            'service': service}
+
+
+'''This function is the command line interface of the service and the load generator'''
+def main(arguments=None):
+    parser = argparse.ArgumentParser(description='A local solve service and its load generator.')
+    commands = parser.add_subparsers(dest='command', required=True)
+    server = commands.add_parser('serve', help='run the service')
+    client = commands.add_parser('load', help='generate load on a running service and report the latency')
+    for command in (server, client):
+        command.add_argument('--host', default='127.0.0.1', help='the host of the TCP socket (default: 127.0.0.1)')
+        command.add_argument('--port', type=int, default=PORT, help=f'the port of the TCP socket (default: {PORT})')
+        command.add_argument('--unix', help='the path of a Unix socket instead of TCP')
+    server.add_argument('--executor', choices=('process', 'thread'), default='process',
+                        help='solve in worker processes or threads (default: process)')
+    server.add_argument('--workers', type=int, help='the size of the pool (default: one per core)')
+    server.add_argument('--cache', type=int, default=RESULT_CACHE,
+                        help=f'the amount of results which are kept (default: {RESULT_CACHE})')
+    server.add_argument('--board', action='append', default=[], metavar='NAME=SPEC',
+                        help='load a board with a JSON specification at the start, can be repeated')
+    server.add_argument('--max-size', type=int, default=MAX_SIZE,
+                        help=f'the largest generated board which a client can load (default: {MAX_SIZE})')
+    server.add_argument('--directory',
+                        help='the directory with the board files which a client can load (default: none)')
+    client.add_argument('--board', default='board', help='the name of the board to query (default: board)')
+    client.add_argument('--spec', help='load the board with this JSON specification first')
+    client.add_argument('--requests', type=int, default=1000, help='the amount of queries in total')
+    client.add_argument('--concurrency', type=int, default=16, help='the amount of clients at once')
+    client.add_argument('--distinct', type=int, default=100, help='the amount of different queries')
+    client.add_argument('--algorithm', choices=sorted(Engine.ALGORITHMS), default='astar')
+    client.add_argument('--seed', type=int, default=0, help='the seed of the queries')
+    options = parser.parse_args(arguments)
+
+    if options.command == 'serve':
+        boards = []
+        for board in options.board:
+            name, separator, specification = board.partition('=')
+            if not separator:
+                parser.error('--board must look like NAME=SPEC')
+            boards.append((name, json.loads(specification)))
+        try:
+            asyncio.run(serve(options.host, options.port, options.unix, options.executor, options.workers,
+                              options.cache, boards, options.max_size, options.directory))
+        except KeyboardInterrupt:
+            pass
+        return 0
+    if options.requests < 1 or options.concurrency < 1 or options.distinct < 1:
+        parser.error('--requests, --concurrency and --distinct must be at least 1')
+    report = asyncio.run(generateLoad(options.board, options.requests, options.concurrency, options.distinct,
+                                      options.algorithm, options.spec and json.loads(options.spec), options.seed,
+                                      options.host, options.port, options.unix))
+    json.dump(report, sys.stdout, indent=2)
+    print()
+    return 1 if report['errors'] else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
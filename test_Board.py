@@ -0,0 +1,74 @@
+'''
+These tests check the ComponentIndex of a Board, which follows the edits of the board, against an index which is built
+from nothing and against a breadth-first search.
+    python -m pytest test_Board.py
+'''
+import collections
+import random
+import unittest
+
+import Board
+
+
+class ComponentIndexTest(unittest.TestCase):
+    '''
+    After every edit the labels which were updated incrementally (unblock, and block with connectedAround and split)
+    must give the same components as a fresh build, and connected must agree with a search over the board.
+    '''
+    def assertSameComponents(self, board, index):
+        fresh = Board.ComponentIndex(Board.Board(board.size, grid=bytearray(board.grid)))
+        pairs = {}
+        for cell in range(board.size ** 2):
+            pair = index.component(cell), fresh.component(cell)
+            self.assertEqual(pair[0] is None, pair[1] is None)
+            pairs.setdefault(pair[0], pair[1])
+            self.assertEqual(pairs[pair[0]], pair[1])  # One component of the index is one component of the fresh one
+        self.assertEqual(len(set(pairs.values())), len(pairs))
+
+    def reached(self, board, start):
+        seen, queue = {start}, collections.deque([start])
+        while queue:
+            for neighbor in board.passableNeighbors(queue.popleft()):
+                if neighbor not in seen:
+                    seen.add(neighbor)
+                    queue.append(neighbor)
+        return seen
+
+    def testRandomEdits(self):
+        for seed in range(10):
+            with self.subTest(seed=seed):
+                generator = random.Random(seed)
+                board = Board.Board(20, seed=seed)
+                index = board.components()
+                index.build()
+                updated = 0
+                for edit in range(150):
+                    row, column = generator.randrange(20), generator.randrange(20)
+                    if generator.random() < 0.6:
+                        board.setObstacle(row, column)
+                    else:
+                        board.setValue(row, column, generator.randint(1, 9))
+                    updated += index.version == board.version
+                    self.assertSameComponents(board, index)
+                    start, target = generator.randrange(400), generator.randrange(400)
+                    expected = target in self.reached(board, start) and board.grid[target] != Board.OBSTACLE
+                    self.assertEqual(index.connected(start, target), expected or start == target)
+                self.assertGreater(updated, 100)  # Most edits must be followed without building the labels again
+
+    def testRingDoesNotSplit(self):
+        board = Board.Board(5, grid=bytearray([1] * 25))
+        index = board.components()
+        index.build()
+        board.setObstacle(2, 2)  # Its neighbours stay connected around it
+        self.assertEqual(index.version, board.version)
+        self.assertEqual(index.builds, 1)
+        self.assertSameComponents(board, index)
+        for row in range(5):
+            board.setObstacle(row, 1)  # A wall splits the board in two
+        self.assertSameComponents(board, index)
+        self.assertFalse(index.connected(0, 4))
+        self.assertTrue(index.connected(board.index(0, 1), 0))  # An obstacle start can be left
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,69 @@
+'''
+These tests check the searches of the Engine and the views on the grid of a ChunkedBoard, which is sparse and has no
+ComponentIndex.
+    python -m pytest test_Chunked.py
+'''
+import unittest
+
+import Board
+import Chunked
+import Engine
+
+
+class UnreachableGoalTest(unittest.TestCase):
+    '''
+    A goal which is an obstacle cannot be entered. On a sparse board the searches must see this before they start
+    instead of flooding the whole map, which never ends on a board of 10^6 x 10^6 cells.
+    '''
+    def setUp(self):
+        self.board = Chunked.ChunkedBoard(10 ** 6, seed=1, tile=64, cache=4)
+        self.board.setValue(500000, 500000, 3)
+        self.board.setObstacle(500010, 500010)
+
+    def testObstacleGoal(self):
+        for algorithm in Engine.ALGORITHMS:
+            with self.subTest(algorithm=algorithm):
+                result = Engine.solve(self.board, (500000, 500000), (500010, 500010), algorithm)
+                self.assertIsNone(result.cost)
+                self.assertEqual(result.expanded, 0)
+
+    def testObstacleGoalOfMultiSearch(self):
+        self.assertEqual(Engine.multiSearch(self.board, [(500000, 500000)], [(500010, 500010)]), [])
+
+    def testObstacleStartIsLeft(self):
+        self.board.setObstacle(500000, 500000)
+        self.board.setValue(500000, 500001, 2)
+        result = Engine.solve(self.board, (500000, 500000), (500000, 500001), 'ucs')
+        self.assertEqual(result.cost, 2)
+
+    def testSameCostsAsDenseBoard(self):
+        chunked = Chunked.ChunkedBoard(40, seed=0, tile=16, cache=2)
+        dense = Board.Board(40, grid=bytearray(chunked.grid[index] for index in range(40 ** 2)))
+        for algorithm in ('astar', 'ucs', 'bidijkstra', 'arastar'):
+            with self.subTest(algorithm=algorithm):
+                self.assertEqual(Engine.solve(chunked, (0, 0), (39, 39), algorithm).cost,
+                                 Engine.solve(dense, (0, 0), (39, 39), algorithm).cost)
+
+
+class TileGridTest(unittest.TestCase):
+    '''
+    The grid of a ChunkedBoard must behave like the bytearray of a Board, also when it is sliced: the rows of the board
+    and its string are made from slices of the grid.
+    '''
+    def setUp(self):
+        self.chunked = Chunked.ChunkedBoard(40, seed=0, tile=16, cache=2)
+        self.chunked.setObstacle(3, 17)
+        self.dense = Board.Board(40, grid=bytearray(self.chunked.grid[index] for index in range(40 ** 2)))
+
+    def testSlices(self):
+        for bounds in ((0, 40), (100, 260), (1590, 1600), (5, 1600, 37), (1599, 0, -41), (-30, None)):
+            with self.subTest(bounds=bounds):
+                self.assertEqual(self.chunked.grid[slice(*bounds)], bytes(self.dense.grid[slice(*bounds)]))
+
+    def testRows(self):
+        self.assertEqual(list(self.chunked.board[3]), list(self.dense.board[3]))
+        self.assertEqual(str(self.chunked), str(self.dense))
+
+
+if __name__ == '__main__':
+    unittest.main()
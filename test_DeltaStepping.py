@@ -0,0 +1,40 @@
+'''
+These tests check that delta-stepping on several worker processes gives the same distance field as the sequential UCS.
+    python -m pytest test_DeltaStepping.py
+'''
+import random
+import unittest
+
+import Board
+import DeltaStepping
+import Engine
+
+
+class DeltaSteppingTest(unittest.TestCase):
+    '''
+    The field must be the one of Engine.distanceField for every amount of workers (bands) and every width of the
+    buckets, also from a source which is an obstacle: it can be left but not entered.
+    '''
+    def testSameFieldAsDistanceField(self):
+        generator = random.Random(0)
+        for seed in range(3):
+            board = Board.Board(30, seed=seed)
+            sources = [(generator.randrange(30), generator.randrange(30)) for source in range(2)]
+            board.setObstacle(*sources[1])
+            for source in sources:
+                expected = Engine.distanceField(board, source)
+                for workers in (1, 3, 4):
+                    for delta in (1, 7, DeltaStepping.DELTA, 10 ** 4):
+                        with self.subTest(seed=seed, source=source, workers=workers, delta=delta):
+                            self.assertEqual(DeltaStepping.deltaStepping(board, source, workers, delta), expected)
+
+    def testRejectsBadArguments(self):
+        board = Board.Board(10, seed=0)
+        with self.assertRaises(ValueError):
+            DeltaStepping.deltaStepping(board, (0, 0), delta=0)
+        with self.assertRaises(ValueError):
+            DeltaStepping.deltaStepping(board, (10, 0))
+
+
+if __name__ == '__main__':
+    unittest.main()
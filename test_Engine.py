@@ -0,0 +1,67 @@
+'''
+These tests check the searches of the Engine against each other on random boards.
+    python -m pytest test_Engine.py
+'''
+import random
+import unittest
+
+import Board
+import Engine
+
+
+class MultiSearchTest(unittest.TestCase):
+    '''
+    A multi search must give the same goals and costs with every frontier, also when its starts lie so far apart that
+    their priorities do not fit in the window of a bucket frontier.
+    '''
+    def assertSameResults(self, board, starts, goals, **options):
+        def outcome(frontier):  # The goals which are found with their costs, goals at the same distance in any order
+            results = Engine.multiSearch(board, starts, goals, frontier=frontier, **options)
+            return sorted((result.path[-1], result.cost) for result in results)
+        expected = outcome('heap')
+        for frontier in ('bucket', 'minmax'):
+            with self.subTest(frontier=frontier):
+                self.assertEqual(outcome(frontier), expected)
+
+    def testDistantStarts(self):
+        board = Board.Board(600, seed=3)
+        self.assertSameResults(board, [(0, 0), (599, 599)], [(0, 5)])
+        self.assertSameResults(board, [(0, 0), (599, 599)], [(0, 5)], field=Engine.distanceField(board, [(0, 5)],
+                                                                                                 reverse=True))
+
+    def testRandomStarts(self):
+        generator = random.Random(0)
+        for seed in range(20):
+            with self.subTest(seed=seed):
+                board = Board.Board(30, seed=seed)
+                points = [(generator.randrange(30), generator.randrange(30)) for point in range(6)]
+                self.assertSameResults(board, points[:3], points[3:], k=None)
+                self.assertSameResults(board, points[:3], points[3:], k=None, astar=False)
+
+
+class BidirectionalSearchTest(unittest.TestCase):
+    '''
+    The bidirectional searches stop as soon as the best meeting found cannot be beaten anymore (with averaged
+    potentials for A*), so they must find the same cost as UCS and a pathway which really costs that much.
+    '''
+    def testSameCostAsUniformCost(self):
+        generator = random.Random(0)
+        for seed in range(40):
+            board = Board.Board(generator.randint(2, 25), seed=seed)
+            start, goal = [(generator.randrange(board.size), generator.randrange(board.size)) for point in range(2)]
+            if seed % 4 == 0:
+                board.setObstacle(*start)  # An obstacle start can be left
+            expected = Engine.solve(board, start, goal, 'ucs').cost
+            for algorithm in ('biastar', 'bidijkstra'):
+                for frontier in ('heap', 'bucket'):
+                    with self.subTest(seed=seed, algorithm=algorithm, frontier=frontier):
+                        result = Engine.solve(board, start, goal, algorithm, frontier=frontier)
+                        self.assertEqual(result.cost, expected)
+                        if result.cost is not None:
+                            self.assertEqual((result.path[0], result.path[-1]), (start, goal))
+                            self.assertEqual(sum(board.grid[board.index(*point)] for point in result.path[1:]),
+                                             result.cost)
+
+
+if __name__ == '__main__':
+    unittest.main()
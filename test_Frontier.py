@@ -0,0 +1,63 @@
+'''
+These tests check the frontiers against a sorted list on random pushes and pops.
+    python -m pytest test_Frontier.py
+'''
+import random
+import unittest
+
+import Frontier
+
+
+class MinMaxHeapFrontierTest(unittest.TestCase):
+    '''
+    The min-max heap must pop both ends in the same order as a sorted list and keep its levels in order after every
+    change, also when an entry is removed from the middle of the heap.
+    '''
+    def assertLevels(self, heap):
+        for index in range(1, len(heap)):
+            parent = (index - 1) >> 1
+            while parent >= 0:  # Every entry must lie on the right side of every ancestor
+                if (parent + 1).bit_length() & 1:
+                    self.assertLessEqual(heap[parent], heap[index])
+                else:
+                    self.assertGreaterEqual(heap[parent], heap[index])
+                parent = (parent - 1) >> 1 if parent else -1
+
+    def testRandomOperations(self):
+        for seed in range(50):
+            with self.subTest(seed=seed):
+                generator = random.Random(seed)
+                frontier, expected = Frontier.MinMaxHeapFrontier(), []
+                for operation in range(300):
+                    choice = generator.random()
+                    if choice < 0.5 or not expected:
+                        priority, item = generator.randrange(20), operation
+                        frontier.push(priority, item)
+                        expected.append((priority, item))
+                    elif choice < 0.7:
+                        self.assertEqual(frontier.peek(), expected[0][0])
+                        self.assertEqual(frontier.pop(), expected.pop(0))
+                    elif choice < 0.9:
+                        self.assertEqual(frontier.peekMax(), expected[-1][0])
+                        self.assertEqual(frontier.popMax(), expected.pop())
+                    else:
+                        priority, count, item = frontier.remove(generator.randrange(len(frontier)))
+                        expected.remove((priority, item))
+                    expected.sort()
+                    self.assertEqual(len(frontier), len(expected))
+                    self.assertLevels(frontier.heap)
+
+    def testSortedOrder(self):
+        generator = random.Random(0)
+        priorities = [generator.randrange(1000) for priority in range(500)]
+        frontier = Frontier.MinMaxHeapFrontier()
+        for item, priority in enumerate(priorities):
+            frontier.push(priority, item)
+        ends = [frontier.pop()[0] if position % 2 else frontier.popMax()[0] for position in range(500)]
+        self.assertEqual(sorted(ends), sorted(priorities))
+        self.assertEqual(ends[1::2], sorted(priorities)[:250])
+        self.assertEqual(ends[::2], sorted(priorities, reverse=True)[:250])
+
+
+if __name__ == '__main__':
+    unittest.main()
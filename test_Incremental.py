@@ -0,0 +1,52 @@
+'''
+These tests check that the D* Lite planner gives the same costs as the searches of the Engine, also after changes.
+    python -m pytest test_Incremental.py
+'''
+import random
+import unittest
+
+import Board
+import Engine
+import Incremental
+
+
+class IncrementalPlannerTest(unittest.TestCase):
+    '''
+    The planner must find the same cost as Engine.solve, also when the start is an obstacle: like in every search of
+    the Engine an obstacle can be left but not entered.
+    '''
+    def assertSameCost(self, board, planner):
+        self.assertEqual(planner.plan().cost, Engine.solve(board, algorithm='ucs').cost)
+
+    def testObstacleStart(self):
+        for seed in range(20):
+            with self.subTest(seed=seed):
+                board = Board.Board(15, seed=seed)
+                planner = Incremental.IncrementalPlanner(board)
+                self.assertSameCost(board, planner)
+                board.setObstacle(*board.start)
+                self.assertSameCost(board, planner)
+                board.setValue(*board.start, 3)
+                self.assertSameCost(board, planner)
+
+    def testChanges(self):
+        rng = random.Random(1)
+        for seed in range(10):
+            board = Board.Board(15, seed=seed)
+            planner = Incremental.IncrementalPlanner(board)
+            for step in range(30):
+                row, column = rng.randrange(15), rng.randrange(15)
+                if (row, column) == board.destination:
+                    continue
+                if rng.random() < 0.5:
+                    board.setObstacle(row, column)
+                else:
+                    board.setValue(row, column, rng.randint(1, 5))
+                if rng.random() < 0.2:
+                    board.setStart(rng.randrange(15), rng.randrange(15))
+                with self.subTest(seed=seed, step=step):
+                    self.assertSameCost(board, planner)
+
+
+if __name__ == '__main__':
+    unittest.main()